@@ -0,0 +1,298 @@
+"""Hourly battery dispatch against a time-of-use tariff.
+
+The farm's hourly production (the NASA series scaled to ``annual_kwh``, see
+``tariffs.hourly_kwh_grid``) is exported as it is made, except that a battery
+charges from it in off-peak hours and discharges into the peak window.  The
+windows come from the compiled tariff, per day in local solar time:
+
+    peak     hours priced at the day's highest first-tier rate, on days whose
+             rates vary (a flat day has no window and the battery idles)
+    charge   the other hours of those days whose rate is below the peak rate
+             times the round-trip efficiency, i.e. where shifting pays
+
+The battery charges from production only (no grid charging), its power limit
+applies on both sides, losses are split evenly between charging and
+discharging, and the state of charge carries over midnight.  Energy still
+stored at the end of the year is not valued.
+
+Every (capacity, power) configuration is simulated at once: the state of
+charge is a vector over configurations and the hour loop runs once, over the
+hours that can charge or discharge, so a grid of thousands of sizes costs
+about as much as a single battery.  Delivered energy is accumulated straight
+into the tariff's month x period slots and valued with the usual tier clamp;
+no configurations x hours matrix is ever built.
+"""
+
+from __future__ import annotations
+
+import csv
+import math
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from tariffs import (
+    CompiledTariff,
+    Tariff,
+    TariffValuation,
+    compile_tariff,
+    value_slot_kwh,
+)
+
+DEFAULT_EFFICIENCY = 0.90
+
+
+@dataclass(frozen=True)
+class DispatchWindows:
+    charge: np.ndarray  # (hours,) bool
+    discharge: np.ndarray  # (hours,) bool
+
+
+def dispatch_windows(compiled: CompiledTariff, efficiency: float) -> DispatchWindows:
+    rates = compiled.rate_vector.reshape(-1, 24)
+    peak = rates.max(axis=1, keepdims=True)
+    varies = peak > rates.min(axis=1, keepdims=True)
+    discharge = varies & (rates == peak)
+    charge = varies & (rates < peak * efficiency)
+    return DispatchWindows(charge.ravel(), discharge.ravel())
+
+
+@dataclass
+class DispatchResult:
+    capacity_kwh: np.ndarray  # (configs,)
+    power_kw: np.ndarray  # (configs,)
+    efficiency: float
+    produced_kwh: float
+    baseline: TariffValuation  # no battery
+    valuation: TariffValuation  # (configs,)
+    charged_kwh: np.ndarray  # (configs,) taken from production
+    discharged_kwh: np.ndarray  # (configs,) delivered from the battery
+
+    @property
+    def uplift(self) -> np.ndarray:
+        return self.valuation.total_value - self.baseline.total_value
+
+    @property
+    def losses_kwh(self) -> np.ndarray:
+        return self.charged_kwh - self.discharged_kwh
+
+    @property
+    def cycles(self) -> np.ndarray:
+        """Equivalent full cycles per year (NaN for a zero-capacity battery)."""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(
+                self.capacity_kwh > 0, self.discharged_kwh / self.capacity_kwh, np.nan
+            )
+
+    @property
+    def price_per_kwh(self) -> np.ndarray:
+        """Value per kWh produced (losses included)."""
+        return self.valuation.total_value / self.produced_kwh
+
+    def capital_cost(self, cost_per_kwh: float, cost_per_kw: float = 0.0) -> np.ndarray:
+        return self.capacity_kwh * cost_per_kwh + self.power_kw * cost_per_kw
+
+    def payback_years(self, cost_per_kwh: float, cost_per_kw: float = 0.0) -> np.ndarray:
+        """Simple payback; inf where the battery adds no value."""
+        uplift = self.uplift
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(
+                uplift > 0, self.capital_cost(cost_per_kwh, cost_per_kw) / uplift, np.inf
+            )
+
+
+def simulate_dispatch(
+    hourly_kwh: np.ndarray,
+    year: int,
+    tariff: Tariff,
+    capacity_kwh: float | np.ndarray,
+    power_kw: float | np.ndarray,
+    efficiency: float = DEFAULT_EFFICIENCY,
+) -> DispatchResult:
+    """Dispatch ``(hours_in_year,)`` production through every (capacity, power) pair.
+
+    ``capacity_kwh`` and ``power_kw`` broadcast against each other; the
+    result's arrays are flattened to one entry per configuration.
+    """
+    if not 0.0 < efficiency <= 1.0:
+        raise ValueError("round-trip efficiency must be within (0, 1]")
+    capacity, power = (
+        np.ascontiguousarray(array, dtype=np.float64).ravel()
+        for array in np.broadcast_arrays(capacity_kwh, power_kw)
+    )
+    if (capacity < 0).any() or (power < 0).any():
+        raise ValueError("battery capacity and power must not be negative")
+
+    hourly_kwh = np.asarray(hourly_kwh, dtype=np.float64)
+    compiled = compile_tariff(tariff, year)
+    if hourly_kwh.shape != compiled.slot_index.shape:
+        raise ValueError(
+            f"expected {compiled.slot_index.size} hourly values for {year}, "
+            f"got {hourly_kwh.shape[-1]}"
+        )
+    windows = dispatch_windows(compiled, efficiency)
+    base_slots = np.bincount(compiled.slot_index, weights=hourly_kwh, minlength=compiled.n_slots)
+
+    # One-way efficiency; capacity / eta is the production that fills an empty battery.
+    eta = math.sqrt(efficiency)
+    n = capacity.size
+    soc = np.zeros(n)
+    charged = np.zeros(n)
+    discharged = np.zeros(n)
+    slot_delta = np.zeros((compiled.n_slots, n))
+    flow = np.empty(n)
+
+    active = np.flatnonzero((windows.charge & (hourly_kwh > 0)) | windows.discharge)
+    for slot, produced, charging in zip(
+        compiled.slot_index[active].tolist(),
+        hourly_kwh[active].tolist(),
+        windows.charge[active].tolist(),
+    ):
+        if charging:
+            np.subtract(capacity, soc, out=flow)
+            flow /= eta
+            np.minimum(flow, power, out=flow)
+            np.minimum(flow, produced, out=flow)
+            charged += flow
+            slot_delta[slot] -= flow
+            flow *= eta
+            soc += flow
+        else:
+            np.multiply(soc, eta, out=flow)
+            np.minimum(flow, power, out=flow)
+            discharged += flow
+            slot_delta[slot] += flow
+            flow /= eta
+            soc -= flow
+            np.maximum(soc, 0.0, out=soc)  # rounding
+
+    produced_kwh = float(hourly_kwh.sum())
+    baseline = value_slot_kwh(compiled, base_slots, np.asarray(produced_kwh))
+    valuation = value_slot_kwh(
+        compiled, base_slots + slot_delta.T, produced_kwh - charged + discharged
+    )
+    return DispatchResult(
+        capacity, power, efficiency, produced_kwh, baseline, valuation, charged, discharged
+    )
+
+
+def sweep_dispatch(
+    hourly_kwh: np.ndarray,
+    year: int,
+    tariff: Tariff,
+    capacities_kwh: np.ndarray,
+    powers_kw: np.ndarray,
+    efficiency: float = DEFAULT_EFFICIENCY,
+) -> DispatchResult:
+    """Every capacity x power combination, capacity-major."""
+    capacity, power = np.meshgrid(capacities_kwh, powers_kw, indexing="ij")
+    return simulate_dispatch(hourly_kwh, year, tariff, capacity, power, efficiency)
+
+
+def rank_configurations(
+    result: DispatchResult, cost_per_kwh: float | None = None, cost_per_kw: float = 0.0
+) -> np.ndarray:
+    """Indices best first: shortest payback when costs are known, else largest uplift."""
+    if cost_per_kwh is None:
+        return np.argsort(-result.uplift, kind="stable")
+    payback = result.payback_years(cost_per_kwh, cost_per_kw)
+    return np.lexsort((-result.uplift, payback))
+
+
+def print_dispatch_report(result: DispatchResult, index: int = 0) -> None:
+    capacity = float(result.capacity_kwh[index])
+    power = float(result.power_kw[index])
+    base_value = float(result.baseline.total_value)
+    value = float(result.valuation.total_value[index])
+    print(
+        f"Battery Dispatch ({capacity:,.0f} kWh / {power:,.0f} kW, "
+        f"{result.efficiency:.0%} round trip, {result.baseline.tariff.name}):"
+    )
+    print(f"  Charged from production:  {float(result.charged_kwh[index]):>12,.0f} kWh")
+    print(f"  Discharged into peak:     {float(result.discharged_kwh[index]):>12,.0f} kWh")
+    print(f"  Losses:                   {float(result.losses_kwh[index]):>12,.0f} kWh")
+    cycles = float(result.cycles[index])
+    if not math.isnan(cycles):
+        print(f"  Equivalent full cycles:   {cycles:>12,.1f}")
+    print("-" * 60)
+    print(f"{'Bucket':<24} {'No battery $':>14} {'With battery $':>16}")
+    for name, bucket in result.valuation.bucket_value.items():
+        print(
+            f"  {name:<22} {float(result.baseline.bucket_value[name]):>14,.2f}"
+            f" {float(bucket[index]):>16,.2f}"
+        )
+    print("-" * 60)
+    print(f"{'TOTAL VALUE':<24} {base_value:>14,.2f} {value:>16,.2f}")
+    print(
+        f"{'$/kWh produced':<24} {base_value / result.produced_kwh:>14.4f}"
+        f" {float(result.price_per_kwh[index]):>16.4f}"
+    )
+    print(f"{'Battery uplift':<24} {'':>14} {value - base_value:>16,.2f}")
+
+
+def print_sizing_report(
+    result: DispatchResult,
+    top: int = 10,
+    cost_per_kwh: float | None = None,
+    cost_per_kw: float = 0.0,
+) -> None:
+    order = rank_configurations(result, cost_per_kwh, cost_per_kw)
+    ranking = "shortest simple payback" if cost_per_kwh is not None else "largest annual uplift"
+    print(
+        f"Battery sizing sweep: {result.capacity_kwh.size:,} configurations, "
+        f"top {min(top, order.size)} by {ranking}"
+    )
+    print(f"No battery: ${float(result.baseline.total_value):,.2f} ({result.baseline.tariff.name})")
+    header = (
+        f"{'kWh':>10} | {'kW':>8} | {'Value $':>12} | {'Uplift $':>10} | "
+        f"{'$/kWh':>7} | {'Cycles':>7}"
+    )
+    if cost_per_kwh is not None:
+        header += f" | {'Capex $':>12} | {'Payback y':>9}"
+        capex = result.capital_cost(cost_per_kwh, cost_per_kw)
+        payback = result.payback_years(cost_per_kwh, cost_per_kw)
+    print("-" * len(header))
+    print(header)
+    print("-" * len(header))
+    for index in order[:top].tolist():
+        row = (
+            f"{float(result.capacity_kwh[index]):>10,.0f} | {float(result.power_kw[index]):>8,.0f} | "
+            f"{float(result.valuation.total_value[index]):>12,.2f} | "
+            f"{float(result.uplift[index]):>10,.2f} | {float(result.price_per_kwh[index]):>7.4f} | "
+            f"{float(result.cycles[index]):>7.1f}"
+        )
+        if cost_per_kwh is not None:
+            row += f" | {float(capex[index]):>12,.0f} | {float(payback[index]):>9.1f}"
+        print(row)
+    print("-" * len(header))
+
+
+def write_sweep_csv(result: DispatchResult, path: Path) -> None:
+    with open(path, "w", newline="", encoding="utf-8") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(
+            [
+                "capacity_kwh",
+                "power_kw",
+                "charged_kwh",
+                "discharged_kwh",
+                "total_value",
+                "uplift",
+                "price_per_kwh",
+                "cycles",
+            ]
+        )
+        columns = (
+            result.capacity_kwh,
+            result.power_kw,
+            result.charged_kwh,
+            result.discharged_kwh,
+            result.valuation.total_value,
+            result.uplift,
+            result.price_per_kwh,
+            result.cycles,
+        )
+        writer.writerows(
+            [f"{value:.10g}" for value in row] for row in zip(*(column.tolist() for column in columns))
+        )
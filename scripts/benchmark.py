@@ -0,0 +1,513 @@
+#!/usr/bin/env python3
+"""Offline benchmark suite for the solar calculator and the impact visualizers.
+
+Every input is generated locally: NASA POWER shaped hourly payloads (one
+year, a 20-year sweep, a 2,000-year bootstrap, a 5,151-size battery sweep, a
+1,000-site portfolio) and ``solar_footprint_data.json`` files shaped like
+``generate-impact-diagnostics.ts`` output (pretty-printed, 100 to 100k
+farms/weeks, loaded from JSON and from the Arrow tables).  Each case reports
+wall time (best of the case's repeats), peak traced memory and per-stage
+throughput, and the run fails when a case gets slower or bigger than the
+tolerance allows against the baseline, or when that baseline is missing or
+unreadable.  Differences below ``--min-time-delta`` / ``--min-memory-delta``
+are never regressions, so millisecond cases cannot fail on timer noise alone.
+
+Timings only compare on the machine that recorded them, so the baseline is not
+committed: each machine records its own benchmark_baseline.json (ignored by
+git) with ``--save-baseline`` before gating on it, and re-records it after an
+intended change in speed or memory.
+
+    python scripts/benchmark.py --suite full --save-baseline  # record this machine's numbers
+    python scripts/benchmark.py                    # quick suite, compare to baseline
+    python scripts/benchmark.py --suite full       # adds 10k and 100k footprints
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import importlib
+import io
+import json
+import math
+import sys
+import tempfile
+import time
+import tracemalloc
+import warnings
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta, timezone
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+import numpy as np
+
+from battery import sweep_dispatch
+from bootstrap import run_bootstrap
+from chart_theme import GENESIS_TIMESTAMP, SECONDS_PER_WEEK
+from footprint_data import load_footprint, load_footprint_json, write_footprint_arrow
+from hourly_store import write_text_dump
+from instrumentation import Profiler, activate
+from multi_year import run_sweep
+from power import NASA_PARAMETER, parse_hourly_series
+from power_batch import Site, analyze_site
+from solar_engine import compute_monthly_buckets, day_hour_cube, decode_timestamps, value_buckets
+from tariffs import DEFAULT_TOU_TARIFF, hourly_kwh_grid
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "benchmark_baseline.json"
+REGION_IDS = (2, 3, 4)
+QUICK_SIZES = (100, 1_000)
+FULL_SIZES = (100, 1_000, 10_000, 100_000)
+
+
+def synthetic_payload(year: int, seed: int = 0, fill_rate: float = 0.01) -> dict[str, Any]:
+    """NASA POWER hourly JSON for one year: a diurnal/seasonal curve with noise and -999s."""
+    rng = np.random.default_rng(seed)
+    start = datetime(year, 1, 1)
+    n_hours = (datetime(year + 1, 1, 1) - start) // timedelta(hours=1)
+    hours = np.arange(n_hours)
+    hour_of_day = hours % 24
+    day_of_year = hours // 24
+    diurnal = np.clip(np.sin((hour_of_day - 6) / 12 * math.pi), 0.0, None)
+    seasonal = 600 + 300 * np.sin((day_of_year - 80) / 365 * 2 * math.pi)
+    values = np.round(diurnal * seasonal * rng.uniform(0.3, 1.0, n_hours), 2)
+    values[rng.random(n_hours) < fill_rate] = -999.0
+    keys = [(start + timedelta(hours=int(hour))).strftime("%Y%m%d%H") for hour in hours]
+    return {"properties": {"parameter": {NASA_PARAMETER: dict(zip(keys, values.tolist()))}}}
+
+
+def synthetic_footprint(n_farms: int, n_weeks: int, seed: int = 0) -> dict[str, Any]:
+    """solar_footprint_data.json with ``n_farms`` farms and ``n_weeks`` week rows."""
+    rng = np.random.default_rng(seed)
+    weeks_per_region = max(1, math.ceil(n_weeks / len(REGION_IDS)))
+
+    farm_weeks = np.sort(rng.integers(0, weeks_per_region, n_farms))
+    farms = [
+        {
+            "farmName": f"Farm {index:06d}",
+            "regionId": int(region),
+            "weekNumber": int(week),
+            "wattsCaptured": int(watts),
+            "finalizedAt": datetime.fromtimestamp(
+                GENESIS_TIMESTAMP + int(week) * SECONDS_PER_WEEK + int(offset), tz=timezone.utc
+            ).isoformat(),
+        }
+        for index, (region, week, watts, offset) in enumerate(
+            zip(
+                rng.choice(REGION_IDS, n_farms),
+                farm_weeks,
+                rng.integers(500, 20_000, n_farms),
+                rng.integers(0, SECONDS_PER_WEEK, n_farms),
+            )
+        )
+    ]
+
+    weeks = []
+    for week in range(weeks_per_region):
+        for region in REGION_IDS:
+            if len(weeks) == n_weeks:
+                break
+            sources = rng.uniform(0, 1000, 4)
+            share = float(rng.uniform(0, 5))
+            weeks.append(
+                {
+                    "weekNumber": week,
+                    "regionId": region,
+                    "totalPoints": float(sources.sum()),
+                    "networkTotalPower": float(sources.sum() / share * 100) if share else 0.0,
+                    "sharePercent": share,
+                    "inflationPoints": float(sources[0]),
+                    "steeringPoints": float(sources[1]),
+                    "vaultBonusPoints": float(sources[2]),
+                    "glowWorthPoints": float(sources[3]),
+                }
+            )
+
+    total_watts = int(sum(farm["wattsCaptured"] for farm in farms))
+    return {
+        "walletAddress": "0x" + "ab" * 20,
+        "summary": {"totalWatts": total_watts, "totalPanels": total_watts // 400},
+        "farms": farms,
+        "weeks": weeks,
+    }
+
+
+@dataclass
+class StageResult:
+    seconds: float = 0.0
+    items: int = 0
+    unit: str = "items"
+
+    @property
+    def throughput(self) -> float:
+        return self.items / self.seconds if self.seconds > 0 else 0.0
+
+
+class StageTimer:
+    def __init__(self) -> None:
+        self.stages: dict[str, StageResult] = {}
+
+    @contextlib.contextmanager
+    def stage(self, name: str, items: int = 0, unit: str = "items") -> Iterator[None]:
+        result = self.stages.setdefault(name, StageResult(unit=unit))
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            result.seconds += time.perf_counter() - started
+            result.items += items
+
+
+@dataclass
+class CaseResult:
+    name: str
+    wall_s: float
+    peak_mb: float
+    stages: dict[str, StageResult] = field(default_factory=dict)
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "wall_s": self.wall_s,
+            "peak_mb": self.peak_mb,
+            "stages": {
+                name: {**asdict(stage), "throughput": stage.throughput}
+                for name, stage in self.stages.items()
+            },
+        }
+
+
+@dataclass
+class Case:
+    name: str
+    setup: Callable[[Path], Any]
+    run: Callable[[Any, StageTimer, Path], None]
+    repeat: int = 3
+
+
+def _power_year_setup(workdir: Path) -> bytes:
+    return json.dumps(synthetic_payload(2023)).encode()
+
+
+def _power_year_run(body: bytes, timer: StageTimer, workdir: Path) -> None:
+    with timer.stage("json_decode", len(body), "bytes"):
+        payload = json.loads(body)
+    with timer.stage("parse", 1, "series"):
+        series = parse_hourly_series(payload)
+    hours = series.values.size
+    with timer.stage("decode_timestamps", hours, "hours"):
+        decoded = decode_timestamps(series.timestamps)
+    with timer.stage("bucket_and_value", hours, "hours"):
+        buckets = compute_monthly_buckets(series.timestamps, series.values, 10_000, decoded=decoded)
+        value_buckets(buckets)
+    with timer.stage("debug_files", hours, "hours"), contextlib.redirect_stdout(io.StringIO()):
+        write_text_dump(day_hour_cube(decoded, series.values), 2023, workdir / "debug")
+
+
+def _sweep_setup(workdir: Path) -> dict[int, Any]:
+    return {
+        year: parse_hourly_series(synthetic_payload(year, seed=year)) for year in range(2004, 2024)
+    }
+
+
+def _sweep_run(series_by_year: dict[int, Any], timer: StageTimer, workdir: Path) -> None:
+    hours = sum(series.values.size for series in series_by_year.values())
+    with timer.stage("sweep", hours, "hours"):
+        run_sweep(series_by_year, 10_000)
+
+
+def _bootstrap_run(body: bytes, timer: StageTimer, workdir: Path) -> None:
+    series = parse_hourly_series(json.loads(body))
+    with timer.stage("bootstrap", 2000, "samples"):
+        run_bootstrap(series, 10_000, samples=2000, seed=0)
+
+
+def _battery_setup(workdir: Path) -> tuple[int, np.ndarray]:
+    series = parse_hourly_series(synthetic_payload(2023))
+    return hourly_kwh_grid(decode_timestamps(series.timestamps), series.values, 1_000_000)
+
+
+def _battery_run(grid: tuple[int, np.ndarray], timer: StageTimer, workdir: Path) -> None:
+    year, hourly_kwh = grid
+    capacities = np.linspace(0, 5000, 101)
+    powers = np.linspace(0, 2000, 51)
+    with timer.stage("dispatch", capacities.size * powers.size, "configs"):
+        sweep_dispatch(hourly_kwh, year, DEFAULT_TOU_TARIFF, capacities, powers)
+
+
+def _portfolio_setup(workdir: Path) -> list[bytes]:
+    # 1,000 sites cycle through a handful of distinct payloads to bound setup cost.
+    return [json.dumps(synthetic_payload(2023, seed=seed)).encode() for seed in range(8)]
+
+
+def _portfolio_run(bodies: list[bytes], timer: StageTimer, workdir: Path) -> None:
+    for index in range(1000):
+        body = bodies[index % len(bodies)]
+        with timer.stage("json_decode", len(body), "bytes"):
+            payload = json.loads(body)
+        with timer.stage("parse", 1, "sites"):
+            series = parse_hourly_series(payload)
+        site = Site(f"site-{index}", 40.0, -111.0, 10_000.0, 2023)
+        with timer.stage("analyze", 1, "sites"):
+            analyze_site(site, series.timestamps, series.values)
+
+
+def _footprint_setup(size: int) -> Callable[[Path], Path]:
+    def setup(workdir: Path) -> Path:
+        path = workdir / f"solar_footprint_data_{size}.json"
+        path.write_text(json.dumps(synthetic_footprint(size, size), indent=2), encoding="utf-8")
+        return path
+
+    return setup
+
+
+def _arrow_setup(size: int) -> Callable[[Path], Path]:
+    def setup(workdir: Path) -> Path:
+        path = _footprint_setup(size)(workdir)
+        write_footprint_arrow(load_footprint_json(path), path)
+        return path
+
+    return setup
+
+
+def _load_run(size: int) -> Callable[[Path, StageTimer, Path], None]:
+    # Arrow setup leaves current .arrow tables next to the JSON, so load_footprint maps those
+    def run(json_file: Path, timer: StageTimer, workdir: Path) -> None:
+        with timer.stage("load", size * 2, "rows"):
+            load_footprint(json_file)
+
+    return run
+
+
+def _visualizer_run(chart: str, size: int, fast: bool = False) -> Callable[[Path, StageTimer, Path], None]:
+    def run(json_file: Path, timer: StageTimer, workdir: Path) -> None:
+        import matplotlib.pyplot as plt
+
+        render = getattr(importlib.import_module(f"glow_tools.{chart}"), f"visualize_{chart}")
+        profiler = activate(Profiler(f"visualize_{chart}"))
+        try:
+            with contextlib.chdir(workdir), contextlib.redirect_stdout(io.StringIO()):
+                with timer.stage("render_total", size, "rows"):
+                    render(json_file=str(json_file), show=False, fast=fast)
+        finally:
+            activate(Profiler(enabled=False))
+            plt.close("all")
+        for name, stats in profiler.stages.items():
+            timer.stages[name] = StageResult(stats.seconds, size, "rows")
+
+    return run
+
+
+def build_cases(sizes: tuple[int, ...]) -> list[Case]:
+    cases = [
+        Case("power_1y", _power_year_setup, _power_year_run),
+        Case("power_20y_sweep", _sweep_setup, _sweep_run),
+        Case("power_bootstrap_2000", _power_year_setup, _bootstrap_run),
+        Case("battery_sweep_5151", _battery_setup, _battery_run),
+        Case("portfolio_1000_sites", _portfolio_setup, _portfolio_run, repeat=1),
+    ]
+    for size in sizes:
+        cases.append(Case(f"footprint_load_json_{size}", _footprint_setup(size), _load_run(size)))
+        cases.append(Case(f"footprint_load_arrow_{size}", _arrow_setup(size), _load_run(size)))
+        for chart in ("footprint", "points"):
+            for fast in (False, True):
+                cases.append(
+                    Case(
+                        f"visualize_{chart}{'_fast' if fast else ''}_{size}",
+                        _footprint_setup(size),
+                        _visualizer_run(chart, size, fast),
+                        repeat=1,
+                    )
+                )
+    return cases
+
+
+def run_case(case: Case, workdir: Path) -> CaseResult:
+    state = case.setup(workdir)
+
+    # One traced pass for peak memory (tracemalloc slows things down), then timed passes.
+    tracemalloc.start()
+    try:
+        case.run(state, StageTimer(), workdir)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    best: CaseResult | None = None
+    for _ in range(case.repeat):
+        timer = StageTimer()
+        started = time.perf_counter()
+        case.run(state, timer, workdir)
+        wall = time.perf_counter() - started
+        if best is None or wall < best.wall_s:
+            best = CaseResult(case.name, wall, peak / 2**20, timer.stages)
+    assert best is not None
+    return best
+
+
+def compare(
+    results: list[CaseResult],
+    baseline: dict[str, Any],
+    time_tolerance: float,
+    memory_tolerance: float,
+    min_time_delta: float = 0.0,
+    min_memory_delta: float = 0.0,
+) -> list[str]:
+    """Cases over the relative tolerance by more than the absolute floor."""
+    regressions = []
+    for result in results:
+        reference = baseline.get("cases", {}).get(result.name)
+        if reference is None:
+            continue
+        time_limit = max(
+            reference["wall_s"] * (1 + time_tolerance), reference["wall_s"] + min_time_delta
+        )
+        if result.wall_s > time_limit:
+            regressions.append(
+                f"{result.name}: wall {result.wall_s:.3f}s vs baseline {reference['wall_s']:.3f}s"
+            )
+        memory_limit = max(
+            reference["peak_mb"] * (1 + memory_tolerance), reference["peak_mb"] + min_memory_delta
+        )
+        if result.peak_mb > memory_limit:
+            regressions.append(
+                f"{result.name}: peak {result.peak_mb:.1f} MB vs baseline "
+                f"{reference['peak_mb']:.1f} MB"
+            )
+    return regressions
+
+
+def print_result(result: CaseResult) -> None:
+    print(f"{result.name:<32} {result.wall_s:>9.3f}s {result.peak_mb:>9.1f} MB")
+    for name, stage in result.stages.items():
+        print(
+            f"  {name:<30} {stage.seconds:>9.3f}s {stage.throughput:>14,.1f} {stage.unit}/s"
+        )
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run the offline benchmark suite.")
+    parser.add_argument(
+        "--suite",
+        choices=("quick", "full"),
+        default="quick",
+        help="quick: footprints of 100/1k rows; full: up to 100k (default: quick)",
+    )
+    parser.add_argument("--only", metavar="GLOB", help="Run only cases matching this pattern")
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        default=DEFAULT_BASELINE,
+        help=f"Baseline JSON to compare against (default: {DEFAULT_BASELINE.name})",
+    )
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Write this run's numbers to --baseline instead of comparing",
+    )
+    parser.add_argument("--json", type=Path, default=None, help="Also write the full report here")
+    parser.add_argument(
+        "--time-tolerance",
+        type=float,
+        default=0.25,
+        help="Allowed wall-time growth over baseline (default: 0.25 = 25%%)",
+    )
+    parser.add_argument(
+        "--memory-tolerance",
+        type=float,
+        default=0.10,
+        help="Allowed peak-memory growth over baseline (default: 0.10 = 10%%)",
+    )
+    parser.add_argument(
+        "--min-time-delta",
+        type=float,
+        default=0.05,
+        metavar="SECONDS",
+        help="Ignore wall-time growth smaller than this (default: 0.05)",
+    )
+    parser.add_argument(
+        "--min-memory-delta",
+        type=float,
+        default=1.0,
+        metavar="MB",
+        help="Ignore peak-memory growth smaller than this (default: 1.0)",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+
+    import matplotlib
+
+    matplotlib.use("Agg")
+    warnings.filterwarnings("ignore", category=UserWarning)  # plt.show() on Agg, glyph fallbacks
+
+    cases = build_cases(QUICK_SIZES if args.suite == "quick" else FULL_SIZES)
+    if args.only:
+        cases = [case for case in cases if fnmatch(case.name, args.only)]
+        if not cases:
+            print(f"No benchmark cases match {args.only!r}.", file=sys.stderr)
+            raise SystemExit(1)
+
+    baseline: dict[str, Any] = {}
+    if not args.save_baseline:
+        # Checked before any case runs: without a baseline there is nothing to gate on
+        try:
+            baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as exc:
+            print(
+                f"Cannot read baseline {args.baseline} ({exc}); "
+                "run with --save-baseline to create one.",
+                file=sys.stderr,
+            )
+            raise SystemExit(1)
+        if not isinstance(baseline, dict) or not isinstance(baseline.get("cases"), dict):
+            print(f"Baseline {args.baseline} has no 'cases' object.", file=sys.stderr)
+            raise SystemExit(1)
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="glow-bench-") as tmp:
+        for case in cases:
+            workdir = Path(tmp) / case.name
+            workdir.mkdir()
+            result = run_case(case, workdir)
+            print_result(result)
+            results.append(result)
+
+    report = {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "cases": {result.name: result.to_json() for result in results},
+    }
+    if args.json is not None:
+        args.json.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    if args.save_baseline:
+        merged = report
+        if args.baseline.is_file():
+            merged = json.loads(args.baseline.read_text(encoding="utf-8"))
+            merged.update({key: value for key, value in report.items() if key != "cases"})
+            merged.setdefault("cases", {}).update(report["cases"])
+        args.baseline.write_text(json.dumps(merged, indent=2), encoding="utf-8")
+        print(f"\nBaseline written to {args.baseline}")
+        return
+
+    regressions = compare(
+        results,
+        baseline,
+        args.time_tolerance,
+        args.memory_tolerance,
+        args.min_time_delta,
+        args.min_memory_delta,
+    )
+    if regressions:
+        print("\nRegressions against baseline:", file=sys.stderr)
+        for regression in regressions:
+            print(f"  {regression}", file=sys.stderr)
+        raise SystemExit(1)
+    print("\nNo regressions against baseline.")
+
+
+if __name__ == "__main__":
+    main()
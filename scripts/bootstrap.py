@@ -0,0 +1,185 @@
+"""Bootstrap confidence bands for one year's production and value.
+
+A synthetic year keeps the calendar of the measured one but fills each day
+with the 24-hour profile of a day drawn (with replacement) from the same
+month.  Missing hours count as 0, as in the measured report, and days without
+any reading are never drawn.  Production uses the measured year's
+kWh-per-irradiance ratio, so synthetic years scatter around ``annual_kwh``.
+
+All samples are drawn up front as a ``(samples, days)`` index matrix from a
+seeded generator, so a (seed, samples) pair always yields the same years.
+Monthly kWh come from one gather of daily totals and are bucketed and valued
+like the measured year.  Extra tariffs need the hourly shape; their samples
+are expanded to hour-of-year grids in chunks and valued with one matrix
+product per chunk.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Sequence
+
+import numpy as np
+
+from irradiance_cache import HourlySeries
+from solar_engine import (
+    MONTH_NAMES,
+    MonthlyBuckets,
+    SolarDataError,
+    day_hour_cube,
+    decode_timestamps,
+    is_leap_year,
+    monthly_value,
+    scale_to_annual,
+    split_season_buckets,
+)
+from tariffs import Tariff, value_hourly_kwh
+
+DEFAULT_SAMPLES = 2000
+BAND_PERCENTILES = (5, 50, 95)
+CHUNK_SAMPLES = 256
+
+_DAYS_IN_MONTH = np.array([31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+
+
+@dataclass
+class BootstrapResult:
+    year: int
+    seed: int
+    buckets: MonthlyBuckets  # (samples, 12)
+    monthly_value: np.ndarray  # (samples, 12) dollars
+    tariff_values: dict[str, np.ndarray] = field(default_factory=dict)  # name -> (samples,)
+
+    @property
+    def samples(self) -> int:
+        return self.monthly_value.shape[0]
+
+    @property
+    def annual_kwh(self) -> np.ndarray:
+        return self.buckets.grand_total_kwh
+
+    @property
+    def annual_value(self) -> np.ndarray:
+        return self.monthly_value.sum(axis=-1)
+
+
+def percentile_bands(
+    samples: np.ndarray, percentiles: Sequence[float] = BAND_PERCENTILES, axis: int = 0
+) -> dict[str, np.ndarray]:
+    """``{"p5": ..., "p50": ..., ...}`` along ``axis``."""
+    values = np.percentile(samples, percentiles, axis=axis)
+    return {f"p{percentile:g}": value for percentile, value in zip(percentiles, values)}
+
+
+def draw_days(
+    has_data: np.ndarray, day_month: np.ndarray, samples: int, rng: np.random.Generator
+) -> np.ndarray:
+    """``(samples, days)`` source day for every calendar day, drawn within its month."""
+    draws = np.empty((samples, day_month.size), dtype=np.int64)
+    for month in range(1, 13):
+        targets = np.flatnonzero(day_month == month)
+        pool = np.flatnonzero(has_data & (day_month == month))
+        if pool.size == 0:
+            raise SolarDataError(f"No readings in {MONTH_NAMES[month]} to resample.")
+        draws[:, targets] = pool[rng.integers(0, pool.size, size=(samples, targets.size))]
+    return draws
+
+
+def run_bootstrap(
+    series: HourlySeries,
+    annual_kwh: float,
+    tariffs: Sequence[Tariff] = (),
+    samples: int = DEFAULT_SAMPLES,
+    seed: int = 0,
+) -> BootstrapResult:
+    if samples < 1:
+        raise ValueError("samples must be at least 1")
+    decoded = decode_timestamps(series.timestamps)
+    years = np.unique(decoded.year[decoded.valid])
+    if years.size != 1:
+        raise SolarDataError(f"Expected a single calendar year, got {years.tolist()}.")
+    year = int(years[0])
+
+    _, ratio = scale_to_annual(series.values, annual_kwh)
+    n_days = 366 if is_leap_year(year) else 365
+    kwh = day_hour_cube(decoded, series.values)[:n_days].astype(np.float64) * ratio
+    has_data = ~np.isnan(kwh).all(axis=1)
+    kwh = np.nan_to_num(kwh)
+
+    days_in_month = _DAYS_IN_MONTH + (np.arange(1, 13) == 2) * (n_days == 366)
+    day_month = np.repeat(np.arange(1, 13), days_in_month)
+    draws = draw_days(has_data, day_month, samples, np.random.default_rng(seed))
+
+    month_one_hot = np.zeros((n_days, 12))
+    month_one_hot[np.arange(n_days), day_month - 1] = 1.0
+    monthly_kwh = kwh.sum(axis=1)[draws] @ month_one_hot
+    if (monthly_kwh.sum(axis=-1) <= 0).any():
+        raise SolarDataError("Calculated annual production is 0.")
+    buckets = split_season_buckets(monthly_kwh)
+
+    tariff_values = {tariff.name: np.empty(samples) for tariff in tariffs}
+    if tariffs:
+        for start in range(0, samples, CHUNK_SAMPLES):
+            chunk = draws[start : start + CHUNK_SAMPLES]
+            hourly = kwh[chunk].reshape(chunk.shape[0], n_days * 24)
+            for valuation in value_hourly_kwh(hourly, year, tariffs):
+                tariff_values[valuation.tariff.name][start : start + chunk.shape[0]] = (
+                    valuation.total_value
+                )
+
+    return BootstrapResult(year, seed, buckets, monthly_value(buckets), tariff_values)
+
+
+def _band_cells(bands: dict[str, np.ndarray], index: int | None, fmt: str) -> str:
+    cells = []
+    for value in bands.values():
+        value = value if index is None else value[index]
+        cells.append(f"{float(value):>{fmt}}")
+    return " | ".join(cells)
+
+
+def print_bootstrap_report(result: BootstrapResult) -> None:
+    names = [f"P{percentile:g}" for percentile in BAND_PERCENTILES]
+    print(
+        f"Bootstrap bands for {result.year}: {result.samples:,} synthetic years "
+        f"(daily profiles resampled within each month, seed {result.seed})"
+    )
+    print()
+
+    kwh = percentile_bands(result.buckets.total_kwh)
+    value = percentile_bands(result.monthly_value)
+    header = (
+        f"{'Month':<12} | "
+        + " | ".join(f"{name + ' kWh':>10}" for name in names)
+        + " | "
+        + " | ".join(f"{name + ' $':>10}" for name in names)
+    )
+    print("-" * len(header))
+    print(header)
+    print("-" * len(header))
+    for month in range(1, 13):
+        print(
+            f"{MONTH_NAMES[month]:<12} | {_band_cells(kwh, month - 1, '10.0f')} | "
+            f"{_band_cells(value, month - 1, '10,.2f')}"
+        )
+    print("=" * len(header))
+    print()
+
+    annual_rows = [
+        ("Annual kWh", percentile_bands(result.annual_kwh), "12,.0f"),
+        ("Total value $", percentile_bands(result.annual_value), "12,.2f"),
+        ("$/kWh", percentile_bands(result.annual_value / result.annual_kwh), "12.4f"),
+    ]
+    for name, values in result.tariff_values.items():
+        annual_rows.append((f"{name} $", percentile_bands(values), "12,.2f"))
+        annual_rows.append(
+            (f"{name} $/kWh", percentile_bands(values / result.annual_kwh), "12.4f")
+        )
+
+    label_width = max(20, *(len(label) for label, _, _ in annual_rows))
+    header = f"{'Annual':<{label_width}} | " + " | ".join(f"{name:>12}" for name in names)
+    print(header)
+    print("-" * len(header))
+    for label, bands, fmt in annual_rows:
+        print(f"{label:<{label_width}} | {_band_cells(bands, None, fmt)}")
+    print("-" * len(header))
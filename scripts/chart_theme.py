@@ -0,0 +1,120 @@
+"""Shared seaborn/matplotlib styling for the impact visualizers.
+
+Applying the theme resets matplotlib's rcParams, so batch workers call
+``setup_theme()`` once per process and later calls are no-ops.
+
+The fast render path (``--fast``) adds reusable figure templates, tick
+thinning and DPI tiers: the 300 dpi final and a low-DPI preview.
+"""
+
+from __future__ import annotations
+
+import math
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Sequence
+
+# Protocol weeks start at genesis; charts label each week by its end
+GENESIS_TIMESTAMP = 1700352000
+SECONDS_PER_WEEK = 604800
+
+# Regions shown in the impact charts (CGP, region 1, is excluded upstream)
+REGION_LABELS = {2: "Utah (UT)", 3: "Missouri (MO)", 4: "Colorado (CO)"}
+REGION_COLORS = {2: "#3b82f6", 3: "#10b981", 4: "#f59e0b"}  # Blue, Green, Amber
+OTHER_REGION_COLOR = "#6b7280"
+
+_applied = False
+
+
+def week_to_date(week: int) -> datetime:
+    """Local time at the end of protocol ``week``."""
+    return datetime.fromtimestamp(GENESIS_TIMESTAMP + (week + 1) * SECONDS_PER_WEEK)
+
+
+def setup_theme() -> None:
+    global _applied
+    if _applied:
+        return
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    sns.set_theme(style="whitegrid")
+    plt.rcParams["font.family"] = "sans-serif"
+    _applied = True
+
+
+# --- Fast render path -------------------------------------------------------
+
+FINAL_DPI = 300
+PREVIEW_DPI = 72
+TIERS = ("final", "preview", "both")
+MAX_TICK_LABELS = 24
+
+_templates: dict[str, tuple[Any, tuple[Any, ...]]] = {}
+
+
+def tier_outputs(
+    output_file: str, tier: str = "final", preview_dpi: int = PREVIEW_DPI
+) -> list[tuple[str, int]]:
+    """(path, dpi) pairs to save: the 300 dpi final and/or ``<stem>.preview<ext>``."""
+    if tier not in TIERS:
+        raise ValueError(f"tier must be one of {', '.join(TIERS)}")
+    path = Path(output_file)
+    outputs = []
+    if tier in ("final", "both"):
+        outputs.append((str(path), FINAL_DPI))
+    if tier in ("preview", "both"):
+        outputs.append((str(path.with_name(f"{path.stem}.preview{path.suffix}")), preview_dpi))
+    return outputs
+
+
+def figure_template(
+    name: str, build: Callable[[], tuple[Any, tuple[Any, ...]]]
+) -> tuple[Any, tuple[Any, ...]]:
+    """Return the process-wide pre-styled figure ``name``, built once by ``build``.
+
+    ``build`` returns ``(figure, parts)`` with titles, axis labels, margins and
+    twin axes already set.  On reuse every Axes in ``parts`` keeps that styling
+    but loses its data artists, and figure-level legends are dropped, so the
+    caller only draws data.  Templates are never closed; keep them off screen.
+    """
+    template = _templates.get(name)
+    if template is None:
+        setup_theme()
+        template = _templates[name] = build()
+    else:
+        figure, parts = template
+        figure.legends.clear()
+        for part in parts:
+            if hasattr(part, "get_legend"):
+                reset_axes(part)
+    return template
+
+
+def reset_axes(ax: Any) -> None:
+    for artist in [*ax.lines, *ax.patches, *ax.collections, *ax.texts, *ax.images]:
+        artist.remove()
+    ax.containers.clear()
+    if ax.get_legend() is not None:
+        ax.get_legend().remove()
+    ax.set_prop_cycle(None)
+    ax.relim()
+    ax.set_autoscale_on(True)
+
+
+def thin_ticks(
+    ax: Any,
+    positions: Sequence[float],
+    labels: Sequence[str],
+    axis: str = "x",
+    max_labels: int = MAX_TICK_LABELS,
+) -> None:
+    """Label at most ``max_labels`` evenly spaced ticks (hundreds of weeks stay readable)."""
+    step = max(1, math.ceil(len(positions) / max_labels))
+    setter = ax.set_xticks if axis == "x" else ax.set_yticks
+    setter(list(positions)[::step], list(labels)[::step])
+
+
+def save_figure(figure: Any, outputs: list[tuple[str, int]], tight: bool = True) -> None:
+    for path, dpi in outputs:
+        figure.savefig(path, dpi=dpi, bbox_inches="tight" if tight else None)
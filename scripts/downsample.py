@@ -0,0 +1,105 @@
+"""Bounded-size series for the impact charts.
+
+Long histories are reduced before anything is drawn, so render time and file
+size stop growing with the export:
+
+    lines  Largest-Triangle-Three-Buckets (LTTB) keeps about ``max_points``
+           points that trace the visible shape; the first, last, lowest and
+           highest points are always among them.
+    bars   once a chart has more than ``max_bars`` protocol weeks, the weekly
+           rows are summed per calendar month; the busiest week is reported
+           so the peak is not lost in the monthly sum.
+
+Each reducer also returns a short note for the figure footer (``None`` when
+the data is drawn as is).  A limit of 0 turns the reduction off.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+MAX_LINE_POINTS = 1000
+MAX_WEEKLY_BARS = 104
+
+
+def _as_float(values: np.ndarray | pd.Series) -> np.ndarray:
+    if getattr(values, "dtype", None) is not None and values.dtype.kind == "M":
+        # Tz-aware Series come out of to_numpy() as objects; ask for UTC nanoseconds
+        values = np.asarray(values, dtype="datetime64[ns]").astype(np.int64)
+    return np.asarray(values, dtype=np.float64)
+
+
+def lttb_indices(x: np.ndarray | pd.Series, y: np.ndarray, max_points: int) -> np.ndarray:
+    """Ascending indices of the ``max_points`` LTTB points of ``(x, y)``.
+
+    ``x`` must be sorted (datetimes are fine) and ``y`` free of NaN.  The
+    inner points are split into ``max_points - 2`` equal buckets; each bucket
+    keeps the point spanning the largest triangle with the point kept before it
+    and the mean of the next bucket.
+    """
+    x = _as_float(x)
+    y = _as_float(y)
+    n = x.size
+    if max_points < 3 or n <= max_points:
+        return np.arange(n)
+
+    buckets = max_points - 2
+    edges = 1 + (np.arange(buckets + 1) * (n - 2)) // buckets
+    sizes = np.diff(edges)
+    mean_x = np.append(np.add.reduceat(x[1:-1], edges[:-1] - 1) / sizes, x[-1])
+    mean_y = np.append(np.add.reduceat(y[1:-1], edges[:-1] - 1) / sizes, y[-1])
+
+    selected = np.empty(max_points, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    previous = 0
+    for bucket, (start, stop) in enumerate(zip(edges[:-1].tolist(), edges[1:].tolist())):
+        anchor_x, anchor_y = x[previous], y[previous]
+        area = np.abs(
+            (anchor_x - mean_x[bucket + 1]) * (y[start:stop] - anchor_y)
+            - (anchor_x - x[start:stop]) * (mean_y[bucket + 1] - anchor_y)
+        )
+        previous = start + int(np.argmax(area))
+        selected[bucket + 1] = previous
+    return selected
+
+
+def downsample_line(
+    x: np.ndarray | pd.Series, y: np.ndarray, max_points: int = MAX_LINE_POINTS
+) -> tuple[np.ndarray, str | None]:
+    """Indices to plot for one line, plus a footer note when points were dropped.
+
+    The minimum and maximum of ``y`` are added to the LTTB selection, so the
+    result can hold up to two points more than ``max_points``.
+    """
+    y = np.asarray(y)
+    if not max_points or y.size <= max_points:
+        return np.arange(y.size), None
+    indices = np.union1d(lttb_indices(x, y, max_points), [np.argmin(y), np.argmax(y)])
+    return indices, f"lines: {indices.size:,} of {y.size:,} points (LTTB)"
+
+
+def monthly_bars(
+    frame: pd.DataFrame, max_bars: int = MAX_WEEKLY_BARS
+) -> tuple[pd.DataFrame, str | None]:
+    """Weekly rows (indexed by week end date) summed per month above ``max_bars`` weeks.
+
+    The result is indexed by the first day of each month.  The note names the
+    week with the largest row total.
+    """
+    if not max_bars or len(frame) <= max_bars:
+        return frame, None
+    months = frame.index.to_period("M")
+    monthly = frame.groupby(months).sum(min_count=1)
+    monthly.index = monthly.index.to_timestamp()
+    totals = frame.sum(axis=1)
+    peak = totals.idxmax()
+    note = (
+        f"bars: {len(frame):,} weeks summed into {len(monthly):,} months "
+        f"(peak week {peak:%b %d %Y}: {totals[peak]:,.0f})"
+    )
+    return monthly, note
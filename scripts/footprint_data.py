@@ -0,0 +1,466 @@
+"""Streaming, typed loader for ``solar_footprint_data.json``.
+
+``generate-impact-diagnostics.ts`` writes the file pretty-printed, and for
+whale wallets or network-wide exports the ``farms`` and ``weeks`` arrays get
+large.  Instead of ``json.load`` plus ``pd.DataFrame(list_of_dicts)`` (which
+holds the text, every dict and an object-dtype frame at once), this reads the
+file in chunks, decodes one array element at a time and appends straight
+into compact typed columns:
+
+    farms: farmName category, regionId/weekNumber int32, wattsCaptured float32,
+           finalizedAt datetime64[us] (UTC when the strings carry an offset)
+    weeks: weekNumber/regionId int32, points, sharePercent and
+           networkTotalPower float32
+
+so peak memory is a small multiple of the final frames.  Other top-level keys
+(``walletAddress``, ``summary``, ...) are decoded normally.  Element keys not
+in the schema are ignored; missing numbers become -1 (ints) or NaN (floats).
+
+The columnar exchange format is a pair of Arrow IPC files next to the JSON,
+``<stem>.farms.arrow`` and ``<stem>.weeks.arrow`` (``--format arrow`` on the
+exporter, or ``python scripts/footprint_data.py <stem>.json``).  The other
+top-level keys ride along as JSON in the schema metadata under ``footprint``.
+Those files are memory-mapped, and numeric columns whose stored type already
+matches the schema reach pandas as views of the mapping, without a copy.  ``load_footprint`` reads
+them instead of the JSON whenever they are at least as new; pyarrow is only
+needed when Arrow files are present.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import json
+import re
+import sys
+from array import array
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, TextIO
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+CHUNK_CHARS = 1 << 20
+DEFAULT_BATCH_ROWS = 50_000
+
+FARM_SCHEMA = {
+    "farmName": "category",
+    "regionId": "int32",
+    "weekNumber": "int32",
+    "wattsCaptured": "float32",
+    "finalizedAt": "datetime",
+}
+WEEK_SCHEMA = {
+    "weekNumber": "int32",
+    "regionId": "int32",
+    "totalPoints": "float32",
+    "sharePercent": "float32",
+    "inflationPoints": "float32",
+    "steeringPoints": "float32",
+    "vaultBonusPoints": "float32",
+    "glowWorthPoints": "float32",
+    "networkTotalPower": "float32",
+}
+STREAMED_ARRAYS = {"farms": FARM_SCHEMA, "weeks": WEEK_SCHEMA}
+
+_NUMPY_TYPES = {"int32": np.int32, "float32": np.float32, "category": np.int32, "datetime": np.int64}
+ARROW_SUFFIX = ".arrow"
+ARROW_METADATA_KEY = b"footprint"
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_WHITESPACE = re.compile(r"[ \t\r\n]*")
+
+
+class FootprintFormatError(ValueError):
+    """Raised when the file is not a solar_footprint_data.json object."""
+
+
+@dataclass
+class FootprintData:
+    wallet_address: str
+    summary: dict[str, Any]
+    farms: pd.DataFrame | None
+    weeks: pd.DataFrame | None
+    extra: dict[str, Any] = field(default_factory=dict)  # any other top-level keys
+
+
+class _ColumnBuilder:
+    """Append decoded objects into typed arrays, one per schema column."""
+
+    def __init__(self, schema: dict[str, str]) -> None:
+        self.schema = schema
+        self._categories: dict[str, dict[str, int]] = {}
+        self._aware: dict[str, bool] = {}
+        self.clear()
+
+    def clear(self) -> None:
+        """Start new columns; category codes and time zones carry over to the next batch."""
+        self.rows = 0
+        self._columns: dict[str, Any] = {}
+        for name, kind in self.schema.items():
+            if kind == "int32":
+                self._columns[name] = array("i")
+            elif kind == "float32":
+                self._columns[name] = array("f")
+            elif kind == "category":
+                self._columns[name] = array("i")
+                self._categories.setdefault(name, {})
+            elif kind == "datetime":
+                self._columns[name] = array("q")
+                self._aware.setdefault(name, False)
+            else:
+                raise ValueError(f"unknown column kind {kind!r}")
+
+    def append(self, item: Any) -> None:
+        if not isinstance(item, dict):
+            raise FootprintFormatError(f"expected an object, got {type(item).__name__}")
+        for name, kind in self.schema.items():
+            value = item.get(name)
+            column = self._columns[name]
+            if kind == "int32":
+                column.append(-1 if value is None else int(value))
+            elif kind == "float32":
+                column.append(float("nan") if value is None else float(value))
+            elif kind == "category":
+                codes = self._categories[name]
+                if value is None:
+                    column.append(-1)
+                else:
+                    column.append(codes.setdefault(str(value), len(codes)))
+            else:
+                column.append(self._timestamp_us(name, value))
+        self.rows += 1
+
+    def _timestamp_us(self, name: str, value: Any) -> int:
+        if value is None:
+            return np.iinfo(np.int64).min  # NaT
+        parsed = datetime.fromisoformat(str(value))
+        if parsed.tzinfo is not None:
+            self._aware[name] = True
+            delta = parsed - _EPOCH
+        else:
+            delta = parsed - _EPOCH.replace(tzinfo=None)
+        return (delta.days * 86_400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+    def frame(self) -> pd.DataFrame:
+        import pandas as pd  # lazy: a missing export fails before pandas loads
+
+        data: dict[str, Any] = {}
+        for name, kind in self.schema.items():
+            column = np.frombuffer(self._columns[name], dtype=_NUMPY_TYPES[kind])
+            if kind == "category":
+                categories = list(self._categories[name])
+                data[name] = pd.Categorical.from_codes(column, categories=categories)
+            elif kind == "datetime":
+                times = pd.DatetimeIndex(column.view("datetime64[us]"))
+                data[name] = times.tz_localize("UTC") if self._aware[name] else times
+            else:
+                data[name] = column
+        return pd.DataFrame(data, copy=False)
+
+
+class _JsonStream:
+    """Minimal pull reader over a text file for one top-level JSON object."""
+
+    def __init__(self, handle: TextIO) -> None:
+        self._handle = handle
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+        self._decoder = json.JSONDecoder()
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+        chunk = self._handle.read(CHUNK_CHARS)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos :] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        while True:
+            self._pos = _WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                raise FootprintFormatError("unexpected end of file")
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise FootprintFormatError(f"expected {char!r}, found {found!r}")
+        self._pos += 1
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError as exc:
+                if self._fill():
+                    continue
+                raise FootprintFormatError(str(exc)) from None
+            # A number running into the end of the buffer may continue in the next chunk.
+            if end == len(self._buffer) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+
+def _read_array(
+    stream: _JsonStream,
+    builder: _ColumnBuilder,
+    on_batch: Callable[[pd.DataFrame], None],
+    batch_rows: int | None = None,
+) -> None:
+    stream.expect("[")
+    if stream.peek() == "]":
+        stream.expect("]")
+        on_batch(builder.frame())
+        return
+    emitted = False
+    while True:
+        builder.append(stream.value())
+        if batch_rows is not None and builder.rows >= batch_rows:
+            on_batch(builder.frame())
+            builder.clear()
+            emitted = True
+        if stream.peek() == ",":
+            stream.expect(",")
+        else:
+            stream.expect("]")
+            if builder.rows or not emitted:
+                on_batch(builder.frame())
+            return
+
+
+def arrow_paths(path: str | Path) -> dict[str, Path]:
+    """Arrow table files belonging to an export: ``{"farms": ..., "weeks": ...}``.
+
+    ``path`` may be the JSON file, either table file or ``<stem>.arrow``.
+    """
+    path = Path(path)
+    stem = path.name
+    for suffix in (*(f".{name}{ARROW_SUFFIX}" for name in STREAMED_ARRAYS), ARROW_SUFFIX, ".json"):
+        if stem.endswith(suffix):
+            stem = stem[: -len(suffix)]
+            break
+    return {name: path.with_name(f"{stem}.{name}{ARROW_SUFFIX}") for name in STREAMED_ARRAYS}
+
+
+def _arrow_is_current(path: Path) -> bool:
+    tables = [table for table in arrow_paths(path).values() if table.exists()]
+    if not tables or importlib.util.find_spec("pyarrow") is None:
+        return False
+    if not path.exists():
+        return True
+    return min(table.stat().st_mtime for table in tables) >= path.stat().st_mtime
+
+
+def _arrow_column(table: Any, name: str, kind: str) -> Any:
+    """One schema column as an Arrow array of the loader's type (cast only when it differs)."""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    targets = {
+        "int32": pa.int32(),
+        "float32": pa.float32(),
+        "category": pa.dictionary(pa.int32(), pa.string()),
+        "datetime": pa.timestamp("us"),
+    }
+    target = targets[kind]
+    if name not in table.column_names:
+        missing = float("nan") if kind == "float32" else -1 if kind == "int32" else None
+        return pa.array([missing] * table.num_rows, type=target)
+
+    column = table.column(name)
+    column = column.chunk(0) if column.num_chunks == 1 else column.combine_chunks()
+    if kind == "datetime":
+        target = pa.timestamp("us", tz=getattr(column.type, "tz", None))
+    elif kind == "category" and not pa.types.is_dictionary(column.type):
+        column = column.cast(pa.string()).dictionary_encode()
+    if column.type != target:
+        column = column.cast(target, safe=False)
+    if kind in ("int32", "float32") and column.null_count:
+        column = pc.fill_null(column, -1 if kind == "int32" else float("nan"))
+    return column
+
+
+def _read_arrow(
+    path: str | Path, on_batch: Callable[[str, pd.DataFrame], None], batch_rows: int | None = None
+) -> dict[str, Any]:
+    import pyarrow as pa
+
+    other: dict[str, Any] = {}
+    found = False
+    for name, table_path in arrow_paths(path).items():
+        if not table_path.exists():
+            continue
+        found = True
+        try:
+            # The mapping stays open for as long as the frames reference its buffers
+            table = pa.ipc.open_file(pa.memory_map(str(table_path))).read_all()
+        except pa.ArrowInvalid as exc:
+            raise FootprintFormatError(f"{table_path}: {exc}") from None
+        metadata = (table.schema.metadata or {}).get(ARROW_METADATA_KEY)
+        if metadata is not None:
+            other.update(json.loads(metadata))
+        step = batch_rows or max(table.num_rows, 1)
+        for offset in range(0, max(table.num_rows, 1), step):
+            part = table.slice(offset, step)  # zero-copy; pages are read as columns are touched
+            columns = {column: _arrow_column(part, column, kind) for column, kind in STREAMED_ARRAYS[name].items()}
+            # One block per column keeps the numeric columns as views of the mapped file
+            on_batch(name, pa.table(columns).to_pandas(split_blocks=True))
+
+    if not found:
+        raise FileNotFoundError(f"no {ARROW_SUFFIX} tables for {path}")
+    return other
+
+
+def _read_json(
+    path: str | Path, on_batch: Callable[[str, pd.DataFrame], None], batch_rows: int | None = None
+) -> dict[str, Any]:
+    other: dict[str, Any] = {}
+    with open(path, "r", encoding="utf-8") as handle:
+        stream = _JsonStream(handle)
+        stream.expect("{")
+        if stream.peek() != "}":
+            while True:
+                key = stream.value()
+                if not isinstance(key, str):
+                    raise FootprintFormatError("object keys must be strings")
+                stream.expect(":")
+                if key in STREAMED_ARRAYS:
+                    builder = _ColumnBuilder(STREAMED_ARRAYS[key])
+                    _read_array(stream, builder, lambda frame, key=key: on_batch(key, frame), batch_rows)
+                else:
+                    other[key] = stream.value()
+                if stream.peek() != ",":
+                    break
+                stream.expect(",")
+        stream.expect("}")
+    return other
+
+
+def _collect(reader: Callable[..., dict[str, Any]], path: str | Path) -> FootprintData:
+    frames: dict[str, pd.DataFrame] = {}
+    other = reader(path, frames.__setitem__)
+    return FootprintData(
+        wallet_address=str(other.pop("walletAddress", "")),
+        summary=other.pop("summary", {}),
+        farms=frames.get("farms"),
+        weeks=frames.get("weeks"),
+        extra=other,
+    )
+
+
+def load_footprint_arrow(path: str | Path) -> FootprintData:
+    """Memory-map the Arrow tables of an export; raises FileNotFoundError / FootprintFormatError."""
+    return _collect(_read_arrow, path)
+
+
+def write_footprint_arrow(data: FootprintData, path: str | Path) -> list[Path]:
+    """Write ``data`` as the Arrow tables of ``path``'s export; returns the files written."""
+    import pyarrow as pa
+
+    metadata = json.dumps({"walletAddress": data.wallet_address, "summary": data.summary, **data.extra})
+    written = []
+    for name, table_path in arrow_paths(path).items():
+        frame = getattr(data, name)
+        if frame is None:
+            continue
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        table = table.replace_schema_metadata({ARROW_METADATA_KEY: metadata})
+        with pa.OSFile(str(table_path), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        written.append(table_path)
+    return written
+
+
+def load_footprint(path: str | Path) -> FootprintData:
+    """Load an export into typed frames; raises FileNotFoundError / FootprintFormatError.
+
+    Current Arrow tables win over the JSON file (see :func:`arrow_paths`);
+    otherwise the JSON is streamed.
+    """
+    path = Path(path)
+    if path.name.endswith(ARROW_SUFFIX) or _arrow_is_current(path):
+        return load_footprint_arrow(path)
+    return load_footprint_json(path)
+
+
+def load_footprint_json(path: str | Path) -> FootprintData:
+    """Stream the JSON file ``path`` into typed frames."""
+    return _collect(_read_json, path)
+
+
+def read_footprint_batches(
+    path: str | Path,
+    on_batch: Callable[[str, pd.DataFrame], None],
+    batch_rows: int = DEFAULT_BATCH_ROWS,
+) -> dict[str, Any]:
+    """Hand ``farms``/``weeks`` to ``on_batch(name, frame)`` at most ``batch_rows`` rows at a time.
+
+    Picks Arrow or JSON like :func:`load_footprint` and returns the other
+    top-level keys once the file is done, so memory stays bounded by the batch
+    size however large the export is.
+    """
+    path = Path(path)
+    if path.name.endswith(ARROW_SUFFIX) or _arrow_is_current(path):
+        return _read_arrow(path, on_batch, batch_rows)
+    return _read_json(path, on_batch, batch_rows)
+
+
+def read_export_list(source: str | Path) -> list[tuple[str | None, Path]]:
+    """[(wallet_or_None, path)] from an export file, a directory of exports or a manifest.
+
+    A directory yields every ``*.json`` plus Arrow-only exports; a manifest
+    lists one export per line, optionally as ``wallet,path``.
+    """
+    source = Path(source)
+    if source.is_dir():
+        exports = {path.name: path for path in source.glob("*.json")}
+        for table in source.glob(f"*{ARROW_SUFFIX}"):
+            farms = arrow_paths(table)["farms"]
+            json_name = farms.name[: -len(f".farms{ARROW_SUFFIX}")] + ".json"
+            exports.setdefault(json_name, farms.with_name(json_name[: -len(".json")] + ARROW_SUFFIX))
+        return [(None, exports[name]) for name in sorted(exports)]
+    if source.suffix in (".json", ARROW_SUFFIX):
+        return [(None, source)]
+
+    entries = []
+    for line in source.read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        wallet, _, path = line.rpartition(",")
+        path = Path(path.strip())
+        if not path.is_absolute():
+            path = source.parent / path
+        entries.append((wallet.strip() or None, path))
+    return entries
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Convert solar_footprint_data.json exports to Arrow tables.")
+    parser.add_argument("json_files", nargs="+", type=Path, help="JSON exports to convert")
+    args = parser.parse_args()
+
+    for json_file in args.json_files:
+        try:
+            data = load_footprint_json(json_file)
+        except (FileNotFoundError, FootprintFormatError) as exc:
+            print(f"{json_file}: {exc}", file=sys.stderr)
+            raise SystemExit(1)
+        for table_path in write_footprint_arrow(data, json_file):
+            print(f"Wrote {table_path}")
+
+
+if __name__ == "__main__":
+    main()
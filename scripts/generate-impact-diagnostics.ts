@@ -1,6 +1,14 @@
 /**
  * Expanded diagnostic script to include full weekly power history
  *
+ * OUTPUT (--format json | arrow | both, default json):
+ * - json  → solar_footprint_data.json (pretty-printed, as before)
+ * - arrow → solar_footprint_data.weeks.arrow + solar_footprint_data.farms.arrow,
+ *           Arrow IPC files with one column per field; walletAddress, generatedAt
+ *           and summary travel in the schema metadata under "footprint".
+ *           The Python visualizers memory-map these and prefer them over an
+ *           older JSON file. Needs the apache-arrow package.
+ *
  * FALLBACK LOGIC (matching compute-watts.ts):
  * - If weekly snapshot exists for week-region → use it
  * - If NO network data for week-region (data gap) → use fallback from aggregate cache
@@ -20,8 +28,104 @@ import { getWeekRangeForImpact } from "../src/routers/fractions-router/helpers/a
 import { writeFileSync } from "fs";
 
 const V2_START_WEEK = 97;
+const OUTPUT_STEM = "solar_footprint_data";
+const EXPORT_FORMATS = ["json", "arrow", "both"] as const;
+type ExportFormat = (typeof EXPORT_FORMATS)[number];
+
+function getArgValue(argv: string[], key: string): string | undefined {
+  const idx = argv.indexOf(key);
+  if (idx === -1) return undefined;
+  const value = argv[idx + 1];
+  if (!value || value.startsWith("--")) return undefined;
+  return value;
+}
+
+async function writeArrowTables(
+  stem: string,
+  resultData: {
+    walletAddress: string;
+    generatedAt: string;
+    summary: Record<string, unknown>;
+    weeks: Array<Record<string, number>>;
+    farms: Array<{
+      farmName: string | null;
+      regionId: number;
+      weekNumber: number;
+      finalizedAt: string;
+      capacityWatts: number;
+      userPower: number;
+      networkPower: number;
+      wattsCaptured: number;
+      usedFallback: boolean;
+      hadZeroPower: boolean;
+    }>;
+  }
+) {
+  // Loaded on demand so JSON-only exports do not need apache-arrow installed
+  const arrow = await import("apache-arrow");
+  const { weeks, farms } = resultData;
+  const int32 = (values: number[]) => arrow.makeVector(Int32Array.from(values));
+  const float32 = (values: number[]) =>
+    arrow.makeVector(Float32Array.from(values));
+  const float64 = (values: number[]) =>
+    arrow.makeVector(Float64Array.from(values));
 
-async function generateExpandedBreakdown(walletAddress: string) {
+  // Column types match the Python loader's schema so it can map them without casting
+  const weeksTable = new arrow.Table({
+    weekNumber: int32(weeks.map((w) => w.weekNumber)),
+    regionId: int32(weeks.map((w) => w.regionId)),
+    inflationPoints: float32(weeks.map((w) => w.inflationPoints)),
+    steeringPoints: float32(weeks.map((w) => w.steeringPoints)),
+    vaultBonusPoints: float32(weeks.map((w) => w.vaultBonusPoints)),
+    glowWorthPoints: float32(weeks.map((w) => w.glowWorthPoints)),
+    totalPoints: float32(weeks.map((w) => w.totalPoints)),
+    networkTotalPower: float32(weeks.map((w) => w.networkTotalPower)),
+    sharePercent: float32(weeks.map((w) => w.sharePercent)),
+  });
+  const farmsTable = new arrow.Table({
+    farmName: arrow.vectorFromArray(
+      farms.map((f) => f.farmName),
+      new arrow.Dictionary(new arrow.Utf8(), new arrow.Int32())
+    ),
+    regionId: int32(farms.map((f) => f.regionId)),
+    weekNumber: int32(farms.map((f) => f.weekNumber)),
+    // Timestamp builders take epoch milliseconds and store the declared unit
+    finalizedAt: arrow.vectorFromArray(
+      farms.map((f) => Date.parse(f.finalizedAt)),
+      new arrow.TimestampMicrosecond("UTC")
+    ),
+    capacityWatts: float64(farms.map((f) => f.capacityWatts)),
+    userPower: float64(farms.map((f) => f.userPower)),
+    networkPower: float64(farms.map((f) => f.networkPower)),
+    wattsCaptured: float32(farms.map((f) => f.wattsCaptured)),
+    usedFallback: arrow.vectorFromArray(
+      farms.map((f) => f.usedFallback),
+      new arrow.Bool()
+    ),
+    hadZeroPower: arrow.vectorFromArray(
+      farms.map((f) => f.hadZeroPower),
+      new arrow.Bool()
+    ),
+  });
+
+  const metadata = JSON.stringify({
+    walletAddress: resultData.walletAddress,
+    generatedAt: resultData.generatedAt,
+    summary: resultData.summary,
+  });
+  for (const [name, table] of [
+    ["weeks", weeksTable],
+    ["farms", farmsTable],
+  ] as const) {
+    table.schema.metadata.set("footprint", metadata);
+    writeFileSync(`${stem}.${name}.arrow`, arrow.tableToIPC(table, "file"));
+  }
+}
+
+async function generateExpandedBreakdown(
+  walletAddress: string,
+  format: ExportFormat
+) {
   const wallet = walletAddress.toLowerCase();
   const { startWeek, endWeek } = getWeekRangeForImpact();
 
@@ -226,13 +330,25 @@ async function generateExpandedBreakdown(walletAddress: string) {
     farms: farmsData,
   };
 
-  writeFileSync(
-    "solar_footprint_data.json",
-    JSON.stringify(resultData, null, 2)
-  );
-  console.log("✅ Updated solar_footprint_data.json with full points history");
+  if (format === "json" || format === "both") {
+    writeFileSync(`${OUTPUT_STEM}.json`, JSON.stringify(resultData, null, 2));
+    console.log(`✅ Updated ${OUTPUT_STEM}.json with full points history`);
+  }
+  if (format === "arrow" || format === "both") {
+    await writeArrowTables(OUTPUT_STEM, resultData);
+    console.log(
+      `✅ Updated ${OUTPUT_STEM}.weeks.arrow and ${OUTPUT_STEM}.farms.arrow with full points history`
+    );
+  }
 }
 
 const walletArg = process.argv[2];
 if (!walletArg) process.exit(1);
-generateExpandedBreakdown(walletArg).catch(console.error);
+const formatArg = getArgValue(process.argv, "--format") ?? "json";
+if (!(EXPORT_FORMATS as readonly string[]).includes(formatArg)) {
+  console.error(`--format must be one of ${EXPORT_FORMATS.join(", ")}`);
+  process.exit(1);
+}
+generateExpandedBreakdown(walletArg, formatArg as ExportFormat).catch(
+  console.error
+);
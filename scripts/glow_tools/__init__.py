@@ -0,0 +1,13 @@
+"""One command line for the Python solar and impact tools.
+
+    python scripts/glow_tools power 40.76 -111.89 12000 --year 2023
+    python scripts/glow_tools footprint solar_footprint_data.json --no-show
+    python scripts/glow_tools points solar_footprint_data.json --fast --tier preview
+
+(``python -m glow_tools ...`` from scripts/ works too.)  Each subcommand's
+module is imported only when that subcommand runs.  The chart commands check
+their arguments and load the export before matplotlib, seaborn and pandas
+are imported, so ``--help``, bad options and a missing file return at once.
+The ``visualize_*.py`` scripts at the repository root are shims over these
+commands.
+"""
@@ -0,0 +1,10 @@
+import os
+import sys
+
+if not __package__:
+    # python scripts/glow_tools: the package and its sibling modules live in scripts/
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from glow_tools.cli import main
+
+main()
@@ -0,0 +1,97 @@
+"""Options and helpers shared by the chart commands.
+
+Nothing here imports matplotlib, seaborn or pandas; the renderers do, and the
+commands only import them once the arguments and the export check out.
+"""
+
+from __future__ import annotations
+
+import argparse
+from typing import TYPE_CHECKING
+
+from chart_theme import PREVIEW_DPI, TIERS
+from downsample import MAX_LINE_POINTS, MAX_WEEKLY_BARS
+from footprint_data import load_footprint
+from instrumentation import stage
+
+if TYPE_CHECKING:
+    from footprint_data import FootprintData
+
+DEFAULT_EXPORT = "solar_footprint_data.json"
+
+
+def add_chart_arguments(
+    parser: argparse.ArgumentParser, default_output: str, line: str
+) -> None:
+    """Input/output, render path, DPI tier and downsampling options.
+
+    ``line`` names the chart's line series in the --max-points help.
+    """
+    parser.add_argument("json_file", nargs="?", default=DEFAULT_EXPORT)
+    parser.add_argument(
+        "-o",
+        "--output",
+        default=default_output,
+        help=f"Output image path (default: {default_output})",
+    )
+    parser.add_argument(
+        "--no-show", action="store_true", help="Save the figure without opening a window"
+    )
+    parser.add_argument(
+        "--fast",
+        action="store_true",
+        help="Render on a reusable template with plain matplotlib calls (batch/long histories)",
+    )
+    parser.add_argument(
+        "--tier",
+        choices=TIERS,
+        default="final",
+        help="final (300 dpi), preview (<name>.preview.png) or both",
+    )
+    parser.add_argument(
+        "--preview-dpi",
+        type=int,
+        default=PREVIEW_DPI,
+        help=f"DPI of the preview tier (default: {PREVIEW_DPI})",
+    )
+    parser.add_argument(
+        "--max-points",
+        type=int,
+        default=MAX_LINE_POINTS,
+        help=(
+            f"LTTB-downsample {line} above this many points; 0 keeps every point "
+            f"(default: {MAX_LINE_POINTS})"
+        ),
+    )
+    parser.add_argument(
+        "--max-bars",
+        type=int,
+        default=MAX_WEEKLY_BARS,
+        help=(
+            "Sum weekly bars per month above this many weeks; 0 keeps weekly bars "
+            f"(default: {MAX_WEEKLY_BARS})"
+        ),
+    )
+
+
+def validate_chart_arguments(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    if args.preview_dpi < 1:
+        parser.error("--preview-dpi must be positive")
+    if args.max_points < 0 or args.max_bars < 0:
+        parser.error("--max-points and --max-bars must not be negative")
+
+
+def load_export(json_file: str, hint: str) -> FootprintData | None:
+    """The loaded export, or None after printing why it is missing."""
+    try:
+        with stage("load_json"):
+            return load_footprint(json_file)
+    except FileNotFoundError:
+        print(f"❌ Error: {json_file} not found. {hint}")
+        return None
+
+
+def short_wallet(address: str) -> str:
+    if address.startswith("0x"):
+        return address[:10] + "..." + address[-8:]
+    return address
@@ -0,0 +1,43 @@
+"""Subcommand dispatch; imports only the module of the command being run."""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+from typing import NamedTuple, Sequence
+
+
+class Command(NamedTuple):
+    module: str  # provides main(argv, prog)
+    help: str
+
+
+COMMANDS = {
+    "footprint": Command(
+        "glow_tools.footprint", "Render solar_footprint_analysis.png from an impact export"
+    ),
+    "points": Command("glow_tools.points", "Render points_analysis.png from an impact export"),
+    "power": Command(
+        "power", "Monthly production, value buckets and $/kWh from NASA hourly irradiance"
+    ),
+}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    listing = "\n".join(f"  {name:<11} {command.help}" for name, command in COMMANDS.items())
+    parser = argparse.ArgumentParser(
+        prog="glow_tools",
+        description="Solar quotes and impact charts.",
+        epilog=f"commands:\n{listing}\n\nRun 'glow_tools <command> --help' for its options.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("command", choices=COMMANDS, metavar="command", help="see below")
+    parser.add_argument("args", nargs=argparse.REMAINDER, help=argparse.SUPPRESS)
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    module = importlib.import_module(COMMANDS[args.command].module)
+    module.main(args.args, prog=f"{parser.prog} {args.command}")
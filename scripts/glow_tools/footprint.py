@@ -0,0 +1,86 @@
+"""``footprint``: render solar_footprint_analysis.png from an impact export.
+
+    python scripts/glow_tools footprint solar_footprint_data.json --no-show
+"""
+
+from __future__ import annotations
+
+import argparse
+from typing import TYPE_CHECKING, Sequence
+
+from chart_theme import PREVIEW_DPI, tier_outputs
+from downsample import MAX_LINE_POINTS, MAX_WEEKLY_BARS
+from instrumentation import add_profile_arguments, finish_profiling, stage, start_profiling
+
+from glow_tools.charts import (
+    DEFAULT_EXPORT,
+    add_chart_arguments,
+    load_export,
+    validate_chart_arguments,
+)
+
+if TYPE_CHECKING:
+    from footprint_data import FootprintData
+
+DEFAULT_OUTPUT = "solar_footprint_analysis.png"
+
+
+def visualize_footprint(
+    json_file: str = DEFAULT_EXPORT,
+    output_file: str = DEFAULT_OUTPUT,
+    show: bool = True,
+    data: FootprintData | None = None,
+    fast: bool = False,
+    tier: str = "final",
+    preview_dpi: int = PREVIEW_DPI,
+    max_points: int = MAX_LINE_POINTS,
+    max_bars: int = MAX_WEEKLY_BARS,
+) -> str | None:
+    """Render the report and return the first path saved.
+
+    Batch workers pass ``data`` already loaded.  Returns None, after printing
+    why, when the export is missing or has no ``farms``.  ``max_points`` and
+    ``max_bars`` bound the cumulative line and the weekly bars (0 = off).
+    """
+    outputs = tier_outputs(output_file, tier, preview_dpi)
+    if data is None:
+        data = load_export(json_file, "Run the footprint breakdown script first.")
+        if data is None:
+            return None
+    if data.farms is None:
+        print("❌ Error: JSON does not contain 'farms'. Run the footprint breakdown script first.")
+        return None
+
+    from glow_tools.footprint_render import render_footprint
+
+    return render_footprint(data, outputs, show, fast, max_points, max_bars)
+
+
+def build_parser(prog: str | None = None) -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog=prog,
+        description="Render solar_footprint_analysis.png from solar_footprint_data.json.",
+    )
+    add_chart_arguments(parser, DEFAULT_OUTPUT, line="the cumulative farm line")
+    add_profile_arguments(parser)
+    return parser
+
+
+def main(argv: Sequence[str] | None = None, prog: str | None = None) -> None:
+    parser = build_parser(prog)
+    args = parser.parse_args(argv)
+    validate_chart_arguments(parser, args)
+
+    profiler = start_profiling(args, parser.prog)
+    with stage("render"):
+        visualize_footprint(
+            args.json_file,
+            args.output,
+            show=not args.no_show,
+            fast=args.fast,
+            tier=args.tier,
+            preview_dpi=args.preview_dpi,
+            max_points=args.max_points,
+            max_bars=args.max_bars,
+        )
+    finish_profiling(profiler, args.profile)
@@ -0,0 +1,361 @@
+"""Four-panel footprint report: cumulative growth, region split, activity, top farms.
+
+Imported by ``glow_tools.footprint`` only after the export has loaded.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any
+
+import matplotlib.patches as mpatches
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import seaborn as sns
+
+from chart_theme import (
+    OTHER_REGION_COLOR,
+    REGION_COLORS,
+    REGION_LABELS,
+    figure_template,
+    save_figure,
+    setup_theme,
+    thin_ticks,
+    week_to_date,
+)
+from downsample import downsample_line, monthly_bars
+from footprint_data import FootprintData
+from instrumentation import count, stage
+
+from glow_tools.charts import short_wallet
+
+WATTS_PER_PANEL = 400
+
+
+def _build_fast_template() -> tuple[Any, tuple[Any, ...]]:
+    # Everything that does not depend on the data is styled once per process
+    fig = plt.figure(figsize=(18, 14))
+    fig.subplots_adjust(left=0.06, right=0.86, top=0.86, bottom=0.08, hspace=0.4, wspace=0.3)
+    ax1 = fig.add_subplot(2, 2, 1)
+    ax1.set_title("Cumulative Solar Footprint Growth", fontsize=14, fontweight="bold", pad=15)
+    ax1.set_xlabel("Finalization Date", fontsize=12)
+    ax1.set_ylabel("Total Watts (Captured)", fontsize=12)
+    ax1_panels = ax1.twinx()
+    ax1_panels.set_ylabel("Panels Equivalent", fontsize=12, color="#92400e")
+    ax1_panels.grid(False)
+    ax2 = fig.add_subplot(2, 2, 2)
+    ax2.set_title("Regional Distribution of Impact", fontsize=14, fontweight="bold", pad=15)
+    ax3 = fig.add_subplot(2, 2, 3)
+    ax3.set_title("Weekly Captured Power by Region", fontsize=14, fontweight="bold", pad=15)
+    ax3.set_xlabel("Protocol Week (End Date)", fontsize=12)
+    ax3.set_ylabel("Watts Captured (New)", fontsize=12)
+    ax4 = fig.add_subplot(2, 2, 4)
+    ax4.set_title("Top Individual Farm Contributions", fontsize=14, fontweight="bold", pad=15)
+    ax4.set_xlabel("Watts Captured from Farm", fontsize=12)
+    footer = fig.text(0.5, 0.01, "", ha="center", fontsize=10, color="gray", style="italic")
+    return fig, (ax1, ax1_panels, ax2, ax3, ax4, footer)
+
+
+def _suptitle(df: pd.DataFrame, data: FootprintData) -> str:
+    return (
+        f"Solar Impact Summary: {short_wallet(data.wallet_address)}\n"
+        f"Verified: {data.summary['totalWatts']:,} Watts | "
+        f"Equiv: {data.summary['totalPanels']} Panels | "
+        f"Weeks Active: {df['weekNumber'].nunique()}"
+    )
+
+
+def _footer(df: pd.DataFrame, notes: list[str]) -> str:
+    return (
+        f"Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} UTC • "
+        f"Data starting Week {df['weekNumber'].min()}" + "".join(f" • {note}" for note in notes)
+    )
+
+
+def _render_fast(
+    df: pd.DataFrame,
+    growth: pd.DataFrame,
+    weekly: pd.DataFrame,
+    period: str,
+    notes: list[str],
+    data: FootprintData,
+    legend_patches: list[Any],
+) -> Any:
+    # Same four panels drawn with plain matplotlib calls on the reusable template;
+    # the heavy artists are rasterized so large exports do not bloat vector output
+    fig, (ax1, ax1_panels, ax2, ax3, ax4, footer) = figure_template(
+        "footprint", _build_fast_template
+    )
+    fig.legend(
+        handles=legend_patches,
+        loc="upper right",
+        bbox_to_anchor=(0.99, 0.95),
+        title="Regions",
+        fontsize=12,
+    )
+
+    # 1. Cumulative Growth
+    dates = growth["finalizedAt"].to_numpy()
+    cumulative = growth["cumulativeWatts"].to_numpy()
+    ax1.plot(
+        dates,
+        cumulative,
+        marker="o" if len(growth) <= 200 else None,
+        markeredgecolor="white",
+        color="#f59e0b",
+        linewidth=3,
+        rasterized=True,
+    )
+    ax1.fill_between(dates, cumulative, color="#f59e0b", alpha=0.15, rasterized=True)
+    ax1.autoscale_view()
+    low, high = ax1.get_ylim()
+    ax1_panels.set_ylim(low / WATTS_PER_PANEL, high / WATTS_PER_PANEL)
+
+    # 2. Watts Captured by Region
+    region_totals = df.groupby("regionId")["wattsCaptured"].sum()
+    ax2.pie(
+        region_totals,
+        labels=[REGION_LABELS.get(r, f"Region {r}") for r in region_totals.index],
+        autopct="%1.1f%%",
+        startangle=140,
+        colors=[REGION_COLORS.get(r, OTHER_REGION_COLOR) for r in region_totals.index],
+        wedgeprops={"edgecolor": "white", "linewidth": 2, "alpha": 0.8},
+        textprops={"fontsize": 12, "fontweight": "bold"},
+    )
+
+    # 3. Weekly (or monthly) Activity: grouped bars, one offset series per region
+    # (desaturated like seaborn's bars)
+    ax3.title.set_text(f"{period}ly Captured Power by Region")
+    ax3.xaxis.label.set_text("Protocol Week (End Date)" if period == "Week" else "Month")
+    positions = np.arange(len(weekly))
+    width = 0.8 / max(len(weekly.columns), 1)
+    edge = 0 if len(weekly) > 100 else None  # white bar edges swamp thin bars
+    for k, rid in enumerate(weekly.columns):
+        offset = (k - (len(weekly.columns) - 1) / 2) * width
+        ax3.bar(
+            positions + offset,
+            weekly[rid].fillna(0).to_numpy(),
+            width,
+            color=sns.desaturate(REGION_COLORS.get(rid, OTHER_REGION_COLOR), 0.75),
+            linewidth=edge,
+            rasterized=True,
+        )
+    date_format = "%b %d" if period == "Week" else "%b %Y"
+    thin_ticks(
+        ax3, positions, [date.strftime(date_format) for date in weekly.index], max_labels=12
+    )
+    ax3.set_xlim(-0.5, len(weekly) - 0.5)
+
+    # 4. Top Farms with bar_label instead of walking the patches
+    top_farms = df.nlargest(12, "wattsCaptured")
+    rows = np.arange(len(top_farms))
+    bars = ax4.barh(
+        rows,
+        top_farms["wattsCaptured"].to_numpy(),
+        color=[
+            sns.desaturate(REGION_COLORS.get(r, OTHER_REGION_COLOR), 0.75)
+            for r in top_farms["regionId"]
+        ],
+    )
+    ax4.set_yticks(rows, top_farms["farmName"].astype(str).tolist())
+    ax4.set_ylim(len(top_farms) - 0.5, -0.5)
+    ax4.bar_label(
+        bars,
+        labels=[f"{int(w):,}W" for w in top_farms["wattsCaptured"]],
+        padding=3,
+        fontsize=10,
+    )
+    ax4.autoscale_view()
+
+    fig.suptitle(_suptitle(df, data), fontsize=20, fontweight="bold", y=0.97)
+    footer.set_text(_footer(df, notes))
+    return fig
+
+
+def _render_seaborn(
+    df: pd.DataFrame,
+    growth: pd.DataFrame,
+    weekly: pd.DataFrame,
+    period: str,
+    notes: list[str],
+    data: FootprintData,
+    legend_patches: list[Any],
+) -> Any:
+    setup_theme()
+
+    fig = plt.figure(figsize=(18, 14))
+    plt.subplots_adjust(hspace=0.4, wspace=0.3)
+    fig.legend(
+        handles=legend_patches,
+        loc="upper right",
+        bbox_to_anchor=(0.95, 0.95),
+        title="Regions",
+        fontsize=12,
+    )
+
+    # 1. Cumulative Growth (Line Chart)
+    ax1 = plt.subplot(2, 2, 1)
+    sns.lineplot(
+        data=growth,
+        x="finalizedAt",
+        y="cumulativeWatts",
+        marker="o",
+        ax=ax1,
+        color="#f59e0b",
+        linewidth=3,
+    )
+    ax1.fill_between(
+        growth["finalizedAt"], growth["cumulativeWatts"], color="#f59e0b", alpha=0.15
+    )
+    ax1.set_title("Cumulative Solar Footprint Growth", fontsize=14, fontweight="bold", pad=15)
+    ax1.set_xlabel("Finalization Date", fontsize=12)
+    ax1.set_ylabel("Total Watts (Captured)", fontsize=12)
+
+    # Add a panel count twin axis
+    ax1_panels = ax1.twinx()
+    low, high = ax1.get_ylim()
+    ax1_panels.set_ylim(low / WATTS_PER_PANEL, high / WATTS_PER_PANEL)
+    ax1_panels.set_ylabel("Panels Equivalent", fontsize=12, color="#92400e")
+    ax1_panels.grid(False)
+
+    # 2. Watts Captured by Region (Pie Chart)
+    ax2 = plt.subplot(2, 2, 2)
+    region_totals = df.groupby("regionId")["wattsCaptured"].sum()
+    ax2.pie(
+        region_totals,
+        labels=[REGION_LABELS.get(r, f"Region {r}") for r in region_totals.index],
+        autopct="%1.1f%%",
+        startangle=140,
+        colors=[REGION_COLORS.get(r, OTHER_REGION_COLOR) for r in region_totals.index],
+        wedgeprops={"edgecolor": "white", "linewidth": 2, "alpha": 0.8},
+        textprops={"fontsize": 12, "fontweight": "bold"},
+    )
+    ax2.set_title("Regional Distribution of Impact", fontsize=14, fontweight="bold", pad=15)
+
+    # 3. Weekly (or monthly) Activity (Spikes in capture)
+    ax3 = plt.subplot(2, 2, 3)
+    weekly_capture = (
+        weekly.rename_axis(index="date", columns="regionId")
+        .stack()
+        .dropna()
+        .rename("wattsCaptured")
+        .reset_index()
+    )
+    weekly_capture["date_label"] = weekly_capture["date"].dt.strftime(
+        "%b %d" if period == "Week" else "%b %Y"
+    )
+    sns.barplot(
+        data=weekly_capture,
+        x="date_label",
+        y="wattsCaptured",
+        hue="regionId",
+        palette=REGION_COLORS,
+        ax=ax3,
+        dodge=True,
+    )
+    ax3.set_title(f"{period}ly Captured Power by Region", fontsize=14, fontweight="bold", pad=15)
+    ax3.set_xlabel("Protocol Week (End Date)" if period == "Week" else "Month", fontsize=12)
+    ax3.set_ylabel("Watts Captured (New)", fontsize=12)
+    ax3.get_legend().remove()  # Use global legend
+    date_labels = weekly_capture["date_label"].unique()
+    thin_ticks(ax3, np.arange(len(date_labels)), date_labels, max_labels=12)
+
+    # 4. Top Farms Analysis (Horizontal Bar)
+    ax4 = plt.subplot(2, 2, 4)
+    top_farms = df.nlargest(12, "wattsCaptured").copy()
+    # Only these names on the axis, not every category
+    top_farms["farmName"] = top_farms["farmName"].astype(str)
+    sns.barplot(
+        data=top_farms,
+        x="wattsCaptured",
+        y="farmName",
+        hue="regionId",
+        palette=REGION_COLORS,
+        ax=ax4,
+        dodge=False,
+    )
+    ax4.set_title("Top Individual Farm Contributions", fontsize=14, fontweight="bold", pad=15)
+    ax4.set_xlabel("Watts Captured from Farm", fontsize=12)
+    ax4.set_ylabel("")
+    ax4.get_legend().remove()
+
+    # Add labels to the top farms
+    for patch in ax4.patches:
+        width = patch.get_width()
+        if width > 0:
+            ax4.text(
+                width + 50,
+                patch.get_y() + patch.get_height() / 2,
+                f"{int(width):,}W",
+                va="center",
+                fontsize=10,
+            )
+
+    plt.suptitle(_suptitle(df, data), fontsize=20, fontweight="bold", y=1.02)
+    fig.text(
+        0.5,
+        0.01,
+        _footer(df, notes),
+        ha="center",
+        fontsize=10,
+        color="gray",
+        style="italic",
+    )
+    return fig
+
+
+def render_footprint(
+    data: FootprintData,
+    outputs: list[tuple[str, int]],
+    show: bool,
+    fast: bool,
+    max_points: int,
+    max_bars: int,
+) -> str:
+    # Farms arrive typed (finalizedAt already datetime); sort for the cumulative view
+    with stage("dataframe"):
+        df = data.farms.sort_values("finalizedAt")
+    count("farms_rendered", len(df))
+
+    # float32 drifts over many farms
+    df["cumulativeWatts"] = df["wattsCaptured"].astype("float64").cumsum()
+    df["cumulativePanels"] = df["cumulativeWatts"] / WATTS_PER_PANEL
+
+    # Bound what gets drawn however many farms there are: LTTB cumulative line, monthly bars
+    with stage("downsample"):
+        keep, line_note = downsample_line(
+            df["finalizedAt"], df["cumulativeWatts"].to_numpy(), max_points
+        )
+        growth = df.iloc[keep]
+        weekly = df.pivot_table(
+            index="weekNumber",
+            columns="regionId",
+            values="wattsCaptured",
+            aggfunc="sum",
+            observed=True,
+        )
+        weekly.index = pd.DatetimeIndex([week_to_date(int(week)) for week in weekly.index])
+        weekly, bar_note = monthly_bars(weekly, max_bars)
+    period = "Month" if bar_note else "Week"
+    notes = [note for note in (bar_note, line_note) if note]
+
+    # Legend for the whole figure
+    regions = set(df["regionId"].unique().tolist())
+    legend_patches = [
+        mpatches.Patch(color=REGION_COLORS[rid], label=label)
+        for rid, label in REGION_LABELS.items()
+        if rid in regions
+    ]
+
+    render = _render_fast if fast else _render_seaborn
+    fig = render(df, growth, weekly, period, notes, data, legend_patches)
+    with stage("savefig"):
+        save_figure(fig, outputs, tight=not fast)
+    print(f"✅ Enhanced visualization saved to {', '.join(path for path, _ in outputs)}")
+    if show:
+        with stage("show"):
+            plt.show()
+    elif not fast:
+        plt.close(fig)  # the fast template is reused, never closed
+    return outputs[0][0]
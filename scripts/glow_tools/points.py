@@ -0,0 +1,121 @@
+"""``points``: render points_analysis.png from an impact export.
+
+    python scripts/glow_tools points solar_footprint_data.json --fast --tier preview
+
+Each wallet's weekly aggregates are kept under --aggregate-dir, so a re-run
+only reduces the weeks finalized since the last one.
+"""
+
+from __future__ import annotations
+
+import argparse
+from typing import TYPE_CHECKING, Sequence
+
+from chart_theme import PREVIEW_DPI, tier_outputs
+from downsample import MAX_LINE_POINTS, MAX_WEEKLY_BARS
+from instrumentation import add_profile_arguments, finish_profiling, stage, start_profiling
+from weekly_aggregates import DEFAULT_AGGREGATE_DIR, WeeklyAggregateStore
+
+from glow_tools.charts import (
+    DEFAULT_EXPORT,
+    add_chart_arguments,
+    load_export,
+    validate_chart_arguments,
+)
+
+if TYPE_CHECKING:
+    from footprint_data import FootprintData
+
+DEFAULT_OUTPUT = "points_analysis.png"
+
+
+def visualize_points(
+    json_file: str = DEFAULT_EXPORT,
+    output_file: str = DEFAULT_OUTPUT,
+    show: bool = True,
+    data: FootprintData | None = None,
+    fast: bool = False,
+    tier: str = "final",
+    preview_dpi: int = PREVIEW_DPI,
+    aggregates: WeeklyAggregateStore | None = None,
+    rebuild: bool = False,
+    max_points: int = MAX_LINE_POINTS,
+    max_bars: int = MAX_WEEKLY_BARS,
+) -> str | None:
+    """Render the report and return the first path saved.
+
+    Batch workers pass ``data`` already loaded.  With ``aggregates`` only the
+    weeks above the wallet's stored mark get reduced (``rebuild`` drops the
+    stored weeks first).  Returns None, after printing why, when the export is
+    missing or its ``weeks`` are absent or empty.  ``max_points`` and
+    ``max_bars`` bound the share lines and the weekly bars (0 = off).
+    """
+    outputs = tier_outputs(output_file, tier, preview_dpi)
+    if data is None:
+        data = load_export(json_file, "Run the expanded diagnostic script first.")
+        if data is None:
+            return None
+    if data.weeks is None:
+        print(
+            "❌ Error: JSON does not contain 'weeks' history. "
+            "Run generate-impact-diagnostics.ts first."
+        )
+        return None
+    if data.weeks.empty:
+        print("❌ Error: JSON 'weeks' history is empty; nothing to plot.")
+        return None
+
+    from glow_tools.points_render import render_points
+
+    return render_points(data, outputs, show, fast, aggregates, rebuild, max_points, max_bars)
+
+
+def build_parser(prog: str | None = None) -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog=prog, description="Render points_analysis.png from solar_footprint_data.json."
+    )
+    add_chart_arguments(parser, DEFAULT_OUTPUT, line="the regional share lines")
+    parser.add_argument(
+        "--aggregate-dir",
+        default=str(DEFAULT_AGGREGATE_DIR),
+        help=f"Directory for the per-wallet weekly aggregates (default: {DEFAULT_AGGREGATE_DIR})",
+    )
+    parser.add_argument(
+        "--no-aggregate-cache",
+        action="store_true",
+        help="Reduce every week from the export and store nothing",
+    )
+    parser.add_argument(
+        "--rebuild-aggregates",
+        action="store_true",
+        help="Drop this wallet's stored weeks and reduce the export from scratch",
+    )
+    add_profile_arguments(parser)
+    return parser
+
+
+def main(argv: Sequence[str] | None = None, prog: str | None = None) -> None:
+    parser = build_parser(prog)
+    args = parser.parse_args(argv)
+    validate_chart_arguments(parser, args)
+    if args.rebuild_aggregates and args.no_aggregate_cache:
+        parser.error(
+            "--rebuild-aggregates requires the aggregate cache; drop --no-aggregate-cache."
+        )
+
+    aggregates = None if args.no_aggregate_cache else WeeklyAggregateStore(args.aggregate_dir)
+    profiler = start_profiling(args, parser.prog)
+    with stage("render"):
+        visualize_points(
+            args.json_file,
+            args.output,
+            show=not args.no_show,
+            fast=args.fast,
+            tier=args.tier,
+            preview_dpi=args.preview_dpi,
+            aggregates=aggregates,
+            rebuild=args.rebuild_aggregates,
+            max_points=args.max_points,
+            max_bars=args.max_bars,
+        )
+    finish_profiling(profiler, args.profile)
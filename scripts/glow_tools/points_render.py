@@ -0,0 +1,275 @@
+"""Three-panel points report: total power, power by source, regional share trend.
+
+Imported by ``glow_tools.points`` only after the export has loaded.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any
+
+import matplotlib.patches as mpatches
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import seaborn as sns
+
+from chart_theme import (
+    OTHER_REGION_COLOR,
+    REGION_COLORS,
+    REGION_LABELS,
+    figure_template,
+    save_figure,
+    setup_theme,
+    thin_ticks,
+    week_to_date,
+)
+from downsample import downsample_line, monthly_bars
+from footprint_data import FootprintData
+from instrumentation import count, stage
+from weekly_aggregates import SOURCE_COLUMNS, WeeklyAggregates, WeeklyAggregateStore
+
+from glow_tools.charts import short_wallet
+
+SOURCE_LABELS = {
+    "inflationPoints": "Emissions (Inflation)",
+    "steeringPoints": "Steering (sGCTL)",
+    "vaultBonusPoints": "Vault Bonus (Delegations)",
+    "glowWorthPoints": "GlowWorth (Holdings)",
+}
+SOURCE_COLORS = ["#10b981", "#3b82f6", "#8b5cf6", "#f43f5e"]  # Green, Blue, Purple, Pink
+TOTAL_TITLE = "Total Capture Power Evolution (Points per {period})"
+SOURCE_TITLE = "Power Composition by Source (Emissions, Steering, Vault, Worth)"
+SHARE_TITLE = "Regional Influence Trend (% Share of Total Network Power)"
+FOOTER_NOTE = "Note: Power = Direct Points + GlowWorth Points"
+
+
+def _build_fast_template() -> tuple[Any, tuple[Any, ...]]:
+    # Everything that does not depend on the data is styled once per process
+    fig = plt.figure(figsize=(16, 18))
+    fig.subplots_adjust(left=0.07, right=0.83, top=0.88, bottom=0.07, hspace=0.4)
+    ax1 = fig.add_subplot(3, 1, 1)
+    ax1.set_title(TOTAL_TITLE.format(period="Week"), fontsize=16, fontweight="bold", pad=20)
+    ax1.set_xlabel("Finalization Date", fontsize=12)
+    ax1.set_ylabel("Total Power Points", fontsize=12)
+    ax2 = fig.add_subplot(3, 1, 2)
+    ax2.set_title(SOURCE_TITLE, fontsize=16, fontweight="bold", pad=20)
+    ax2.set_xlabel("Finalization Date", fontsize=12)
+    ax2.set_ylabel("Points", fontsize=12)
+    ax3 = fig.add_subplot(3, 1, 3)
+    ax3.set_title(SHARE_TITLE, fontsize=16, fontweight="bold", pad=20)
+    ax3.set_xlabel("Finalization Date", fontsize=12)
+    ax3.set_ylabel("Network Share (%)", fontsize=12)
+    footer = fig.text(0.5, 0.02, "", ha="center", fontsize=10, color="gray", style="italic")
+    return fig, (ax1, ax2, ax3, footer)
+
+
+def _stacked_bars(ax: Any, frame: pd.DataFrame, colors: list[str], date_format: str) -> None:
+    # One bar() call per series with accumulated bottoms, like pandas' stacked bar plot;
+    # past a few hundred weeks the theme's white bar edges would hide the bars entirely
+    positions = np.arange(len(frame))
+    bottom = np.zeros(len(frame))
+    edge = 0 if len(frame) > 200 else None
+    for column, color in zip(frame.columns, colors):
+        values = frame[column].to_numpy(dtype="float64")
+        ax.bar(
+            positions,
+            values,
+            0.5,
+            bottom=bottom,
+            color=color,
+            linewidth=edge,
+            label=column,
+            rasterized=True,
+        )
+        bottom += values
+    thin_ticks(ax, positions, [date.strftime(date_format) for date in frame.index])
+    ax.set_xlim(-0.5, len(frame) - 0.5)
+
+
+def _footer(notes: list[str]) -> str:
+    return (
+        f"Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} UTC • {FOOTER_NOTE}"
+        + "".join(f" • {note}" for note in notes)
+    )
+
+
+def _region_colors(frame: pd.DataFrame) -> list[str]:
+    return [REGION_COLORS.get(rid, OTHER_REGION_COLOR) for rid in frame.columns]
+
+
+def _render_fast(
+    pivot_df: pd.DataFrame,
+    source_df: pd.DataFrame,
+    share_lines: dict[int, pd.Series],
+    share_max: float,
+    period: str,
+    title: str,
+    notes: list[str],
+    legend_patches: list[Any],
+) -> Any:
+    # Same three panels drawn with plain matplotlib calls on the reusable template;
+    # the heavy artists are rasterized so long histories do not bloat vector output
+    fig, (ax1, ax2, ax3, footer) = figure_template("points", _build_fast_template)
+    date_format = "%b %d\n%Y" if period == "Week" else "%b\n%Y"
+
+    # 1. Total Power Evolution
+    ax1.title.set_text(TOTAL_TITLE.format(period=period))
+    _stacked_bars(ax1, pivot_df, _region_colors(pivot_df), date_format)
+    ax1.legend(handles=legend_patches, title="Regions", loc="upper left", bbox_to_anchor=(1, 1))
+
+    # 2. Source Breakdown
+    _stacked_bars(ax2, source_df, SOURCE_COLORS, date_format)
+    ax2.legend(loc="upper left", bbox_to_anchor=(1, 1))
+
+    # 3. Regional Influence Trend
+    for rid, region_share in share_lines.items():
+        ax3.plot(
+            region_share.index.to_numpy(),
+            region_share.to_numpy(),
+            marker=None if len(region_share) > 200 else "o",
+            markeredgecolor="white",
+            color=REGION_COLORS.get(rid, OTHER_REGION_COLOR),
+            label=REGION_LABELS.get(rid, f"R{rid}"),
+            linewidth=3,
+            markersize=8,
+            rasterized=True,
+        )
+    ax3.autoscale_view()
+    ax3.set_ylim(0, share_max * 1.3 or 1.0)  # no known share: keep a valid range
+    ax3.legend(title="Regions", loc="upper left", bbox_to_anchor=(1, 1))
+
+    fig.suptitle(title, fontsize=22, fontweight="bold", y=0.97)
+    footer.set_text(_footer(notes))
+    return fig
+
+
+def _render_seaborn(
+    pivot_df: pd.DataFrame,
+    source_df: pd.DataFrame,
+    share_lines: dict[int, pd.Series],
+    share_max: float,
+    period: str,
+    title: str,
+    notes: list[str],
+    legend_patches: list[Any],
+) -> Any:
+    setup_theme()
+
+    fig = plt.figure(figsize=(16, 18))
+    plt.subplots_adjust(hspace=0.4, wspace=0.3)
+    date_format = "%b %d\n%Y" if period == "Week" else "%b\n%Y"
+
+    # 1. Total Power Evolution (Stacked Bar by Region)
+    ax1 = plt.subplot(3, 1, 1)
+    pivot_df = pivot_df.set_axis(pivot_df.index.strftime(date_format))
+    pivot_df.plot(kind="bar", stacked=True, ax=ax1, color=_region_colors(pivot_df))
+    ax1.set_title(TOTAL_TITLE.format(period=period), fontsize=16, fontweight="bold", pad=20)
+    ax1.set_xlabel("Finalization Date", fontsize=12)
+    ax1.set_ylabel("Total Power Points", fontsize=12)
+    ax1.legend(handles=legend_patches, title="Regions", loc="upper left", bbox_to_anchor=(1, 1))
+    thin_ticks(ax1, np.arange(len(pivot_df)), pivot_df.index)
+
+    # 2. Source Breakdown (Granular Sources)
+    ax2 = plt.subplot(3, 1, 2)
+    source_df = source_df.set_axis(source_df.index.strftime(date_format))
+    source_df.plot(kind="bar", stacked=True, ax=ax2, color=SOURCE_COLORS)
+    ax2.set_title(SOURCE_TITLE, fontsize=16, fontweight="bold", pad=20)
+    ax2.set_xlabel("Finalization Date", fontsize=12)
+    ax2.set_ylabel("Points", fontsize=12)
+    ax2.legend(loc="upper left", bbox_to_anchor=(1, 1))
+    thin_ticks(ax2, np.arange(len(source_df)), source_df.index)
+
+    # 3. Regional Influence Trend (% Share of Network per Region)
+    ax3 = plt.subplot(3, 1, 3)
+    for rid, region_share in share_lines.items():
+        sns.lineplot(
+            x=region_share.index,
+            y=region_share.to_numpy(),
+            marker="o",
+            color=REGION_COLORS.get(rid, OTHER_REGION_COLOR),
+            label=REGION_LABELS.get(rid, f"R{rid}"),
+            linewidth=3,
+            markersize=8,
+            ax=ax3,
+        )
+    ax3.set_title(SHARE_TITLE, fontsize=16, fontweight="bold", pad=20)
+    ax3.set_xlabel("Finalization Date", fontsize=12)
+    ax3.set_ylabel("Network Share (%)", fontsize=12)
+    ax3.set_ylim(0, share_max * 1.3 or 1.0)  # no known share: keep a valid range
+    ax3.legend(title="Regions", loc="upper left", bbox_to_anchor=(1, 1))
+
+    plt.suptitle(title, fontsize=22, fontweight="bold", y=0.98)
+    fig.text(0.5, 0.02, _footer(notes), ha="center", fontsize=10, color="gray", style="italic")
+    return fig
+
+
+def render_points(
+    data: FootprintData,
+    outputs: list[tuple[str, int]],
+    show: bool,
+    fast: bool,
+    aggregates: WeeklyAggregateStore | None,
+    rebuild: bool,
+    max_points: int,
+    max_bars: int,
+) -> str:
+    # Reduce the weeks to one row per protocol week (dates are computed per week, not per row)
+    with stage("dataframe"):
+        if aggregates is None or not data.wallet_address:
+            weekly = WeeklyAggregates.from_weeks(data.weeks)
+        else:
+            if rebuild:
+                aggregates.rebuild(data.wallet_address)
+            weekly, new_weeks = aggregates.update(data.wallet_address, data.weeks)
+            count("weeks_aggregated", new_weeks)
+        dates = pd.DatetimeIndex([week_to_date(int(week)) for week in weekly.weeks])
+        pivot_df = pd.DataFrame(weekly.total_points, index=dates, columns=weekly.regions)
+        source_df = pd.DataFrame(
+            weekly.sources,
+            index=dates,
+            columns=[SOURCE_LABELS[column] for column in SOURCE_COLUMNS],
+        )
+        share_df = pd.DataFrame(weekly.share_percent, index=dates, columns=weekly.regions)
+    count("weeks_rendered", len(data.weeks))
+
+    # Bound what gets drawn however long the history is: monthly bars, LTTB share lines
+    with stage("downsample"):
+        pivot_df, bar_note = monthly_bars(pivot_df, max_bars)
+        source_df, _ = monthly_bars(source_df, max_bars)
+        share_lines, line_note = {}, None
+        for rid in share_df.columns:
+            region_share = share_df[rid].dropna()
+            keep, note = downsample_line(
+                region_share.index.to_numpy(), region_share.to_numpy(), max_points
+            )
+            share_lines[rid] = region_share.iloc[keep]
+            line_note = line_note or note
+    period = "Month" if bar_note else "Week"
+    notes = [note for note in (bar_note, line_note) if note]
+    known_shares = weekly.share_percent[~np.isnan(weekly.share_percent)]
+    share_max = float(known_shares.max()) if known_shares.size else 0.0
+
+    # Legend patches for reuse
+    legend_patches = [
+        mpatches.Patch(color=REGION_COLORS[rid], label=label)
+        for rid, label in REGION_LABELS.items()
+        if rid in weekly.regions
+    ]
+    region_names = ", ".join(REGION_LABELS[r] for r in weekly.regions if r in REGION_LABELS)
+    title = (
+        f"Power & Influence Analysis: {short_wallet(data.wallet_address)}\n"
+        f"Max Share: {share_max:.2f}% | Regions: {region_names}"
+    )
+
+    render = _render_fast if fast else _render_seaborn
+    fig = render(pivot_df, source_df, share_lines, share_max, period, title, notes, legend_patches)
+    with stage("savefig"):
+        save_figure(fig, outputs, tight=not fast)
+    print(f"✅ Points analysis saved to {', '.join(path for path, _ in outputs)}")
+    if show:
+        with stage("show"):
+            plt.show()
+    elif not fast:
+        plt.close(fig)  # the fast template is reused, never closed
+    return outputs[0][0]
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""Memory-mappable hourly irradiance cube with a JSON metadata sidecar.
+
+The cube is a ``.npy`` file of shape (sites, 366, 24) float32 indexed by
+0-based day of year and local solar hour; missing readings (and day 366 in
+common years) are NaN.  ``<name>.json`` next to it records the year and
+coordinates of every site row plus units, so downstream tools can
+``np.load(path, mmap_mode="r")`` and slice without parsing text.
+
+The monthly text files the calculator used to write unconditionally are one
+renderer over this store (``write_text_dump``); run this module directly to
+render a site from an existing cube::
+
+    python scripts/hourly_store.py cube.npy --site 0 --out nasa_debug_output
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from solar_engine import MONTH_NAMES, is_leap_year
+
+DAYS = 366
+HOURS = 24
+FORMAT_VERSION = 1
+
+
+def sidecar_path(path: Path) -> Path:
+    return path.with_suffix(".json")
+
+
+@dataclass
+class HourlyCubeWriter:
+    """Create a cube on disk and fill it one site row at a time."""
+
+    path: Path
+    n_sites: int
+    parameter: str
+    units: str = "Wh/m^2"
+
+    def __post_init__(self) -> None:
+        self.path = Path(self.path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._cube = np.lib.format.open_memmap(
+            self.path, mode="w+", dtype=np.float32, shape=(self.n_sites, DAYS, HOURS)
+        )
+        self._cube[:] = np.nan
+        self._sites: list[dict[str, Any] | None] = [None] * self.n_sites
+
+    def write(self, index: int, site: dict[str, Any], day_hours: np.ndarray) -> None:
+        """Store one site's (366, 24) grid; ``site`` needs at least a ``year``."""
+        self._cube[index] = day_hours
+        self._sites[index] = site
+
+    def close(self) -> None:
+        self._cube.flush()
+        del self._cube
+        metadata = {
+            "version": FORMAT_VERSION,
+            "shape": [self.n_sites, DAYS, HOURS],
+            "dtype": "float32",
+            "axes": ["site", "day_of_year", "hour_lst"],
+            "missing": "NaN",
+            "parameter": self.parameter,
+            "units": self.units,
+            "sites": self._sites,
+        }
+        sidecar_path(self.path).write_text(json.dumps(metadata, indent=2), encoding="utf-8")
+
+    def __enter__(self) -> "HourlyCubeWriter":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+def open_cube(path: str | Path) -> tuple[np.ndarray, dict[str, Any]]:
+    """Memory-map a cube read-only and return it with its metadata."""
+    path = Path(path)
+    cube = np.load(path, mmap_mode="r")
+    metadata = json.loads(sidecar_path(path).read_text(encoding="utf-8"))
+    return cube, metadata
+
+
+def write_text_dump(day_hours: np.ndarray, year: int, output_dir: str | Path) -> None:
+    """Render one site's (366, 24) grid as the legacy per-month text files.
+
+    Days without any reading are skipped and missing hours print as 0.00.
+    """
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+    print(f"Writing debug files to folder: {output_path}/")
+
+    present = ~np.isnan(day_hours).all(axis=1)
+    filled = np.nan_to_num(day_hours, nan=0.0)
+    month_starts = np.cumsum(
+        [0] + [_days_in_month(year, month) for month in range(1, 13)]
+    )
+
+    for month in range(1, 13):
+        start, end = int(month_starts[month - 1]), int(month_starts[month])
+        days = np.flatnonzero(present[start:end]) + 1
+        if days.size == 0:
+            continue
+
+        month_file = output_path / f"{MONTH_NAMES[month]}.txt"
+        with month_file.open("w", encoding="utf-8") as handle:
+            handle.write(
+                f"Daily Solar Irradiance Profile for {MONTH_NAMES[month]} (Hour 00-23)\n"
+            )
+            handle.write(
+                "Day | 00 01 02 03 04 05 06 07 08 09 10 11 12 13 14 15 16 17 18 19 20 21 22 23\n"
+            )
+            handle.write("-" * 100 + "\n")
+            for day in days.tolist():
+                hours = " ".join(f"{value:4.2f}" for value in filled[start + day - 1].tolist())
+                handle.write(f"{day:02d}  | {hours}\n")
+
+    print("Debug files generated.\n")
+
+
+def _days_in_month(year: int, month: int) -> int:
+    if month == 2:
+        return 29 if is_leap_year(year) else 28
+    return 30 if month in {4, 6, 9, 11} else 31
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Render one site of an hourly irradiance cube as monthly text files."
+    )
+    parser.add_argument("cube", type=Path, help="Path to the .npy cube")
+    parser.add_argument("--site", type=int, default=0, help="Site row to render (default: 0)")
+    parser.add_argument(
+        "--out", default="nasa_debug_output", help="Output directory (default: nasa_debug_output)"
+    )
+    args = parser.parse_args()
+
+    try:
+        cube, metadata = open_cube(args.cube)
+    except (OSError, ValueError) as exc:
+        parser.error(f"cannot open {args.cube}: {exc}")
+    if not 0 <= args.site < cube.shape[0]:
+        parser.error(f"--site must be between 0 and {cube.shape[0] - 1}.")
+    site = metadata["sites"][args.site]
+    if site is None:
+        parser.error(f"site {args.site} was never written.")
+
+    write_text_dump(np.asarray(cube[args.site]), int(site["year"]), args.out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""Named stage timers and counters behind the ``--profile`` flag.
+
+Code under measurement marks its stages and bumps counters through the
+module-level helpers, which do nothing until a profiler is activated::
+
+    with stage("nasa_fetch"):
+        response = http.get(...)
+    count("bytes_downloaded", len(response.content))
+
+``power.py`` and the visualizers activate a :class:`Profiler` when run with
+``--profile report.json`` and write a JSON report with per-stage wall time
+and call counts plus every counter.  ``--profile-capture STAGE`` additionally
+runs cProfile (dumped to ``<report>.<stage>.prof``) and tracemalloc (peak and
+top allocation sites, in the report) around that stage.  Stage times are
+inclusive, so nested stages overlap their parents; captured stages should
+not nest inside each other.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import cProfile
+import json
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+TOP_ALLOCATIONS = 10
+
+
+@dataclass
+class StageStats:
+    calls: int = 0
+    seconds: float = 0.0
+
+
+@dataclass
+class Capture:
+    profile: cProfile.Profile = field(default_factory=cProfile.Profile)
+    peak_bytes: int = 0
+    snapshot: tracemalloc.Snapshot | None = None
+
+
+class Profiler:
+    def __init__(self, command: str = "", capture: Iterable[str] = (), enabled: bool = True) -> None:
+        self.command = command
+        self.enabled = enabled
+        self.stages: dict[str, StageStats] = {}
+        self.counters: dict[str, int | float] = {}
+        self.captures = {name: Capture() for name in capture}
+        self._started = time.perf_counter()
+        self._created = datetime.now(timezone.utc)
+
+    @contextlib.contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        if not self.enabled:
+            yield
+            return
+        capture = self.captures.get(name)
+        started_tracing = False
+        if capture is not None:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started_tracing = True
+            tracemalloc.reset_peak()
+            capture.profile.enable()
+
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            stats = self.stages.setdefault(name, StageStats())
+            stats.calls += 1
+            stats.seconds += elapsed
+            if capture is not None:
+                capture.profile.disable()
+                capture.peak_bytes = max(capture.peak_bytes, tracemalloc.get_traced_memory()[1])
+                capture.snapshot = tracemalloc.take_snapshot()
+                if started_tracing:
+                    tracemalloc.stop()
+
+    def count(self, name: str, value: int | float = 1) -> None:
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def report(self) -> dict[str, Any]:
+        report: dict[str, Any] = {
+            "command": self.command,
+            "created": self._created.isoformat(timespec="seconds"),
+            "total_s": time.perf_counter() - self._started,
+            "stages": {
+                name: {"calls": stats.calls, "seconds": stats.seconds}
+                for name, stats in self.stages.items()
+            },
+            "counters": dict(self.counters),
+        }
+        captures = {}
+        for name, capture in self.captures.items():
+            if capture.snapshot is None:
+                continue  # stage never ran
+            top = capture.snapshot.statistics("lineno")[:TOP_ALLOCATIONS]
+            captures[name] = {
+                "tracemalloc_peak_bytes": capture.peak_bytes,
+                "top_allocations": [
+                    {
+                        "location": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                        "size_bytes": stat.size,
+                        "count": stat.count,
+                    }
+                    for stat in top
+                ],
+            }
+        if captures:
+            report["captures"] = captures
+        return report
+
+    def write(self, path: Path) -> None:
+        report = self.report()
+        for name, capture in self.captures.items():
+            if name in report.get("captures", {}):
+                profile_path = path.with_name(f"{path.stem}.{name}.prof")
+                capture.profile.dump_stats(profile_path)
+                report["captures"][name]["cprofile"] = str(profile_path)
+        path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+
+_active = Profiler(enabled=False)
+
+
+def activate(profiler: Profiler) -> Profiler:
+    global _active
+    _active = profiler
+    return profiler
+
+
+def active() -> Profiler:
+    return _active
+
+
+def stage(name: str) -> contextlib.AbstractContextManager[None]:
+    return _active.stage(name)
+
+
+def count(name: str, value: int | float = 1) -> None:
+    _active.count(name, value)
+
+
+def add_profile_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--profile",
+        type=Path,
+        default=None,
+        metavar="REPORT.json",
+        help="Write per-stage timings and counters to this JSON file",
+    )
+    parser.add_argument(
+        "--profile-capture",
+        action="append",
+        default=[],
+        metavar="STAGE",
+        help="Also run cProfile and tracemalloc around this stage (repeatable)",
+    )
+
+
+def start_profiling(args: argparse.Namespace, command: str) -> Profiler | None:
+    if args.profile is None:
+        if args.profile_capture:
+            print("--profile-capture requires --profile.", file=sys.stderr)
+            raise SystemExit(2)
+        return None
+    return activate(Profiler(command, args.profile_capture))
+
+
+def finish_profiling(profiler: Profiler | None, path: Path | None) -> None:
+    if profiler is None or path is None:
+        return
+    profiler.write(path)
+    print(f"Profile report written to {path}", file=sys.stderr)
@@ -0,0 +1,190 @@
+"""On-disk cache for parsed NASA POWER hourly irradiance series.
+
+Each entry is keyed by (latitude, longitude, year, parameter) and stored as a
+compressed ``.npz`` holding the ``YYYYMMDDHH`` timestamps and the raw values
+(fill values such as -999 are kept so callers can still inspect gaps).  The
+directory is bounded by total size; the least recently used entries (by file
+mtime, bumped on every hit) are evicted first.  A single instance may be
+shared between threads.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+
+DEFAULT_CACHE_DIR = Path(
+    os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")
+) / "glow-power" / "irradiance"
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+COORD_DECIMALS = 4
+_FILENAME = re.compile(r"^(?P<parameter>.+)_(?P<year>\d{4})_(?P<lat>[+-][\d.]+)_(?P<lon>[+-][\d.]+)\.npz$")
+
+
+class HourlySeries(NamedTuple):
+    timestamps: np.ndarray  # int64 YYYYMMDDHH, -1 where the key was unparseable
+    values: np.ndarray  # float64, fill values preserved
+
+
+class CacheKey(NamedTuple):
+    latitude: float
+    longitude: float
+    year: int
+    parameter: str
+
+    @classmethod
+    def build(
+        cls, latitude: float, longitude: float, year: int, parameter: str
+    ) -> "CacheKey":
+        return cls(
+            round(float(latitude), COORD_DECIMALS),
+            round(float(longitude), COORD_DECIMALS),
+            int(year),
+            parameter,
+        )
+
+    def filename(self) -> str:
+        return (
+            f"{self.parameter}_{self.year}_"
+            f"{self.latitude:+.{COORD_DECIMALS}f}_{self.longitude:+.{COORD_DECIMALS}f}.npz"
+        )
+
+    @classmethod
+    def from_filename(cls, name: str) -> "CacheKey | None":
+        """Inverse of ``filename``; None for files the cache did not name."""
+        match = _FILENAME.match(name)
+        if match is None:
+            return None
+        return cls.build(
+            float(match["lat"]), float(match["lon"]), int(match["year"]), match["parameter"]
+        )
+
+
+class CacheMissError(LookupError):
+    """Raised when an entry is required (offline mode) but not cached."""
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    evictions: int = 0
+
+    def summary(self) -> str:
+        lookups = self.hits + self.misses
+        rate = (self.hits / lookups * 100) if lookups else 0.0
+        return (
+            f"Irradiance cache: {self.hits} hit(s), {self.misses} miss(es) "
+            f"({rate:.0f}% hit rate), {self.writes} write(s), "
+            f"{self.evictions} eviction(s)"
+        )
+
+
+@dataclass
+class IrradianceCache:
+    root: Path = DEFAULT_CACHE_DIR
+    max_bytes: int = DEFAULT_MAX_BYTES
+    stats: CacheStats = field(default_factory=CacheStats)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+    # Running size estimate so puts only rescan the directory when over budget.
+    _total_bytes: int | None = field(default=None, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.root = Path(self.root)
+
+    def path_for(self, key: CacheKey) -> Path:
+        return self.root / key.filename()
+
+    def get(self, key: CacheKey) -> HourlySeries | None:
+        path = self.path_for(key)
+        try:
+            with np.load(path) as archive:
+                series = HourlySeries(
+                    archive["timestamps"].astype(np.int64),
+                    archive["values"].astype(np.float64),
+                )
+        except FileNotFoundError:
+            self._count("misses")
+            return None
+        except (OSError, KeyError, ValueError):
+            # Truncated or foreign file: drop it and treat as a miss.
+            path.unlink(missing_ok=True)
+            self._count("misses")
+            return None
+
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass  # evicted concurrently; the data we read is still valid
+        self._count("hits")
+        return series
+
+    def require(self, key: CacheKey) -> HourlySeries:
+        series = self.get(key)
+        if series is None:
+            raise CacheMissError(
+                f"No cached {key.parameter} data for lat={key.latitude}, "
+                f"lon={key.longitude}, year={key.year} in {self.root}"
+            )
+        return series
+
+    def put(self, key: CacheKey, series: HourlySeries) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self.path_for(key)
+        tmp_path = path.with_name(f"{path.name}.{threading.get_ident()}.partial")
+        with tmp_path.open("wb") as handle:
+            np.savez_compressed(
+                handle,
+                timestamps=np.asarray(series.timestamps, dtype=np.int64),
+                values=np.asarray(series.values, dtype=np.float64),
+            )
+        size = tmp_path.stat().st_size
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            self.stats.writes += 1
+            if self._total_bytes is None:
+                self._total_bytes = sum(stat.st_size for _, stat in self.entries())
+            else:
+                self._total_bytes += size
+            if self._total_bytes > self.max_bytes:
+                self._total_bytes = self._evict(keep=path)
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self.stats, counter, getattr(self.stats, counter) + 1)
+
+    def entries(self) -> list[tuple[Path, os.stat_result]]:
+        if not self.root.is_dir():
+            return []
+        entries = []
+        for path in self.root.glob("*.npz"):
+            try:
+                entries.append((path, path.stat()))
+            except FileNotFoundError:
+                continue
+        return entries
+
+    def evict(self, keep: Path | None = None) -> None:
+        with self._lock:
+            self._total_bytes = self._evict(keep)
+
+    def _evict(self, keep: Path | None) -> int:
+        entries = sorted(self.entries(), key=lambda entry: entry[1].st_mtime)
+        total = sum(stat.st_size for _, stat in entries)
+        for path, stat in entries:
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            path.unlink(missing_ok=True)
+            total -= stat.st_size
+            self.stats.evictions += 1
+        return total
@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""Offline bulk ingest of downloaded NASA POWER hourly responses.
+
+Build and CI machines have no network, so irradiance is downloaded elsewhere
+(any POWER hourly point request for ALLSKY_SFC_SW_DWN, one site-year per
+file) and ingested here into the irradiance cache.  ``power.py`` and
+``power_batch.py`` read that cache directly; with ``--offline`` they never
+touch the network.
+
+Both response formats are accepted:
+
+    *.json   the GeoJSON response; the site is ``geometry.coordinates``
+    *.csv    the CSV download; the site comes from the ``Location:`` header
+             line and rows are ``YEAR,MO,DY,HR,ALLSKY_SFC_SW_DWN``
+
+Entries are keyed by the coordinates in the file, which POWER echoes from
+the request, so quote the same coordinates you downloaded.  The file's fill
+value is mapped to -999.  A file is rejected when its hours span more than
+one year, when fewer than ``--min-coverage`` of the year's hours hold a valid
+reading, or when its longest run of -999s (or absent hours) exceeds
+``--max-gap-hours``.
+
+    python scripts/irradiance_ingest.py downloads/ --report ingest.jsonl
+    python scripts/power.py 40.5 -111.9 120000 --offline
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Iterator
+
+import numpy as np
+
+from instrumentation import add_profile_arguments, count, finish_profiling, stage, start_profiling
+from irradiance_cache import CacheKey, HourlySeries, IrradianceCache
+from multi_year import MIN_COVERAGE
+from power import NASA_PARAMETER, add_cache_arguments, parse_hourly_series
+from solar_engine import FILL_VALUE, SolarDataError, day_of_year, decode_timestamps, is_leap_year
+
+DEFAULT_MAX_GAP_HOURS = 72
+SUFFIXES = (".json", ".csv")
+
+_LOCATION = re.compile(r"Latitude\s+(-?[\d.]+)\s+Longitude\s+(-?[\d.]+)", re.IGNORECASE)
+_FILL = re.compile(r"missing source data.*?:\s*(-?[\d.]+)", re.IGNORECASE)
+
+
+class IngestError(ValueError):
+    """Raised when a file is not a usable POWER hourly response."""
+
+
+@dataclass
+class ParsedFile:
+    latitude: float
+    longitude: float
+    series: HourlySeries
+
+
+@dataclass
+class IngestReport:
+    path: str
+    status: str  # "ok", "rejected" (failed validation) or "error" (unreadable)
+    message: str = ""
+    latitude: float | None = None
+    longitude: float | None = None
+    year: int | None = None
+    valid_hours: int = 0
+    coverage: float = 0.0
+    longest_gap_hours: int = 0
+
+
+def parse_power_json(path: Path) -> ParsedFile:
+    try:
+        payload = json.loads(path.read_bytes())
+    except ValueError as exc:
+        raise IngestError(f"invalid JSON: {exc}") from exc
+    if not isinstance(payload, dict):
+        raise IngestError("not a POWER response")
+    try:
+        longitude, latitude = (float(value) for value in payload["geometry"]["coordinates"][:2])
+    except (KeyError, TypeError, ValueError) as exc:
+        raise IngestError("no geometry.coordinates in the response") from exc
+    # parse_hourly_series trusts the envelope shape; a hand-edited file may not
+    properties = payload.get("properties", {})
+    if not isinstance(properties, dict) or not isinstance(properties.get("parameter", {}), dict):
+        raise IngestError("properties.parameter is not an object")
+    header = payload.get("header", {})
+    if not isinstance(header, dict):
+        raise IngestError("header is not an object")
+    try:
+        fill = None if header.get("fill_value") is None else float(header["fill_value"])
+    except (TypeError, ValueError) as exc:
+        raise IngestError(f"non-numeric header.fill_value {header['fill_value']!r}") from exc
+    try:
+        series = parse_hourly_series(payload)
+    except SolarDataError as exc:
+        raise IngestError(str(exc)) from exc
+
+    if fill is not None and fill != FILL_VALUE:
+        series.values[series.values == fill] = FILL_VALUE
+    return ParsedFile(latitude, longitude, series)
+
+
+def parse_power_csv(path: Path) -> ParsedFile:
+    text = path.read_text(encoding="utf-8-sig")
+    header, marker, body = text.partition("-END HEADER-")
+    if not marker:
+        header, body = "", text
+    location = _LOCATION.search(header)
+    if location is None:
+        raise IngestError("no 'Location: Latitude .. Longitude ..' header line")
+
+    lines = body.strip().splitlines()
+    if not lines:
+        raise IngestError("no data rows")
+    columns = [column.strip().upper() for column in lines[0].split(",")]
+    try:
+        indices = [columns.index(name) for name in ("YEAR", "MO", "DY", "HR", NASA_PARAMETER)]
+    except ValueError as exc:
+        raise IngestError(f"expected YEAR,MO,DY,HR,{NASA_PARAMETER} columns, got {lines[0]!r}") from exc
+    try:
+        rows = np.loadtxt(lines[1:], delimiter=",", usecols=indices, ndmin=2)
+    except ValueError as exc:
+        raise IngestError(f"unparseable data row: {exc}") from exc
+
+    year, month, day, hour = (rows[:, index].astype(np.int64) for index in range(4))
+    values = rows[:, 4].copy()
+    fill = _FILL.search(header)
+    if fill is not None and float(fill.group(1)) != FILL_VALUE:
+        values[values == float(fill.group(1))] = FILL_VALUE
+    timestamps = year * 1_000_000 + month * 10_000 + day * 100 + hour
+    return ParsedFile(
+        float(location.group(1)), float(location.group(2)), HourlySeries(timestamps, values)
+    )
+
+
+def longest_run(mask: np.ndarray) -> int:
+    """Length of the longest run of True in a 1-D mask."""
+    if not mask.any():
+        return 0
+    edges = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+    return int((np.flatnonzero(edges == -1) - np.flatnonzero(edges == 1)).max())
+
+
+def validate_series(
+    series: HourlySeries, min_coverage: float, max_gap_hours: int
+) -> tuple[IngestReport, str | None]:
+    """Coverage/gap report for the series; the message is set when it must be rejected."""
+    decoded = decode_timestamps(series.timestamps)
+    years = np.unique(decoded.year[decoded.valid])
+    report = IngestReport(path="", status="ok")
+    if years.size != 1:
+        return report, f"expected one calendar year, got {years.tolist() or 'no valid hours'}"
+    report.year = int(years[0])
+
+    hour_of_year = (day_of_year(decoded) * 24 + decoded.hour)[decoded.valid]
+    if np.unique(hour_of_year).size != hour_of_year.size:
+        return report, "duplicate hours"
+    # Hours absent from the file count as missing just like -999 rows.
+    usable = np.zeros(24 * (366 if is_leap_year(report.year) else 365), dtype=bool)
+    usable[hour_of_year] = series.values[decoded.valid] != FILL_VALUE
+
+    report.valid_hours = int(usable.sum())
+    report.coverage = report.valid_hours / usable.size
+    report.longest_gap_hours = longest_run(~usable)
+    if report.coverage < min_coverage:
+        return report, f"only {report.coverage:.1%} of hours have a valid reading"
+    if report.longest_gap_hours > max_gap_hours:
+        return report, f"{report.longest_gap_hours} consecutive missing hours"
+    return report, None
+
+
+def ingest_file(
+    path: Path, min_coverage: float, max_gap_hours: int
+) -> tuple[IngestReport, CacheKey | None, HourlySeries | None]:
+    """Parse and validate one file (runs in a worker); returns what to store, if anything."""
+    try:
+        parser = parse_power_csv if path.suffix.lower() == ".csv" else parse_power_json
+        parsed = parser(path)
+    except (OSError, UnicodeDecodeError, IngestError) as exc:
+        return IngestReport(str(path), "error", f"{type(exc).__name__}: {exc}"), None, None
+
+    report, problem = validate_series(parsed.series, min_coverage, max_gap_hours)
+    report.path = str(path)
+    report.latitude = parsed.latitude
+    report.longitude = parsed.longitude
+    if problem is not None:
+        report.status, report.message = "rejected", problem
+        return report, None, None
+    key = CacheKey.build(parsed.latitude, parsed.longitude, report.year, NASA_PARAMETER)
+    return report, key, parsed.series
+
+
+def find_files(sources: list[Path]) -> Iterator[Path]:
+    for source in sources:
+        if source.is_dir():
+            yield from sorted(
+                path for path in source.rglob("*") if path.suffix.lower() in SUFFIXES
+            )
+        else:
+            yield source
+
+
+def _ingest_one(job: tuple[Path, float, int]) -> tuple[IngestReport, CacheKey | None, HourlySeries | None]:
+    return ingest_file(*job)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Ingest downloaded NASA POWER hourly responses (JSON or CSV) into the "
+            "irradiance cache so power.py can run with --offline."
+        )
+    )
+    parser.add_argument(
+        "sources", nargs="+", type=Path, help="Response files or directories (searched recursively)"
+    )
+    parser.add_argument(
+        "--min-coverage",
+        type=float,
+        default=MIN_COVERAGE,
+        help=f"Reject files with fewer valid hours than this fraction (default: {MIN_COVERAGE})",
+    )
+    parser.add_argument(
+        "--max-gap-hours",
+        type=int,
+        default=DEFAULT_MAX_GAP_HOURS,
+        help=f"Reject files with a longer run of -999s (default: {DEFAULT_MAX_GAP_HOURS})",
+    )
+    parser.add_argument(
+        "--report",
+        type=Path,
+        default=None,
+        metavar="PATH.jsonl",
+        help="Write one validation record per file to this JSONL file",
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Parse and validate only; write nothing"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Parsing processes (default: CPU count)",
+    )
+    add_cache_arguments(parser)
+    add_profile_arguments(parser)
+
+    args = parser.parse_args()
+    missing = [str(source) for source in args.sources if not source.exists()]
+    if missing:
+        parser.error(f"{', '.join(missing)} not found.")
+    if not 0 <= args.min_coverage <= 1:
+        parser.error("--min-coverage must be within [0, 1].")
+    if args.max_gap_hours < 0:
+        parser.error("--max-gap-hours cannot be negative.")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1.")
+    if args.no_cache or args.offline:
+        parser.error("--no-cache/--offline do not apply to ingest.")
+    if args.cache_max_mb <= 0:
+        parser.error("--cache-max-mb must be greater than 0.")
+    return args
+
+
+def main() -> None:
+    args = parse_args()
+    files = list(find_files(args.sources))
+    if not files:
+        print(f"No {'/'.join(SUFFIXES)} files in {', '.join(map(str, args.sources))}", file=sys.stderr)
+        raise SystemExit(1)
+
+    profiler = start_profiling(args, "irradiance_ingest.py")
+    cache = IrradianceCache(Path(args.cache_dir), int(args.cache_max_mb * 1024 * 1024))
+    target = "(dry run)" if args.dry_run else f"-> {cache.root}"
+    print(f"Ingesting {len(files)} file(s) {target}")
+
+    started = time.perf_counter()
+    statuses = {"ok": 0, "rejected": 0, "error": 0}
+    stored: dict[CacheKey, str] = {}
+    jobs = [(path, args.min_coverage, args.max_gap_hours) for path in files]
+    report_file = args.report.open("w", encoding="utf-8") if args.report else None
+    try:
+        with contextlib.ExitStack() as stack, stage("ingest"):
+            if args.workers > 1:
+                pool = stack.enter_context(ProcessPoolExecutor(args.workers))
+                results = pool.map(_ingest_one, jobs, chunksize=16)
+            else:
+                results = map(_ingest_one, jobs)
+            for report, key, series in results:
+                if key is not None and key in stored:
+                    report.message = f"same site-year as {stored[key]}; replaces it"
+                if key is not None and series is not None and not args.dry_run:
+                    cache.put(key, series)
+                if key is not None:
+                    stored[key] = report.path
+                statuses[report.status] += 1
+                count(f"files_{report.status}")
+                if report.status != "ok":
+                    print(f"  {report.status}: {report.path}: {report.message}", file=sys.stderr)
+                if report_file is not None:
+                    report_file.write(json.dumps(asdict(report)) + "\n")
+    finally:
+        if report_file is not None:
+            report_file.close()
+
+    elapsed = time.perf_counter() - started
+    print(
+        f"Done: {len(files)} file(s) in {elapsed:.1f}s; {statuses['ok']} stored "
+        f"({len(stored)} site-years), {statuses['rejected']} rejected, {statuses['error']} unreadable"
+    )
+    if not args.dry_run:
+        print(cache.stats.summary())
+        if cache.stats.evictions:
+            print(
+                f"Warning: the store outgrew --cache-max-mb and evicted {cache.stats.evictions} "
+                "entries; raise it and ingest again.",
+                file=sys.stderr,
+            )
+    finish_profiling(profiler, args.profile)
+    if statuses["rejected"] or statuses["error"]:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""Regional irradiance tiles on the NASA POWER grid.
+
+NASA POWER hourly data comes from MERRA-2 cells of 0.5 deg latitude by
+0.625 deg longitude, so every site inside a cell gets the same series.  A
+tile holds every cell covering a bounding box for one year:
+
+    <name>_<year>.values.npy      float64 (cells, hours), -999 where missing
+    <name>_<year>.timestamps.npy  int64 (hours,) YYYYMMDDHH shared by all cells
+    <name>_<year>.json            grid origin/steps, cell index ranges, year
+
+Cells are stored row-major over (lat index, lon index), so snapping a site to
+its cell and finding its row is pure arithmetic on the regular grid; both
+arrays are memory-mapped, making a lookup sub-millisecond with no network.
+
+    python scripts/irradiance_tiles.py prefetch --bbox 37 -114 42 -109 --year 2023 --name utah
+    python scripts/irradiance_tiles.py lookup 40.5 -111.9 --year 2023
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from irradiance_cache import DEFAULT_CACHE_DIR, HourlySeries
+from solar_engine import FILL_VALUE
+
+LAT_STEP = 0.5
+LON_STEP = 0.625
+LAT_ORIGIN = -90.0
+LON_ORIGIN = -180.0
+DEFAULT_TILE_DIR = DEFAULT_CACHE_DIR.parent / "tiles"
+
+
+def cell_index(latitude: float, longitude: float) -> tuple[int, int]:
+    """Grid indices of the cell whose centre is nearest to the point."""
+    i = int(math.floor((latitude - LAT_ORIGIN) / LAT_STEP + 0.5))
+    j = int(math.floor((longitude - LON_ORIGIN) / LON_STEP + 0.5))
+    return i, j
+
+
+def cell_center(i: int, j: int) -> tuple[float, float]:
+    return LAT_ORIGIN + i * LAT_STEP, LON_ORIGIN + j * LON_STEP
+
+
+@dataclass
+class Tile:
+    path: Path  # path of the .json sidecar
+    year: int
+    parameter: str
+    i_range: tuple[int, int]  # inclusive
+    j_range: tuple[int, int]  # inclusive
+    _arrays: tuple[np.ndarray, np.ndarray] | None = None
+
+    @classmethod
+    def open(cls, sidecar: Path) -> "Tile":
+        metadata = json.loads(sidecar.read_text(encoding="utf-8"))
+        return cls(
+            sidecar,
+            int(metadata["year"]),
+            metadata["parameter"],
+            tuple(metadata["i_range"]),
+            tuple(metadata["j_range"]),
+        )
+
+    @property
+    def n_lon(self) -> int:
+        return self.j_range[1] - self.j_range[0] + 1
+
+    def contains(self, i: int, j: int) -> bool:
+        return self.i_range[0] <= i <= self.i_range[1] and self.j_range[0] <= j <= self.j_range[1]
+
+    def row(self, i: int, j: int) -> int:
+        return (i - self.i_range[0]) * self.n_lon + (j - self.j_range[0])
+
+    def series(self, i: int, j: int) -> HourlySeries | None:
+        if self._arrays is None:
+            # Assigned in one step so concurrent lookups never see half a tile.
+            stem = str(self.path.with_suffix(""))
+            self._arrays = (
+                np.load(f"{stem}.timestamps.npy", mmap_mode="r"),
+                np.load(f"{stem}.values.npy", mmap_mode="r"),
+            )
+        timestamps, values = self._arrays
+        row = values[self.row(i, j)]
+        if (row == FILL_VALUE).all():
+            return None  # cell failed to download during prefetch
+        return HourlySeries(timestamps, row)
+
+
+class TileStore:
+    """Directory of tiles with a per-(year, parameter) spatial index."""
+
+    def __init__(self, root: Path = DEFAULT_TILE_DIR) -> None:
+        self.root = Path(root)
+        self._tiles: dict[tuple[int, str], list[Tile]] | None = None
+        self._lock = threading.Lock()
+
+    def _index(self) -> dict[tuple[int, str], list[Tile]]:
+        with self._lock:
+            if self._tiles is None:
+                tiles: dict[tuple[int, str], list[Tile]] = {}
+                for sidecar in sorted(self.root.glob("*.json")):
+                    try:
+                        tile = Tile.open(sidecar)
+                    except (OSError, ValueError, KeyError):
+                        continue
+                    tiles.setdefault((tile.year, tile.parameter), []).append(tile)
+                self._tiles = tiles
+            return self._tiles
+
+    def lookup(
+        self, latitude: float, longitude: float, year: int, parameter: str
+    ) -> HourlySeries | None:
+        """Series of the cell containing the site, or None if no tile covers it."""
+        i, j = cell_index(latitude, longitude)
+        for tile in self._index().get((year, parameter), []):
+            if tile.contains(i, j):
+                series = tile.series(i, j)
+                if series is not None:
+                    return series
+        return None
+
+
+async def _fetch_cells(
+    cells: list[tuple[int, int]], year: int, base_url: str, concurrency: int
+) -> list[HourlySeries | Exception]:
+    from nasa_client import AsyncNasaPowerClient, ClientConfig
+    from power import parse_hourly_series
+
+    config = ClientConfig(base_url=base_url, concurrency=concurrency)
+    async with AsyncNasaPowerClient(config) as client:
+
+        async def fetch(i: int, j: int) -> HourlySeries:
+            latitude, longitude = cell_center(i, j)
+            payload = await client.fetch_hourly(latitude, longitude, year)
+            return await asyncio.to_thread(parse_hourly_series, payload)
+
+        return await asyncio.gather(*(fetch(i, j) for i, j in cells), return_exceptions=True)
+
+
+def prefetch(
+    bbox: tuple[float, float, float, float],
+    year: int,
+    name: str,
+    root: Path,
+    base_url: str,
+    concurrency: int = 8,
+) -> Path:
+    """Download every cell covering ``bbox`` and write ``<root>/<name>_<year>.*``.
+
+    Cells that fail are left as fill values and listed under ``failed`` in the
+    sidecar; lookups treat them as uncovered.
+    """
+    from power import NASA_PARAMETER
+
+    lat_min, lon_min, lat_max, lon_max = bbox
+    i0, j0 = cell_index(lat_min, lon_min)
+    i1, j1 = cell_index(lat_max, lon_max)
+    cells = [(i, j) for i in range(i0, i1 + 1) for j in range(j0, j1 + 1)]
+    print(f"Prefetching {len(cells)} grid cells for {name} {year}...")
+
+    results = asyncio.run(_fetch_cells(cells, year, base_url, concurrency))
+    reference = next((result for result in results if isinstance(result, HourlySeries)), None)
+    if reference is None:
+        raise RuntimeError(f"every cell failed; first error: {results[0]}")
+
+    values = np.full((len(cells), reference.values.size), FILL_VALUE, dtype=np.float64)
+    failed: list[dict[str, Any]] = []
+    for row, ((i, j), result) in enumerate(zip(cells, results)):
+        if isinstance(result, Exception):
+            failed.append({"cell": [i, j], "error": str(result)})
+        elif not np.array_equal(result.timestamps, reference.timestamps):
+            failed.append({"cell": [i, j], "error": "timestamps differ from the rest of the tile"})
+        else:
+            values[row] = result.values
+
+    root.mkdir(parents=True, exist_ok=True)
+    stem = root / f"{name}_{year}"
+    np.save(f"{stem}.values.npy", values)
+    np.save(f"{stem}.timestamps.npy", np.asarray(reference.timestamps, dtype=np.int64))
+    sidecar = stem.with_suffix(".json")
+    sidecar.write_text(
+        json.dumps(
+            {
+                "name": name,
+                "year": year,
+                "parameter": NASA_PARAMETER,
+                "grid": {
+                    "lat_origin": LAT_ORIGIN,
+                    "lon_origin": LON_ORIGIN,
+                    "lat_step": LAT_STEP,
+                    "lon_step": LON_STEP,
+                },
+                "bbox": list(bbox),
+                "i_range": [i0, i1],
+                "j_range": [j0, j1],
+                "failed": failed,
+            },
+            indent=2,
+        ),
+        encoding="utf-8",
+    )
+    print(f"Tile written to {stem}.* ({len(cells) - len(failed)} cells ok, {len(failed)} failed)")
+    for failure in failed:
+        print(f"  cell {failure['cell']}: {failure['error']}", file=sys.stderr)
+    return sidecar
+
+
+def main() -> None:
+    from power import NASA_PARAMETER, NASA_POWER_HOURLY_URL
+
+    parser = argparse.ArgumentParser(description="Prefetch and query NASA POWER irradiance tiles.")
+    parser.add_argument(
+        "--tiles-dir",
+        type=Path,
+        default=DEFAULT_TILE_DIR,
+        help=f"Tile directory (default: {DEFAULT_TILE_DIR})",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    fetch = commands.add_parser("prefetch", help="Download every grid cell covering a bbox")
+    fetch.add_argument(
+        "--bbox",
+        type=float,
+        nargs=4,
+        required=True,
+        metavar=("LAT_MIN", "LON_MIN", "LAT_MAX", "LON_MAX"),
+    )
+    fetch.add_argument("--year", type=int, default=2023, help="Calendar year (default: 2023)")
+    fetch.add_argument("--name", required=True, help="Tile name, e.g. the zone slug")
+    fetch.add_argument("--concurrency", type=int, default=8, help="Parallel requests (default: 8)")
+    fetch.add_argument("--nasa-url", default=NASA_POWER_HOURLY_URL, help=argparse.SUPPRESS)
+
+    lookup = commands.add_parser("lookup", help="Show which cell a site snaps to")
+    lookup.add_argument("latitude", type=float)
+    lookup.add_argument("longitude", type=float)
+    lookup.add_argument("--year", type=int, default=2023, help="Calendar year (default: 2023)")
+
+    args = parser.parse_args()
+
+    if args.command == "prefetch":
+        lat_min, lon_min, lat_max, lon_max = args.bbox
+        if lat_min > lat_max or lon_min > lon_max:
+            parser.error("--bbox must be LAT_MIN LON_MIN LAT_MAX LON_MAX.")
+        try:
+            prefetch(
+                (lat_min, lon_min, lat_max, lon_max),
+                args.year,
+                args.name,
+                args.tiles_dir,
+                args.nasa_url,
+                args.concurrency,
+            )
+        except RuntimeError as exc:
+            print(f"Prefetch failed: {exc}", file=sys.stderr)
+            raise SystemExit(1)
+        return
+
+    started = time.perf_counter()
+    i, j = cell_index(args.latitude, args.longitude)
+    series = TileStore(args.tiles_dir).lookup(
+        args.latitude, args.longitude, args.year, NASA_PARAMETER
+    )
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    latitude, longitude = cell_center(i, j)
+    print(f"Cell ({i}, {j}) centred at {latitude:.3f}, {longitude:.3f}")
+    if series is None:
+        print(f"Not covered by any {args.year} tile in {args.tiles_dir}", file=sys.stderr)
+        raise SystemExit(1)
+    valid = series.values != FILL_VALUE
+    print(f"{int(valid.sum())} valid hours, lookup took {elapsed_ms:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""Multi-year irradiance sweeps with P50/P90 production and value statistics.
+
+Each year's hourly series is stacked into a (years, hours) matrix (padded
+with fill values so leap and short years line up) and analysed in one call
+to the engine.  ``annual_kwh`` is treated as the long-term average: every
+year is scaled by the same kWh-per-irradiance ratio, so sunnier years
+produce more and the spread between years is preserved.
+
+P50 is the median across years; P90 is the level exceeded in 90% of years
+(the 10th percentile), the usual convention for energy yield.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Sequence
+
+import numpy as np
+
+from irradiance_cache import HourlySeries
+from solar_engine import (
+    FILL_VALUE,
+    MONTH_NAMES,
+    MonthlyBuckets,
+    compute_monthly_buckets,
+    decode_timestamps,
+    is_leap_year,
+    monthly_value,
+)
+from tariffs import Tariff, value_series
+
+MIN_COVERAGE = 0.9
+STAT_NAMES = ("p50", "p90", "min", "max")
+
+
+def stack_years(
+    series_by_year: dict[int, HourlySeries],
+) -> tuple[list[int], np.ndarray, np.ndarray]:
+    """Pad per-year series into (years, max_hours) timestamp and value matrices."""
+    years = sorted(series_by_year)
+    width = max(series_by_year[year].values.size for year in years)
+    timestamps = np.full((len(years), width), -1, dtype=np.int64)
+    values = np.full((len(years), width), FILL_VALUE, dtype=np.float64)
+    for row, year in enumerate(years):
+        series = series_by_year[year]
+        timestamps[row, : series.timestamps.size] = series.timestamps
+        values[row, : series.values.size] = series.values
+    return years, timestamps, values
+
+
+def exceedance_stats(samples: np.ndarray, axis: int = 0) -> dict[str, np.ndarray]:
+    return {
+        "p50": np.percentile(samples, 50, axis=axis),
+        "p90": np.percentile(samples, 10, axis=axis),
+        "min": samples.min(axis=axis),
+        "max": samples.max(axis=axis),
+    }
+
+
+@dataclass
+class YearSweep:
+    years: list[int]
+    buckets: MonthlyBuckets  # (years, 12)
+    monthly_value: np.ndarray  # (years, 12) dollars
+    coverage: np.ndarray  # (years,) fraction of hours with a valid reading
+    tariff_values: dict[str, np.ndarray] = field(default_factory=dict)  # name -> (years,)
+
+    @property
+    def annual_kwh(self) -> np.ndarray:
+        return self.buckets.grand_total_kwh
+
+    @property
+    def annual_value(self) -> np.ndarray:
+        return self.monthly_value.sum(axis=-1)
+
+    @property
+    def monthly_share(self) -> np.ndarray:
+        return self.buckets.total_kwh / self.annual_kwh[:, np.newaxis] * 100
+
+    @property
+    def monthly_price(self) -> np.ndarray:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return self.monthly_value / self.buckets.total_kwh
+
+
+def run_sweep(
+    series_by_year: dict[int, HourlySeries],
+    annual_kwh: float,
+    tariffs: Sequence[Tariff] = (),
+) -> YearSweep:
+    years, timestamps, values = stack_years(series_by_year)
+    decoded = decode_timestamps(timestamps)
+
+    valid = values != FILL_VALUE
+    irradiance = np.where(valid, values, 0.0).sum(axis=-1)
+    # Same kWh-per-irradiance ratio for every year: annual_kwh is the long-term mean.
+    per_year_kwh = annual_kwh * irradiance / irradiance.mean()
+    buckets = compute_monthly_buckets(timestamps, values, per_year_kwh, decoded=decoded)
+
+    hours_in_year = np.where(is_leap_year(np.array(years)), 366 * 24, 365 * 24)
+    coverage = (valid & decoded.valid).sum(axis=-1) / hours_in_year
+
+    tariff_values: dict[str, np.ndarray] = {tariff.name: np.zeros(len(years)) for tariff in tariffs}
+    if tariffs:
+        for row, year in enumerate(years):
+            series = series_by_year[year]
+            for valuation in value_series(
+                series.timestamps, series.values, per_year_kwh[row], tariffs
+            ):
+                tariff_values[valuation.tariff.name][row] = float(valuation.total_value)
+
+    return YearSweep(years, buckets, monthly_value(buckets), coverage, tariff_values)
+
+
+def _stat_cells(stats: dict[str, np.ndarray], index: int | None, fmt: str) -> str:
+    cells = []
+    for name in STAT_NAMES:
+        value = stats[name] if index is None else stats[name][index]
+        cells.append(f"{float(value):>{fmt}}")
+    return " | ".join(cells)
+
+
+def print_sweep_report(sweep: YearSweep) -> None:
+    first, last = sweep.years[0], sweep.years[-1]
+    print(f"Multi-year sweep {first}-{last} ({len(sweep.years)} years)")
+    for year, coverage in zip(sweep.years, sweep.coverage.tolist()):
+        if coverage < MIN_COVERAGE:
+            print(f"  Warning: {year} has valid readings for only {coverage:.0%} of hours")
+    print()
+
+    kwh = exceedance_stats(sweep.buckets.total_kwh)
+    share = exceedance_stats(sweep.monthly_share)
+    header = (
+        f"{'Month':<12} | {'P50 kWh':>9} | {'P90 kWh':>9} | {'Min kWh':>9} | {'Max kWh':>9} | "
+        f"{'P50 %':>6} | {'P90 %':>6} | {'Min %':>6} | {'Max %':>6}"
+    )
+    print("-" * len(header))
+    print(header)
+    print("-" * len(header))
+    for month in range(1, 13):
+        print(
+            f"{MONTH_NAMES[month]:<12} | {_stat_cells(kwh, month - 1, '9.0f')} | "
+            f"{_stat_cells(share, month - 1, '6.2f')}"
+        )
+    print("=" * len(header))
+    print()
+
+    value = exceedance_stats(sweep.monthly_value)
+    price = exceedance_stats(sweep.monthly_price)
+    header = (
+        f"{'Month':<12} | {'P50 $':>10} | {'P90 $':>10} | {'Min $':>10} | {'Max $':>10} | "
+        f"{'P50 $/kWh':>9} | {'P90 $/kWh':>9} | {'Min $/kWh':>9} | {'Max $/kWh':>9}"
+    )
+    print("-" * len(header))
+    print(header)
+    print("-" * len(header))
+    for month in range(1, 13):
+        print(
+            f"{MONTH_NAMES[month]:<12} | {_stat_cells(value, month - 1, '10,.2f')} | "
+            f"{_stat_cells(price, month - 1, '9.4f')}"
+        )
+    print("=" * len(header))
+    print()
+
+    annual_rows = [
+        ("Annual kWh", exceedance_stats(sweep.annual_kwh), "12,.0f"),
+        ("Total value $", exceedance_stats(sweep.annual_value), "12,.2f"),
+        ("$/kWh", exceedance_stats(sweep.annual_value / sweep.annual_kwh), "12.4f"),
+    ]
+    for name, values in sweep.tariff_values.items():
+        annual_rows.append((f"{name} $", exceedance_stats(values), "12,.2f"))
+        annual_rows.append(
+            (f"{name} $/kWh", exceedance_stats(values / sweep.annual_kwh), "12.4f")
+        )
+
+    label_width = max(20, *(len(label) for label, _, _ in annual_rows))
+    header = f"{'Annual':<{label_width}} | " + " | ".join(
+        f"{name.upper():>12}" for name in STAT_NAMES
+    )
+    print(header)
+    print("-" * len(header))
+    for label, stats, fmt in annual_rows:
+        print(f"{label:<{label_width}} | {_stat_cells(stats, None, fmt)}")
+    print("-" * len(header))
@@ -0,0 +1,193 @@
+"""Asyncio client for the NASA POWER hourly point endpoint.
+
+All requests share one aiohttp connection pool.  Concurrency is capped by a
+semaphore, request starts can be rate limited, 429/5xx responses and
+connection errors are retried with exponential backoff and full jitter
+(honouring ``Retry-After``), and concurrent requests for the same
+(latitude, longitude, year, parameter) share a single in-flight download.
+
+``base_url`` is injectable so the client can be pointed at a local stub
+server.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+import aiohttp
+
+from irradiance_cache import CacheKey, HourlySeries, IrradianceCache
+from irradiance_tiles import TileStore
+from power import (
+    NASA_PARAMETER,
+    NASA_POWER_HOURLY_URL,
+    NasaFetchError,
+    build_request_params,
+    parse_hourly_series,
+)
+
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+
+@dataclass
+class ClientConfig:
+    base_url: str = NASA_POWER_HOURLY_URL
+    concurrency: int = 8
+    rate_per_second: float | None = None
+    max_retries: int = 5
+    backoff_base: float = 0.5
+    backoff_max: float = 30.0
+    timeout: float = 60.0
+
+
+@dataclass
+class ClientStats:
+    requests: int = 0
+    retries: int = 0
+    deduplicated: int = 0
+    bytes_downloaded: int = 0
+
+
+class _RateLimiter:
+    """Spaces request starts at least ``1 / rate`` seconds apart."""
+
+    def __init__(self, rate_per_second: float) -> None:
+        self._interval = 1.0 / rate_per_second
+        self._next_start = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next_start - now
+            self._next_start = max(now, self._next_start) + self._interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+@dataclass
+class AsyncNasaPowerClient:
+    config: ClientConfig = field(default_factory=ClientConfig)
+    stats: ClientStats = field(default_factory=ClientStats)
+
+    def __post_init__(self) -> None:
+        self._session: aiohttp.ClientSession | None = None
+        self._semaphore = asyncio.Semaphore(self.config.concurrency)
+        self._limiter = (
+            _RateLimiter(self.config.rate_per_second) if self.config.rate_per_second else None
+        )
+        self._inflight: dict[CacheKey, asyncio.Task[dict[str, Any]]] = {}
+
+    async def __aenter__(self) -> "AsyncNasaPowerClient":
+        connector = aiohttp.TCPConnector(limit=self.config.concurrency)
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.config.timeout),
+        )
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def fetch_hourly(self, latitude: float, longitude: float, year: int) -> dict[str, Any]:
+        """Return the raw JSON payload, sharing identical in-flight requests."""
+        key = CacheKey.build(latitude, longitude, year, NASA_PARAMETER)
+        task = self._inflight.get(key)
+        if task is not None:
+            self.stats.deduplicated += 1
+            return await asyncio.shield(task)
+
+        task = asyncio.create_task(self._fetch_with_retries(latitude, longitude, year))
+        self._inflight[key] = task
+        task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _fetch_with_retries(
+        self, latitude: float, longitude: float, year: int
+    ) -> dict[str, Any]:
+        if self._session is None:
+            raise RuntimeError("AsyncNasaPowerClient must be used as an async context manager")
+
+        params = build_request_params(latitude, longitude, year)
+        for attempt in range(self.config.max_retries + 1):
+            retry_after: float | None = None
+            async with self._semaphore:
+                if self._limiter is not None:
+                    await self._limiter.wait()
+                self.stats.requests += 1
+                try:
+                    async with self._session.get(self.config.base_url, params=params) as response:
+                        body = await response.read()
+                        status = response.status
+                        retry_after = _parse_retry_after(response.headers.get("Retry-After"))
+                except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+                    error = NasaFetchError(f"Error fetching data from NASA API: {exc!r}")
+                else:
+                    self.stats.bytes_downloaded += len(body)
+                    if status < 400:
+                        try:
+                            return json.loads(body)
+                        except ValueError as exc:
+                            raise NasaFetchError("NASA API returned invalid JSON.") from exc
+                    error = NasaFetchError(f"Error fetching data from NASA API: HTTP {status}")
+                    if status not in RETRYABLE_STATUSES:
+                        raise error
+
+            if attempt == self.config.max_retries:
+                raise error
+            self.stats.retries += 1
+            await asyncio.sleep(self._backoff(attempt, retry_after))
+
+        raise AssertionError("unreachable")
+
+    def _backoff(self, attempt: int, retry_after: float | None) -> float:
+        ceiling = min(self.config.backoff_max, self.config.backoff_base * 2**attempt)
+        delay = random.uniform(0, ceiling)
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.config.backoff_max))
+        return delay
+
+
+def _parse_retry_after(value: str | None) -> float | None:
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        return None  # HTTP-date form; fall back to our own backoff
+
+
+async def load_hourly_series_async(
+    client: AsyncNasaPowerClient,
+    latitude: float,
+    longitude: float,
+    year: int,
+    cache: IrradianceCache | None,
+    offline: bool = False,
+    tiles: TileStore | None = None,
+) -> HourlySeries:
+    """Async counterpart of ``power.load_hourly_series`` (cache I/O runs in threads)."""
+    if tiles is not None:
+        series = await asyncio.to_thread(tiles.lookup, latitude, longitude, year, NASA_PARAMETER)
+        if series is not None:
+            return series
+
+    key = CacheKey.build(latitude, longitude, year, NASA_PARAMETER)
+    if cache is not None:
+        lookup = cache.require if offline else cache.get
+        series = await asyncio.to_thread(lookup, key)
+        if series is not None:
+            return series
+
+    payload = await client.fetch_hourly(latitude, longitude, year)
+    series = await asyncio.to_thread(parse_hourly_series, payload)
+    if cache is not None:
+        await asyncio.to_thread(cache.put, key, series)
+    return series
@@ -0,0 +1,209 @@
+"""Network-wide impact aggregates over many wallet exports, in bounded memory.
+
+Each export (``solar_footprint_data.json`` or its Arrow tables) is read in
+batches of at most ``batch_rows`` farms/weeks and folded into accumulators
+whose size depends on the number of farms, weeks and regions, never on the
+number of wallets or rows:
+
+    farms   watts captured per farm (name and region), summed over wallets,
+            plus the farm's week and finalization time; farms without a
+            name are summed per region
+    weeks   per (week, region): summed points and sources, the sum of the
+            wallets' shares (how much of the region the inputs cover), the
+            network total power and how many wallets had a row
+    shares  per region, a histogram over wallets of each wallet's mean weekly
+            ``sharePercent`` (log-spaced bins, SHARE_BINS)
+
+``NetworkImpact.as_footprint()`` shapes the result like a single export so the
+existing footprint and points chart layouts can render it unchanged.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterable
+
+import numpy as np
+import pandas as pd
+
+from footprint_data import DEFAULT_BATCH_ROWS, FootprintData, FootprintFormatError, read_footprint_batches
+
+SHARE_BINS = np.logspace(-4, 2, 61)  # 0.0001% .. 100%, 10 bins per decade
+POINT_COLUMNS = ("totalPoints", "inflationPoints", "steeringPoints", "vaultBonusPoints", "glowWorthPoints", "sharePercent")
+FARM_KEY = ("farmName", "regionId")
+UNNAMED_FARM = ""
+FARM_INFO_COLUMNS = (*FARM_KEY, "weekNumber", "finalizedAt")
+
+
+@dataclass
+class NetworkImpact:
+    wallets: int
+    farms: pd.DataFrame
+    weeks: pd.DataFrame
+    share_counts: dict[int, np.ndarray]  # region -> counts; [0] is below SHARE_BINS[0], [-1] above 100
+    failed: list[tuple[str, str]] = field(default_factory=list)
+
+    @property
+    def total_watts(self) -> float:
+        return float(self.farms["wattsCaptured"].sum())
+
+    def as_footprint(self) -> FootprintData:
+        total_watts = self.total_watts
+        return FootprintData(
+            wallet_address=f"Network ({self.wallets:,} wallets)",
+            summary={
+                "totalWatts": round(total_watts),
+                "totalPanels": int(total_watts // 400),
+                "farmsCount": len(self.farms),
+                "wallets": self.wallets,
+            },
+            farms=self.farms,
+            weeks=self.weeks,
+        )
+
+
+class NetworkAccumulator:
+    """Fold export batches into network aggregates; call ``finish_wallet`` after each export."""
+
+    def __init__(self) -> None:
+        self.wallets = 0
+        self._farm_watts = pd.Series(dtype="float64")
+        self._farm_info = pd.DataFrame(columns=list(FARM_INFO_COLUMNS)).set_index(list(FARM_KEY))
+        self._week_sums: pd.DataFrame | None = None
+        self._network_power: pd.Series | None = None
+        self._share_counts: dict[int, np.ndarray] = {}
+        self._wallet_share: dict[int, list[float]] = defaultdict(lambda: [0.0, 0])
+
+    def add(self, name: str, frame: pd.DataFrame) -> None:
+        if name == "farms":
+            self.add_farms(frame)
+        else:
+            self.add_weeks(frame)
+
+    def add_farms(self, frame: pd.DataFrame) -> None:
+        if frame.empty:
+            return
+        # Category codes differ between exports and batches, so group on the names.  Farms
+        # are keyed by name and region; unnamed farms are kept, one row per region.
+        names = frame["farmName"].astype(object)
+        frame = frame.assign(
+            farmName=names.where(names.notna(), UNNAMED_FARM),
+            wattsCaptured=frame["wattsCaptured"].astype("float64"),
+        )
+        grouped = frame.groupby(list(FARM_KEY), sort=False, dropna=False)
+        self._merge_farms(grouped["wattsCaptured"].sum(), grouped[["weekNumber", "finalizedAt"]].first())
+
+    def add_weeks(self, frame: pd.DataFrame) -> None:
+        if frame.empty:
+            return
+        columns = [column for column in POINT_COLUMNS if column in frame]
+        values = frame[columns].astype("float64").assign(weekNumber=frame["weekNumber"], regionId=frame["regionId"])
+        grouped = values.groupby(["weekNumber", "regionId"])
+        self._merge_weeks(grouped[columns].sum().assign(wallets=grouped.size().astype("float64")))
+
+        if "networkTotalPower" in frame:
+            network = frame["networkTotalPower"].astype("float64").groupby(
+                [frame["weekNumber"], frame["regionId"]]
+            ).max()
+            self._merge_network(network)
+
+        by_region = values.groupby("regionId")["sharePercent"].agg(["sum", "count"])
+        for region, (total, rows) in by_region.iterrows():
+            accumulated = self._wallet_share[int(region)]
+            accumulated[0] += total
+            accumulated[1] += rows
+
+    def finish_wallet(self) -> None:
+        for region, (total, rows) in self._wallet_share.items():
+            if not rows:
+                continue
+            counts = self._share_counts.setdefault(region, np.zeros(len(SHARE_BINS) + 1, dtype=np.int64))
+            counts[np.searchsorted(SHARE_BINS, total / rows, side="right")] += 1
+        self._wallet_share.clear()
+        self.wallets += 1
+
+    def merge(self, other: NetworkAccumulator) -> None:
+        """Fold in another accumulator's finished wallets."""
+        self._merge_farms(other._farm_watts, other._farm_info)
+        if other._week_sums is not None:
+            self._merge_weeks(other._week_sums)
+        if other._network_power is not None:
+            self._merge_network(other._network_power)
+        for region, counts in other._share_counts.items():
+            self._share_counts.setdefault(region, np.zeros_like(counts))
+            self._share_counts[region] += counts
+        self.wallets += other.wallets
+
+    def _merge_farms(self, watts: pd.Series, info: pd.DataFrame) -> None:
+        if watts.empty:
+            return
+        self._farm_watts = watts if self._farm_watts.empty else self._farm_watts.add(watts, fill_value=0.0)
+        unseen = info.index.difference(self._farm_info.index)
+        if len(unseen):
+            parts = [part for part in (self._farm_info, info.loc[unseen]) if not part.empty]
+            self._farm_info = pd.concat(parts)
+
+    def _merge_weeks(self, sums: pd.DataFrame) -> None:
+        self._week_sums = sums if self._week_sums is None else self._week_sums.add(sums, fill_value=0.0)
+
+    def _merge_network(self, network: pd.Series) -> None:
+        if self._network_power is None:
+            self._network_power = network
+        else:
+            current, update = self._network_power.align(network, join="outer")
+            self._network_power = pd.Series(np.fmax(current.to_numpy(), update.to_numpy()), index=current.index)
+
+    def result(self) -> NetworkImpact:
+        farms = self._farm_info.assign(wattsCaptured=self._farm_watts).reset_index()
+        unnamed = farms["farmName"] == UNNAMED_FARM
+        if unnamed.any():
+            labels = "Unnamed farm (region " + farms.loc[unnamed, "regionId"].astype(str) + ")"
+            farms["farmName"] = farms["farmName"].where(~unnamed, labels)
+        farms = farms.astype({"farmName": "category", "regionId": "int32", "weekNumber": "int32"})
+        if self._week_sums is None:
+            weeks = pd.DataFrame(columns=["weekNumber", "regionId", *POINT_COLUMNS, "wallets", "networkTotalPower"])
+        else:
+            network = self._network_power if self._network_power is not None else np.nan
+            weeks = self._week_sums.assign(networkTotalPower=network).reset_index()
+            weeks = weeks.astype({"weekNumber": "int32", "regionId": "int32", "wallets": "int64"})
+        return NetworkImpact(self.wallets, farms, weeks, dict(sorted(self._share_counts.items())))
+
+
+def analyze_exports(
+    exports: Iterable[Path],
+    batch_rows: int = DEFAULT_BATCH_ROWS,
+    on_export: Callable[[Path, str | None], None] | None = None,
+) -> NetworkImpact:
+    """Reduce every export in turn; unreadable ones are recorded in ``failed`` and skipped.
+
+    Each export is folded into its own accumulator and merged only once it
+    has been read completely, so a file that fails half-way contributes nothing.
+    """
+    accumulator = NetworkAccumulator()
+    failed = []
+    for path in exports:
+        wallet = NetworkAccumulator()
+        tables: set[str] = set()
+
+        def add(name: str, frame: pd.DataFrame) -> None:
+            tables.add(name)
+            wallet.add(name, frame)
+
+        try:
+            read_footprint_batches(path, add, batch_rows)
+            if not tables:
+                raise FootprintFormatError("no 'farms' or 'weeks' arrays")
+        except (OSError, ValueError) as exc:
+            failed.append((str(path), f"{type(exc).__name__}: {exc}"))
+            if on_export is not None:
+                on_export(path, failed[-1][1])
+            continue
+        wallet.finish_wallet()
+        accumulator.merge(wallet)
+        if on_export is not None:
+            on_export(path, None)
+    impact = accumulator.result()
+    impact.failed = failed
+    return impact
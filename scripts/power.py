@@ -5,41 +5,257 @@ from __future__ import annotations
 
 import argparse
 import sys
-from datetime import date, datetime
+from datetime import date
 from pathlib import Path
-from typing import Any
-
-import requests
+from typing import TYPE_CHECKING, Any, Sequence
+
+import numpy as np
+
+from battery import (
+    DEFAULT_EFFICIENCY,
+    print_dispatch_report,
+    print_sizing_report,
+    simulate_dispatch,
+    sweep_dispatch,
+    write_sweep_csv,
+)
+from bootstrap import DEFAULT_SAMPLES, print_bootstrap_report, run_bootstrap
+from hourly_store import HourlyCubeWriter, write_text_dump
+from instrumentation import add_profile_arguments, count, finish_profiling, stage, start_profiling
+from irradiance_cache import (
+    DEFAULT_CACHE_DIR,
+    DEFAULT_MAX_BYTES,
+    CacheKey,
+    CacheMissError,
+    HourlySeries,
+    IrradianceCache,
+)
+from irradiance_tiles import TileStore
+from multi_year import print_sweep_report, run_sweep
+from solar_engine import (
+    FILL_VALUE,
+    MONTH_NAMES,
+    RATE_SUMMER_OFF_CENTS,
+    RATE_SUMMER_ON_CENTS,
+    RATE_WINTER_BASE_CENTS,
+    RATE_WINTER_EXCESS_CENTS,
+    MonthlyBuckets,
+    SolarDataError,
+    compute_monthly_buckets,
+    day_hour_cube,
+    decode_timestamps,
+    value_buckets,
+)
+from tariffs import (
+    DEFAULT_TOU_TARIFF,
+    Tariff,
+    TariffError,
+    TariffValuation,
+    compile_tariff,
+    hourly_kwh_grid,
+    load_tariff,
+    value_series,
+)
+
+if TYPE_CHECKING:
+    import requests
 
 NASA_POWER_HOURLY_URL = "https://power.larc.nasa.gov/api/temporal/hourly/point"
+NASA_PARAMETER = "ALLSKY_SFC_SW_DWN"
+
+
+def add_cache_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--cache-dir",
+        default=str(DEFAULT_CACHE_DIR),
+        help=f"Directory for cached NASA irradiance series (default: {DEFAULT_CACHE_DIR})",
+    )
+    parser.add_argument(
+        "--cache-max-mb",
+        type=float,
+        default=DEFAULT_MAX_BYTES / (1024 * 1024),
+        help="Evict least recently used cache entries beyond this size (default: 512)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always fetch from NASA POWER and do not read or write the cache",
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Never call the network; fail immediately on a cache miss",
+    )
+    parser.add_argument(
+        "--tiles",
+        type=Path,
+        default=None,
+        metavar="DIR",
+        help=(
+            "Look sites up in prefetched regional tiles first "
+            "(see irradiance_tiles.py prefetch); falls back to cache/network"
+        ),
+    )
+
+
+def validate_cache_arguments(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    if args.offline and args.no_cache:
+        parser.error("--offline requires the cache; drop --no-cache.")
+
+    if args.cache_max_mb <= 0:
+        parser.error("--cache-max-mb must be greater than 0.")
+
 
-# Base rates + 3.85 cents fuel adjustment
-FUEL_ADJ_CENTS = 3.85
-RATE_SUMMER_ON_CENTS = 27.5 + FUEL_ADJ_CENTS  # 31.35
-RATE_SUMMER_OFF_CENTS = 3.6 + FUEL_ADJ_CENTS  # 7.45
-RATE_WINTER_BASE_CENTS = 6.9 + FUEL_ADJ_CENTS  # 10.75
-RATE_WINTER_EXCESS_CENTS = 4.45 + FUEL_ADJ_CENTS  # 8.30
-
-SUMMER_MONTHS = {6, 7, 8, 9, 10}
-MONTH_NAMES = [
-    "",
-    "January",
-    "February",
-    "March",
-    "April",
-    "May",
-    "June",
-    "July",
-    "August",
-    "September",
-    "October",
-    "November",
-    "December",
-]
-
-
-def parse_args() -> argparse.Namespace:
+def build_cache(args: argparse.Namespace) -> IrradianceCache | None:
+    if args.no_cache:
+        return None
+    return IrradianceCache(Path(args.cache_dir), int(args.cache_max_mb * 1024 * 1024))
+
+
+def build_tiles(args: argparse.Namespace) -> TileStore | None:
+    return TileStore(args.tiles) if args.tiles is not None else None
+
+
+def parse_year_range(value: str) -> list[int]:
+    try:
+        start, _, end = value.partition("-")
+        first, last = int(start), int(end or start)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected START-END, got {value!r}")
+    if last < first:
+        raise argparse.ArgumentTypeError(f"range {value!r} ends before it starts")
+    return list(range(first, last + 1))
+
+
+def parse_battery(value: str) -> tuple[float, float]:
+    try:
+        capacity, power = (float(part) for part in value.split(":"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected CAPACITY_KWH:POWER_KW, got {value!r}")
+    if capacity <= 0 or power <= 0:
+        raise argparse.ArgumentTypeError("battery capacity and power must be greater than 0")
+    return capacity, power
+
+
+def parse_float_range(value: str) -> np.ndarray:
+    """``START:STOP:STEP`` (inclusive of STOP) or a single value."""
+    try:
+        parts = [float(part) for part in value.split(":")]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected START:STOP:STEP, got {value!r}")
+    if len(parts) == 1:
+        parts = [parts[0], parts[0], 1.0]
+    if len(parts) != 3:
+        raise argparse.ArgumentTypeError(f"expected START:STOP:STEP, got {value!r}")
+    start, stop, step = parts
+    if start < 0 or stop < start or step <= 0:
+        raise argparse.ArgumentTypeError(
+            f"range {value!r} needs 0 <= START <= STOP and STEP > 0"
+        )
+    return np.arange(round((stop - start) / step) + 1) * step + start
+
+
+def parse_battery_cost(value: str) -> tuple[float, float]:
+    try:
+        parts = [float(part) for part in value.split(":")]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected PER_KWH[:PER_KW], got {value!r}")
+    if len(parts) not in (1, 2) or any(part < 0 for part in parts):
+        raise argparse.ArgumentTypeError(f"expected PER_KWH[:PER_KW], got {value!r}")
+    return parts[0], parts[1] if len(parts) == 2 else 0.0
+
+
+def add_battery_arguments(parser: argparse.ArgumentParser) -> None:
+    group = parser.add_argument_group(
+        "battery",
+        "Hourly state-of-charge simulation: charge from production off-peak, "
+        "discharge into the tariff's peak window (single-year runs only)",
+    )
+    group.add_argument(
+        "--battery",
+        type=parse_battery,
+        metavar="KWH:KW",
+        help="Simulate one battery of this capacity and power",
+    )
+    group.add_argument(
+        "--battery-capacities",
+        type=parse_float_range,
+        metavar="START:STOP:STEP",
+        help="Sweep these capacities in kWh (with --battery-powers)",
+    )
+    group.add_argument(
+        "--battery-powers",
+        type=parse_float_range,
+        metavar="START:STOP:STEP",
+        help="Sweep these power ratings in kW (with --battery-capacities)",
+    )
+    group.add_argument(
+        "--battery-efficiency",
+        type=float,
+        default=DEFAULT_EFFICIENCY,
+        help=f"Round-trip efficiency (default: {DEFAULT_EFFICIENCY})",
+    )
+    group.add_argument(
+        "--battery-tariff",
+        type=Path,
+        default=None,
+        metavar="FILE",
+        help=f"TOU tariff to dispatch against (default: built-in {DEFAULT_TOU_TARIFF.name!r})",
+    )
+    group.add_argument(
+        "--battery-cost",
+        type=parse_battery_cost,
+        default=None,
+        metavar="PER_KWH[:PER_KW]",
+        help="Capital cost in dollars; ranks the sweep by simple payback",
+    )
+    group.add_argument(
+        "--battery-top",
+        type=int,
+        default=10,
+        help="Sweep configurations to print (default: 10)",
+    )
+    group.add_argument(
+        "--battery-csv",
+        type=Path,
+        default=None,
+        metavar="PATH",
+        help="Write every sweep configuration to this CSV file",
+    )
+
+
+def validate_battery_arguments(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    sweep = args.battery_capacities is not None or args.battery_powers is not None
+    if sweep and (args.battery_capacities is None or args.battery_powers is None):
+        parser.error("--battery-capacities and --battery-powers must be used together.")
+    if sweep and args.battery is not None:
+        parser.error("Use either --battery or a --battery-capacities/--battery-powers sweep.")
+    if (sweep or args.battery is not None) and args.years:
+        parser.error("Battery simulation is only available for single-year runs.")
+    if (args.battery_csv is not None or args.battery_cost is not None) and not sweep:
+        parser.error("--battery-csv/--battery-cost need a --battery-capacities/--battery-powers sweep.")
+    if not 0 < args.battery_efficiency <= 1:
+        parser.error("--battery-efficiency must be within (0, 1].")
+    if args.battery_top < 1:
+        parser.error("--battery-top must be at least 1.")
+
+    args.battery_sweep = sweep
+    try:
+        if args.battery_tariff is None:
+            args.battery_tariff = DEFAULT_TOU_TARIFF
+        else:
+            args.battery_tariff = load_tariff(args.battery_tariff)
+            if sweep or args.battery is not None:
+                compile_tariff(args.battery_tariff, args.year)
+    except TariffError as exc:
+        parser.error(str(exc))
+
+
+def parse_args(
+    argv: Sequence[str] | None = None, prog: str | None = None
+) -> argparse.Namespace:
     parser = argparse.ArgumentParser(
+        prog=prog,
         description=(
             "Estimate monthly production/value buckets and blended $/kWh from "
             "NASA hourly irradiance data."
@@ -53,19 +269,63 @@ def parse_args() -> argparse.Namespace:
         type=float,
         help="Expected annual energy production in kWh",
     )
-    parser.add_argument(
+    year_group = parser.add_mutually_exclusive_group()
+    year_group.add_argument(
         "--year",
         type=int,
         default=2023,
         help="Calendar year to fetch from NASA POWER API (default: 2023)",
     )
+    year_group.add_argument(
+        "--years",
+        type=parse_year_range,
+        metavar="START-END",
+        help=(
+            "Sweep a range of years (e.g. 2001-2023) and report P50/P90/min/max "
+            "production and value; annual_kwh is treated as the long-term mean"
+        ),
+    )
     parser.add_argument(
         "--debug-dir",
-        default="nasa_debug_output",
-        help="Directory where monthly irradiance debug files are written",
+        default=None,
+        help="Write human-readable monthly irradiance text files to this directory",
     )
+    parser.add_argument(
+        "--debug-cube",
+        type=Path,
+        default=None,
+        metavar="PATH.npy",
+        help="Write the hourly irradiance as a memory-mappable (1, 366, 24) cube + .json sidecar",
+    )
+    parser.add_argument(
+        "--tariff",
+        dest="tariffs",
+        action="append",
+        default=[],
+        metavar="FILE",
+        help="Also value production against a JSON tariff schedule (repeatable)",
+    )
+    parser.add_argument(
+        "--bootstrap",
+        type=int,
+        default=None,
+        metavar="SAMPLES",
+        help=(
+            "Also report P5/P50/P95 bands from this many synthetic years, resampling "
+            f"daily profiles within each month (e.g. {DEFAULT_SAMPLES}; single-year runs)"
+        ),
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="Random seed for --bootstrap (default: 0)",
+    )
+    add_battery_arguments(parser)
+    add_cache_arguments(parser)
+    add_profile_arguments(parser)
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     provided = [args.latitude, args.longitude, args.annual_kwh]
     if any(value is not None for value in provided) and not all(
@@ -77,12 +337,32 @@ def parse_args() -> argparse.Namespace:
         )
 
     current_year = date.today().year
-    if args.year < 1981 or args.year > current_year:
-        parser.error(f"--year must be between 1981 and {current_year}.")
+    for year in args.years or [args.year]:
+        if year < 1981 or year > current_year:
+            parser.error(f"Years must be between 1981 and {current_year}.")
+    if args.years and len(args.years) < 2:
+        parser.error("--years needs at least two years; use --year for one.")
+    if args.years and (args.debug_dir or args.debug_cube):
+        parser.error("--debug-dir/--debug-cube are only available for single-year runs.")
+    if args.bootstrap is not None and args.years:
+        parser.error("--bootstrap is only available for single-year runs.")
+    if args.bootstrap is not None and args.bootstrap < 1:
+        parser.error("--bootstrap needs at least 1 sample.")
 
     if args.annual_kwh is not None and args.annual_kwh <= 0:
         parser.error("annual_kwh must be greater than 0.")
 
+    validate_cache_arguments(parser, args)
+    validate_battery_arguments(parser, args)
+
+    try:
+        args.tariffs = [load_tariff(path) for path in args.tariffs]
+        for tariff in args.tariffs:
+            for year in args.years or [args.year]:
+                compile_tariff(tariff, year)
+    except TariffError as exc:
+        parser.error(str(exc))
+
     return args
 
 
@@ -105,9 +385,13 @@ def prompt_for_inputs() -> tuple[float, float, float]:
     return latitude, longitude, annual_kwh
 
 
-def fetch_hourly_nasa_data(latitude: float, longitude: float, year: int) -> dict[str, Any]:
-    params = {
-        "parameters": "ALLSKY_SFC_SW_DWN",
+class NasaFetchError(RuntimeError):
+    """Raised when the NASA POWER API cannot be reached or returns garbage."""
+
+
+def build_request_params(latitude: float, longitude: float, year: int) -> dict[str, Any]:
+    return {
+        "parameters": NASA_PARAMETER,
         "community": "RE",
         "longitude": longitude,
         "latitude": latitude,
@@ -116,146 +400,136 @@ def fetch_hourly_nasa_data(latitude: float, longitude: float, year: int) -> dict
         "format": "json",
     }
 
-    print("Fetching hourly solar data from NASA POWER API...")
-    try:
-        response = requests.get(NASA_POWER_HOURLY_URL, params=params, timeout=60)
-        response.raise_for_status()
-    except requests.RequestException as exc:
-        print(f"Error fetching data from NASA API: {exc}", file=sys.stderr)
-        raise SystemExit(1)
-
-    try:
-        data = response.json()
-    except ValueError:
-        print("NASA API returned invalid JSON.", file=sys.stderr)
-        raise SystemExit(1)
-
-    return data
 
+class LazySession:
+    """A ``requests.Session`` opened on the first request.
 
-def write_debug_files(debug_matrix: dict[int, dict[int, list[float]]], output_dir: str) -> None:
-    output_path = Path(output_dir)
-    output_path.mkdir(parents=True, exist_ok=True)
-    print(f"Writing debug files to folder: {output_path}/")
+    Runs served entirely from tiles or the cache never import requests, while
+    every fetch of a multi-year run still reuses one connection.
+    """
 
-    for month in range(1, 13):
-        month_days = debug_matrix.get(month)
-        if not month_days:
-            continue
-
-        month_file = output_path / f"{MONTH_NAMES[month]}.txt"
-        with month_file.open("w", encoding="utf-8") as handle:
-            handle.write(
-                f"Daily Solar Irradiance Profile for {MONTH_NAMES[month]} (Hour 00-23)\n"
-            )
-            handle.write(
-                "Day | 00 01 02 03 04 05 06 07 08 09 10 11 12 13 14 15 16 17 18 19 20 21 22 23\n"
-            )
-            handle.write("-" * 100 + "\n")
-            for day in sorted(month_days):
-                hours = " ".join(f"{value:4.2f}" for value in month_days[day])
-                handle.write(f"{day:02d}  | {hours}\n")
+    def __init__(self) -> None:
+        self._session: requests.Session | None = None
 
-    print("Debug files generated.\n")
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        if self._session is None:
+            import requests
 
+            self._session = requests.Session()
+        return self._session.get(url, **kwargs)
 
-def analyze_solar_data(data: dict[str, Any], annual_kwh: float, debug_dir: str) -> None:
-    # NASA API 'ALLSKY_SFC_SW_DWN' is in Local Solar Time (LST).
-    solar_data = (
-        data.get("properties", {})
-        .get("parameter", {})
-        .get("ALLSKY_SFC_SW_DWN")
-    )
-    if not isinstance(solar_data, dict):
-        print("Unexpected NASA API payload: missing ALLSKY_SFC_SW_DWN.", file=sys.stderr)
-        raise SystemExit(1)
+    def close(self) -> None:
+        if self._session is not None:
+            self._session.close()
+            self._session = None
 
-    valid_data_points: dict[str, float] = {}
-    for timestamp, value in solar_data.items():
-        try:
-            irradiance = float(value)
-        except (TypeError, ValueError):
-            continue
-        if irradiance == -999.0:
-            continue
-        valid_data_points[timestamp] = irradiance
-
-    if not valid_data_points:
-        print("No valid solar data points found for this location.", file=sys.stderr)
-        raise SystemExit(1)
 
-    total_irradiance_raw = sum(valid_data_points.values())
-    if total_irradiance_raw <= 0:
-        print("NASA irradiance sum is 0; cannot scale production.", file=sys.stderr)
-        raise SystemExit(1)
+def fetch_hourly_nasa_data(
+    latitude: float,
+    longitude: float,
+    year: int,
+    session: requests.Session | LazySession | None = None,
+) -> dict[str, Any]:
+    import requests  # lazy: the async service imports this module without requests
 
-    production_ratio = annual_kwh / total_irradiance_raw
-
-    monthly_stats = {
-        month: {
-            "summer_on": 0.0,
-            "summer_off": 0.0,
-            "winter_total": 0.0,
-            "winter_base": 0.0,
-            "winter_excess": 0.0,
-            "total_kwh": 0.0,
-        }
-        for month in range(1, 13)
-    }
-    debug_matrix: dict[int, dict[int, list[float]]] = {}
+    params = build_request_params(latitude, longitude, year)
 
-    for timestamp, irradiance in valid_data_points.items():
-        try:
-            dt = datetime.strptime(timestamp, "%Y%m%d%H")
-        except ValueError:
-            continue
+    http = session if session is not None else requests
+    try:
+        with stage("nasa_fetch"):
+            response = http.get(NASA_POWER_HOURLY_URL, params=params, timeout=60)
+            response.raise_for_status()
+    except requests.RequestException as exc:
+        raise NasaFetchError(f"Error fetching data from NASA API: {exc}") from exc
+    count("nasa_requests")
+    count("bytes_downloaded", len(response.content))
 
-        month = dt.month
-        day = dt.day
-        hour = dt.hour
+    try:
+        with stage("json_decode"):
+            data = response.json()
+    except ValueError as exc:
+        raise NasaFetchError("NASA API returned invalid JSON.") from exc
 
-        month_bucket = debug_matrix.setdefault(month, {})
-        day_bucket = month_bucket.setdefault(day, [0.0] * 24)
-        day_bucket[hour] = irradiance
+    return data
 
-        kwh_in_hour = irradiance * production_ratio
-        stats = monthly_stats[month]
-        stats["total_kwh"] += kwh_in_hour
 
-        if month in SUMMER_MONTHS:
-            if month == 10:
-                stats["summer_off"] += kwh_in_hour
-            else:
-                stats["summer_on"] += kwh_in_hour
-        else:
-            stats["winter_total"] += kwh_in_hour
+def _as_float(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return -999.0
 
-    write_debug_files(debug_matrix, debug_dir)
 
-    grand_total_kwh = 0.0
-    totals = {
-        "summer_on": 0.0,
-        "summer_off": 0.0,
-        "winter_base": 0.0,
-        "winter_excess": 0.0,
-    }
+def parse_hourly_series(data: dict[str, Any]) -> HourlySeries:
+    # NASA API 'ALLSKY_SFC_SW_DWN' is in Local Solar Time (LST).
+    solar_data = data.get("properties", {}).get("parameter", {}).get(NASA_PARAMETER)
+    if not isinstance(solar_data, dict):
+        raise SolarDataError(f"Unexpected NASA API payload: missing {NASA_PARAMETER}.")
 
-    for month in range(1, 13):
-        stats = monthly_stats[month]
-        winter_total = stats["winter_total"]
-        if winter_total > 0:
-            stats["winter_base"] = min(winter_total, 600.0)
-            stats["winter_excess"] = max(winter_total - 600.0, 0.0)
-
-        grand_total_kwh += stats["total_kwh"]
-        totals["summer_on"] += stats["summer_on"]
-        totals["summer_off"] += stats["summer_off"]
-        totals["winter_base"] += stats["winter_base"]
-        totals["winter_excess"] += stats["winter_excess"]
-
-    if grand_total_kwh <= 0:
-        print("Calculated annual production is 0.", file=sys.stderr)
-        raise SystemExit(1)
+    try:
+        timestamps = np.array(list(solar_data), dtype=np.int64)
+    except ValueError:
+        timestamps = np.array(
+            [int(key) if key.isdigit() else -1 for key in solar_data], dtype=np.int64
+        )
+    try:
+        values = np.fromiter(solar_data.values(), dtype=np.float64, count=len(solar_data))
+    except (TypeError, ValueError):
+        values = None
+    # fromiter reads null as NaN; the per-hour loop skipped those hours, so they become fills
+    if values is None or np.isnan(values).any():
+        values = np.array([_as_float(value) for value in solar_data.values()], dtype=np.float64)
+
+    return HourlySeries(timestamps, values)
+
+
+def load_hourly_series(
+    latitude: float,
+    longitude: float,
+    year: int,
+    cache: IrradianceCache | None,
+    offline: bool = False,
+    session: requests.Session | LazySession | None = None,
+    verbose: bool = True,
+    tiles: TileStore | None = None,
+) -> HourlySeries:
+    """Return the hourly series for a site, preferring tiles, then the cache.
+
+    Raises CacheMissError (offline miss), NasaFetchError or SolarDataError
+    instead of exiting so batch callers can record per-site failures.
+    """
+    if tiles is not None:
+        with stage("tile_lookup"):
+            series = tiles.lookup(latitude, longitude, year, NASA_PARAMETER)
+        if series is not None:
+            count("tile_hits")
+            if verbose:
+                print(f"Loaded hourly solar data from tiles: {tiles.root}")
+            return series
+
+    key = CacheKey.build(latitude, longitude, year, NASA_PARAMETER)
+    if cache is not None:
+        with stage("cache_read"):
+            series = cache.require(key) if offline else cache.get(key)
+        if series is not None:
+            if verbose:
+                print(f"Loaded hourly solar data from cache: {cache.path_for(key)}")
+            return series
+
+    if verbose:
+        print("Fetching hourly solar data from NASA POWER API...")
+    payload = fetch_hourly_nasa_data(latitude, longitude, year, session)
+    with stage("parse"):
+        series = parse_hourly_series(payload)
+    if cache is not None:
+        with stage("cache_write"):
+            cache.put(key, series)
+    return series
+
+
+def print_report(buckets: MonthlyBuckets) -> None:
+    grand_total_kwh = float(buckets.grand_total_kwh)
+    totals = {name: float(total) for name, total in buckets.totals().items()}
 
     header = (
         f"{'Month':<12} | {'% Annual':>10} | {'Total kWh':>10} | "
@@ -266,18 +540,21 @@ def analyze_solar_data(data: dict[str, Any], annual_kwh: float, debug_dir: str)
     print("-" * len(header))
 
     for month in range(1, 13):
-        stats = monthly_stats[month]
-        pct = (stats["total_kwh"] / grand_total_kwh) * 100
-
-        summer_on = f"{stats['summer_on']:.0f}" if stats["summer_on"] > 0 else ""
-        summer_off = f"{stats['summer_off']:.0f}" if stats["summer_off"] > 0 else ""
-        winter_base = f"{stats['winter_base']:.0f}" if stats["winter_base"] > 0 else ""
+        index = month - 1
+        total_kwh = float(buckets.total_kwh[index])
+        pct = (total_kwh / grand_total_kwh) * 100
+
+        summer_on = f"{buckets.summer_on[index]:.0f}" if buckets.summer_on[index] > 0 else ""
+        summer_off = f"{buckets.summer_off[index]:.0f}" if buckets.summer_off[index] > 0 else ""
+        winter_base = (
+            f"{buckets.winter_base[index]:.0f}" if buckets.winter_base[index] > 0 else ""
+        )
         winter_excess = (
-            f"{stats['winter_excess']:.0f}" if stats["winter_excess"] > 0 else ""
+            f"{buckets.winter_excess[index]:.0f}" if buckets.winter_excess[index] > 0 else ""
         )
 
         print(
-            f"{MONTH_NAMES[month]:<12} | {pct:>9.2f}% | {stats['total_kwh']:>10.0f} | "
+            f"{MONTH_NAMES[month]:<12} | {pct:>9.2f}% | {total_kwh:>10.0f} | "
             f"{summer_on:>12} | {summer_off:>12} | {winter_base:>12} | {winter_excess:>12}"
         )
 
@@ -290,29 +567,137 @@ def analyze_solar_data(data: dict[str, Any], annual_kwh: float, debug_dir: str)
     print("=" * len(header))
     print()
 
-    cost_summer_on = totals["summer_on"] * RATE_SUMMER_ON_CENTS / 100.0
-    cost_summer_off = totals["summer_off"] * RATE_SUMMER_OFF_CENTS / 100.0
-    cost_winter_base = totals["winter_base"] * RATE_WINTER_BASE_CENTS / 100.0
-    cost_winter_excess = totals["winter_excess"] * RATE_WINTER_EXCESS_CENTS / 100.0
-    total_cost = cost_summer_on + cost_summer_off + cost_winter_base + cost_winter_excess
-    price_per_kwh = total_cost / grand_total_kwh
-
+    costs = {name: float(cost) for name, cost in value_buckets(buckets).items()}
     print("Costs Breakdown (With Battery System):")
-    print(f"  Summer On-peak       ({RATE_SUMMER_ON_CENTS:.2f}c): ${cost_summer_on:,.2f}")
-    print(f"  Summer Off-peak      ({RATE_SUMMER_OFF_CENTS:.2f}c): ${cost_summer_off:,.2f}")
-    print(f"  Winter first 600 kWh ({RATE_WINTER_BASE_CENTS:.2f}c): ${cost_winter_base:,.2f}")
+    print(f"  Summer On-peak       ({RATE_SUMMER_ON_CENTS:.2f}c): ${costs['summer_on']:,.2f}")
+    print(f"  Summer Off-peak      ({RATE_SUMMER_OFF_CENTS:.2f}c): ${costs['summer_off']:,.2f}")
+    print(f"  Winter first 600 kWh ({RATE_WINTER_BASE_CENTS:.2f}c): ${costs['winter_base']:,.2f}")
     print(
         f"  Winter over 600 kWh  ({RATE_WINTER_EXCESS_CENTS:.2f}c): "
-        f"${cost_winter_excess:,.2f}"
+        f"${costs['winter_excess']:,.2f}"
     )
     print("-" * 35)
-    print(f"TOTAL VALUE:            ${total_cost:,.2f}")
+    print(f"TOTAL VALUE:            ${costs['total']:,.2f}")
     print("-" * 35)
-    print(f"$/kWh:                  ${price_per_kwh:.4f}")
+    print(f"$/kWh:                  ${costs['price_per_kwh']:.4f}")
+
+
+def print_tariff_valuations(valuations: list[TariffValuation]) -> None:
+    print()
+    print("Tariff Comparison:")
+    for valuation in valuations:
+        print("-" * 60)
+        print(
+            f"{valuation.tariff.name:<32} ${float(valuation.total_value):>12,.2f}"
+            f"   ${float(valuation.price_per_kwh):.4f}/kWh"
+        )
+        for name, monthly_kwh in valuation.bucket_kwh.items():
+            print(
+                f"  {name:<24} {float(monthly_kwh.sum()):>10.0f} kWh"
+                f"   ${float(valuation.bucket_value[name]):>10,.2f}"
+            )
+    print("-" * 60)
+
+
+def analyze_solar_data(
+    series: HourlySeries,
+    annual_kwh: float,
+    debug_dir: str | None = None,
+    tariffs: Sequence[Tariff] = (),
+    debug_cube: Path | None = None,
+    site: dict[str, Any] | None = None,
+) -> None:
+    with stage("decode_timestamps"):
+        decoded = decode_timestamps(series.timestamps)
+    try:
+        with stage("bucketing"):
+            buckets = compute_monthly_buckets(
+                series.timestamps, series.values, annual_kwh, decoded=decoded
+            )
+        valuations = []
+        if tariffs:
+            with stage("tariff_valuation"):
+                valuations = value_series(
+                    series.timestamps, series.values, annual_kwh, tariffs, decoded
+                )
+    except (SolarDataError, TariffError) as exc:
+        print(exc, file=sys.stderr)
+        raise SystemExit(1)
 
+    if debug_dir is not None or debug_cube is not None:
+        day_hours = day_hour_cube(decoded, series.values)
+        year = int(decoded.year[decoded.valid][0])
+        if debug_cube is not None:
+            with stage("debug_cube"), HourlyCubeWriter(debug_cube, 1, NASA_PARAMETER) as writer:
+                writer.write(0, {**(site or {}), "year": year}, day_hours)
+            print(f"Hourly cube written to {debug_cube}\n")
+        if debug_dir is not None:
+            with stage("debug_files"):
+                write_text_dump(day_hours, year, debug_dir)
+
+    with stage("report"):
+        print_report(buckets)
+        if valuations:
+            print_tariff_valuations(valuations)
+
+
+def analyze_bootstrap(
+    series: HourlySeries,
+    annual_kwh: float,
+    tariffs: Sequence[Tariff],
+    samples: int,
+    seed: int,
+) -> None:
+    try:
+        with stage("bootstrap"):
+            result = run_bootstrap(series, annual_kwh, tariffs, samples, seed)
+    except SolarDataError as exc:
+        print(exc, file=sys.stderr)
+        raise SystemExit(1)
+    count("bootstrap_samples", samples)
 
-def main() -> None:
-    args = parse_args()
+    print()
+    with stage("report"):
+        print_bootstrap_report(result)
+
+
+def analyze_battery(series: HourlySeries, annual_kwh: float, args: argparse.Namespace) -> None:
+    try:
+        year, hourly_kwh = hourly_kwh_grid(decode_timestamps(series.timestamps), series.values, annual_kwh)
+        with stage("battery_dispatch"):
+            if args.battery_sweep:
+                result = sweep_dispatch(
+                    hourly_kwh,
+                    year,
+                    args.battery_tariff,
+                    args.battery_capacities,
+                    args.battery_powers,
+                    args.battery_efficiency,
+                )
+            else:
+                capacity, power = args.battery
+                result = simulate_dispatch(
+                    hourly_kwh, year, args.battery_tariff, capacity, power, args.battery_efficiency
+                )
+    except (SolarDataError, TariffError, ValueError) as exc:
+        print(exc, file=sys.stderr)
+        raise SystemExit(1)
+    count("battery_configurations", result.capacity_kwh.size)
+
+    print()
+    with stage("report"):
+        if not args.battery_sweep:
+            print_dispatch_report(result)
+            return
+        cost_per_kwh, cost_per_kw = args.battery_cost or (None, 0.0)
+        print_sizing_report(result, args.battery_top, cost_per_kwh, cost_per_kw)
+    if args.battery_csv is not None:
+        write_sweep_csv(result, args.battery_csv)
+        print(f"All configurations written to {args.battery_csv}")
+
+
+def main(argv: Sequence[str] | None = None, prog: str | None = None) -> None:
+    args = parse_args(argv, prog)
     if args.latitude is None:
         latitude, longitude, annual_kwh = prompt_for_inputs()
     else:
@@ -321,8 +706,65 @@ def main() -> None:
         annual_kwh = args.annual_kwh
 
     assert annual_kwh is not None
-    data = fetch_hourly_nasa_data(latitude, longitude, args.year)
-    analyze_solar_data(data, annual_kwh, args.debug_dir)
+    profiler = start_profiling(args, "power.py")
+    cache = build_cache(args)
+    tiles = build_tiles(args)
+
+    session = LazySession()
+    series_by_year: dict[int, HourlySeries] = {}
+    try:
+        for year in args.years or [args.year]:
+            if args.years:
+                print(f"[{year}] ", end="")
+            series = load_hourly_series(
+                latitude, longitude, year, cache, args.offline, session=session, tiles=tiles
+            )
+            if profiler is not None:
+                fill = int((series.values == FILL_VALUE).sum())
+                count("points_valid", series.values.size - fill)
+                count("points_fill", fill)
+            series_by_year[year] = series
+    except CacheMissError as exc:
+        print(f"Offline mode: {exc}", file=sys.stderr)
+        raise SystemExit(1)
+    except (NasaFetchError, SolarDataError) as exc:
+        print(exc, file=sys.stderr)
+        raise SystemExit(1)
+    finally:
+        session.close()
+
+    if args.years:
+        print()
+        try:
+            with stage("sweep"):
+                sweep = run_sweep(series_by_year, annual_kwh, args.tariffs)
+        except SolarDataError as exc:
+            print(exc, file=sys.stderr)
+            raise SystemExit(1)
+        with stage("report"):
+            print_sweep_report(sweep)
+    else:
+        analyze_solar_data(
+            series_by_year[args.year],
+            annual_kwh,
+            args.debug_dir,
+            args.tariffs,
+            debug_cube=args.debug_cube,
+            site={"latitude": latitude, "longitude": longitude},
+        )
+        if args.bootstrap is not None:
+            analyze_bootstrap(
+                series_by_year[args.year], annual_kwh, args.tariffs, args.bootstrap, args.seed
+            )
+        if args.battery is not None or args.battery_sweep:
+            analyze_battery(series_by_year[args.year], annual_kwh, args)
+    if cache is not None:
+        print()
+        print(cache.stats.summary())
+        count("cache_hits", cache.stats.hits)
+        count("cache_misses", cache.stats.misses)
+        count("cache_writes", cache.stats.writes)
+    finish_profiling(profiler, args.profile)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,486 @@
+#!/usr/bin/env python3
+"""Portfolio batch mode for the solar farm calculator.
+
+Reads sites from a CSV or JSONL file (``latitude``, ``longitude``,
+``annual_kwh`` and optional ``site_id`` / ``year`` columns), fetches irradiance
+concurrently through the async NASA POWER client, analyses each site on a
+process pool and streams one result row per site to a JSONL or CSV file as
+soon as it is ready.  Only a bounded
+window of sites is in flight at any time, so memory stays flat regardless of
+portfolio size.  Failures are written as ``status=error`` rows instead of
+aborting the run.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import csv
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date
+from pathlib import Path
+from typing import Any, Iterator, Sequence, TextIO
+
+import numpy as np
+
+from hourly_store import HourlyCubeWriter
+from irradiance_cache import IrradianceCache
+from irradiance_tiles import TileStore
+from nasa_client import AsyncNasaPowerClient, ClientConfig, ClientStats, load_hourly_series_async
+from power import (
+    NASA_PARAMETER,
+    NASA_POWER_HOURLY_URL,
+    add_cache_arguments,
+    build_cache,
+    build_tiles,
+    validate_cache_arguments,
+)
+from solar_engine import compute_monthly_buckets, day_hour_cube, decode_timestamps, value_buckets
+from tariffs import Tariff, TariffError, compile_tariff, load_tariff, value_series
+
+BUCKETS = ("total_kwh", "summer_on", "summer_off", "winter_base", "winter_excess")
+SUMMARY_FIELDS = [
+    "site_id",
+    "latitude",
+    "longitude",
+    "year",
+    "annual_kwh",
+    "status",
+    "error",
+    "grand_total_kwh",
+    "summer_on_kwh",
+    "summer_off_kwh",
+    "winter_base_kwh",
+    "winter_excess_kwh",
+    "total_value",
+    "price_per_kwh",
+]
+MONTHLY_FIELDS = [f"{bucket}_m{month:02d}" for bucket in BUCKETS for month in range(1, 13)]
+
+
+@dataclass(frozen=True)
+class Site:
+    site_id: str
+    latitude: float
+    longitude: float
+    annual_kwh: float
+    year: int
+
+
+@dataclass
+class BatchSummary:
+    processed: int = 0
+    failed: int = 0
+    errors: dict[str, int] = field(default_factory=dict)
+
+    def record(self, result: dict[str, Any]) -> None:
+        self.processed += 1
+        if result["status"] != "ok":
+            self.failed += 1
+            kind = result["error"].split(":", 1)[0]
+            self.errors[kind] = self.errors.get(kind, 0) + 1
+
+
+def read_sites(path: Path) -> Iterator[tuple[str, dict[str, Any] | ValueError]]:
+    """Yield (site_id, raw row) pairs lazily from a CSV or JSONL file.
+
+    A JSONL line that does not decode to an object is yielded as a ValueError
+    under its line index, so one bad line becomes one error row.
+    """
+    with path.open("r", encoding="utf-8", newline="") as handle:
+        if path.suffix.lower() in {".jsonl", ".ndjson"}:
+            rows: Iterator[dict[str, Any] | ValueError] = (
+                _decode_jsonl_row(line) for line in handle if line.strip()
+            )
+        else:
+            rows = csv.DictReader(handle)
+
+        for index, row in enumerate(rows, start=1):
+            if isinstance(row, ValueError):
+                yield str(index), row
+                continue
+            site_id = str(row.get("site_id") or row.get("id") or index)
+            yield site_id, row
+
+
+def _decode_jsonl_row(line: str) -> dict[str, Any] | ValueError:
+    try:
+        row = json.loads(line)
+    except json.JSONDecodeError as exc:
+        return ValueError(f"invalid JSON ({exc})")
+    if not isinstance(row, dict):
+        return ValueError(f"expected a JSON object, got {type(row).__name__}")
+    return row
+
+
+def parse_site(site_id: str, row: dict[str, Any] | ValueError, default_year: int) -> Site:
+    if isinstance(row, ValueError):
+        raise row
+    try:
+        latitude = float(row["latitude"])
+        longitude = float(row["longitude"])
+        annual_kwh = float(row["annual_kwh"])
+        year = int(row.get("year") or default_year)
+    except KeyError as exc:
+        raise ValueError(f"missing column {exc.args[0]!r}") from exc
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f"non-numeric field ({exc})") from exc
+
+    if not -90 <= latitude <= 90 or not -180 <= longitude <= 180:
+        raise ValueError(f"coordinates out of range ({latitude}, {longitude})")
+    if annual_kwh <= 0:
+        raise ValueError("annual_kwh must be greater than 0")
+    if year < 1981 or year > date.today().year:
+        raise ValueError(f"year {year} outside NASA POWER coverage")
+
+    return Site(site_id, latitude, longitude, annual_kwh, year)
+
+
+def tariff_columns(tariffs: Sequence[Tariff]) -> list[str]:
+    columns = []
+    for tariff in tariffs:
+        slug = re.sub(r"[^0-9a-z]+", "_", tariff.name.lower()).strip("_")
+        columns += [f"{slug}_value", f"{slug}_price_per_kwh"]
+    return columns
+
+
+def analyze_site(
+    site: Site,
+    timestamps: np.ndarray,
+    values: np.ndarray,
+    tariffs: Sequence[Tariff] = (),
+) -> dict[str, Any]:
+    """Process-pool worker: bucket and value one site's hourly series."""
+    decoded = decode_timestamps(timestamps)
+    buckets = compute_monthly_buckets(timestamps, values, site.annual_kwh, decoded=decoded)
+    totals = buckets.totals()
+    costs = value_buckets(buckets)
+
+    result = _site_fields(site)
+    result.update(
+        status="ok",
+        error="",
+        grand_total_kwh=float(buckets.grand_total_kwh),
+        summer_on_kwh=float(totals["summer_on"]),
+        summer_off_kwh=float(totals["summer_off"]),
+        winter_base_kwh=float(totals["winter_base"]),
+        winter_excess_kwh=float(totals["winter_excess"]),
+        total_value=float(costs["total"]),
+        price_per_kwh=float(costs["price_per_kwh"]),
+        monthly={bucket: getattr(buckets, bucket).round(3).tolist() for bucket in BUCKETS},
+    )
+    if tariffs:
+        valuations = value_series(timestamps, values, site.annual_kwh, tariffs, decoded)
+        result["tariffs"] = {
+            valuation.tariff.name: {
+                "total_value": float(valuation.total_value),
+                "price_per_kwh": float(valuation.price_per_kwh),
+                "buckets_kwh": {
+                    name: float(kwh.sum()) for name, kwh in valuation.bucket_kwh.items()
+                },
+            }
+            for valuation in valuations
+        }
+        columns = iter(tariff_columns(tariffs))
+        for valuation in valuations:
+            result[next(columns)] = float(valuation.total_value)
+            result[next(columns)] = float(valuation.price_per_kwh)
+    return result
+
+
+def error_result(
+    site_id: str, row: dict[str, Any] | ValueError | Site, exc: BaseException
+) -> dict[str, Any]:
+    fields = row if isinstance(row, dict) else {}  # an undecodable JSONL line has none
+    result = _site_fields(row) if isinstance(row, Site) else {
+        "site_id": site_id,
+        "latitude": fields.get("latitude"),
+        "longitude": fields.get("longitude"),
+        "year": fields.get("year"),
+        "annual_kwh": fields.get("annual_kwh"),
+    }
+    result.update(status="error", error=f"{type(exc).__name__}: {exc}")
+    return result
+
+
+def _site_fields(site: Site) -> dict[str, Any]:
+    return {
+        "site_id": site.site_id,
+        "latitude": site.latitude,
+        "longitude": site.longitude,
+        "year": site.year,
+        "annual_kwh": site.annual_kwh,
+    }
+
+
+class ResultWriter:
+    """Append results to a JSONL or CSV file, flushing after every row."""
+
+    def __init__(self, path: Path, tariffs: Sequence[Tariff] = ()) -> None:
+        self.path = path
+        self.is_csv = path.suffix.lower() == ".csv"
+        self._handle: TextIO = path.open("w", encoding="utf-8", newline="")
+        self._csv: csv.DictWriter | None = None
+        self._tariff_columns = tariff_columns(tariffs)
+        if self.is_csv:
+            self._csv = csv.DictWriter(
+                self._handle,
+                fieldnames=SUMMARY_FIELDS + self._tariff_columns + MONTHLY_FIELDS,
+                extrasaction="ignore",
+            )
+            self._csv.writeheader()
+
+    def write(self, result: dict[str, Any]) -> None:
+        if self._csv is not None:
+            row = dict(result)
+            for bucket, months in result.get("monthly", {}).items():
+                for month, value in enumerate(months, start=1):
+                    row[f"{bucket}_m{month:02d}"] = value
+            self._csv.writerow(row)
+        else:
+            record = {key: value for key, value in result.items() if key not in self._tariff_columns}
+            self._handle.write(json.dumps(record) + "\n")
+        self._handle.flush()
+
+    def close(self) -> None:
+        self._handle.close()
+
+    def __enter__(self) -> "ResultWriter":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+async def run_batch(
+    rows: Iterator[tuple[str, dict[str, Any] | ValueError]],
+    writer: ResultWriter,
+    *,
+    cache: IrradianceCache | None,
+    offline: bool,
+    default_year: int,
+    client_config: ClientConfig,
+    analysis_workers: int,
+    max_in_flight: int,
+    tariffs: Sequence[Tariff] = (),
+    debug_cube: HourlyCubeWriter | None = None,
+    tiles: TileStore | None = None,
+    progress_every: int = 100,
+) -> tuple[BatchSummary, ClientStats]:
+    summary = BatchSummary()
+    loop = asyncio.get_running_loop()
+    slots = asyncio.Semaphore(max_in_flight)
+
+    def emit(result: dict[str, Any]) -> None:
+        writer.write(result)
+        summary.record(result)
+        if progress_every and summary.processed % progress_every == 0:
+            print(f"Processed {summary.processed} sites ({summary.failed} failed)")
+
+    async with AsyncNasaPowerClient(client_config) as client:
+        with ProcessPoolExecutor(analysis_workers) as analysis_pool:
+
+            async def process(row_index: int, site: Site) -> None:
+                try:
+                    series = await load_hourly_series_async(
+                        client,
+                        site.latitude,
+                        site.longitude,
+                        site.year,
+                        cache,
+                        offline,
+                        tiles=tiles,
+                    )
+                    if debug_cube is not None:
+                        day_hours = day_hour_cube(decode_timestamps(series.timestamps), series.values)
+                        debug_cube.write(row_index, _site_fields(site), day_hours)
+                    result = await loop.run_in_executor(
+                        analysis_pool,
+                        analyze_site,
+                        site,
+                        series.timestamps,
+                        series.values,
+                        tuple(tariffs),
+                    )
+                except Exception as exc:  # recorded per site, never aborts the run
+                    result = error_result(site.site_id, site, exc)
+                finally:
+                    slots.release()
+                emit(result)
+
+            tasks: set[asyncio.Task[None]] = set()
+            for row_index, (site_id, row) in enumerate(rows):
+                try:
+                    site = parse_site(site_id, row, default_year)
+                    # Tariffs were checked against --year; a site's own year gets its own check
+                    for tariff in tariffs:
+                        compile_tariff(tariff, site.year)
+                except ValueError as exc:  # TariffError is a ValueError
+                    emit(error_result(site_id, row, exc))
+                    continue
+                await slots.acquire()
+                task = asyncio.create_task(process(row_index, site))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            await asyncio.gather(*tasks)
+
+    return summary, client.stats
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Value a portfolio of sites from a CSV/JSONL file and stream per-site "
+            "monthly buckets, total value and $/kWh to a JSONL/CSV file."
+        )
+    )
+    parser.add_argument("sites", type=Path, help="CSV or JSONL file of sites")
+    parser.add_argument(
+        "output",
+        type=Path,
+        help="Results file; .csv writes flat rows, anything else writes JSONL",
+    )
+    parser.add_argument(
+        "--year",
+        type=int,
+        default=2023,
+        help="Calendar year for sites without a 'year' column (default: 2023)",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=8,
+        help="Concurrent NASA POWER requests over the shared connection pool (default: 8)",
+    )
+    parser.add_argument(
+        "--rate-limit",
+        type=float,
+        default=None,
+        help="Maximum NASA POWER requests started per second (default: unlimited)",
+    )
+    parser.add_argument(
+        "--max-retries",
+        type=int,
+        default=5,
+        help="Retries per request on 429/5xx or connection errors (default: 5)",
+    )
+    parser.add_argument(
+        "--nasa-url",
+        default=NASA_POWER_HOURLY_URL,
+        help="Hourly point endpoint (override to target a local stub server)",
+    )
+    parser.add_argument(
+        "--debug-cube",
+        type=Path,
+        default=None,
+        metavar="PATH.npy",
+        help="Also write every site's hourly irradiance to a (sites, 366, 24) memory-mapped cube",
+    )
+    parser.add_argument(
+        "--tariff",
+        dest="tariffs",
+        action="append",
+        default=[],
+        metavar="FILE",
+        help="Also value every site against a JSON tariff schedule (repeatable)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Analysis processes (default: CPU count)",
+    )
+    parser.add_argument(
+        "--max-in-flight",
+        type=int,
+        default=None,
+        help="Sites held in memory at once (default: 4 x max(concurrency, workers))",
+    )
+    add_cache_arguments(parser)
+
+    args = parser.parse_args()
+    validate_cache_arguments(parser, args)
+
+    if not args.sites.is_file():
+        parser.error(f"{args.sites} not found.")
+    if args.concurrency < 1 or args.workers < 1:
+        parser.error("--concurrency and --workers must be at least 1.")
+    if args.rate_limit is not None and args.rate_limit <= 0:
+        parser.error("--rate-limit must be greater than 0.")
+    if args.max_retries < 0:
+        parser.error("--max-retries cannot be negative.")
+    if args.max_in_flight is None:
+        args.max_in_flight = 4 * max(args.concurrency, args.workers)
+    if args.max_in_flight < 1:
+        parser.error("--max-in-flight must be at least 1.")
+
+    try:
+        args.tariffs = [load_tariff(path) for path in args.tariffs]
+        for tariff in args.tariffs:
+            compile_tariff(tariff, args.year)
+    except TariffError as exc:
+        parser.error(str(exc))
+
+    return args
+
+
+def main() -> None:
+    args = parse_args()
+    cache = build_cache(args)
+
+    started = time.perf_counter()
+    print(f"Valuing sites from {args.sites} -> {args.output}")
+    debug_cube = None
+    if args.debug_cube is not None:
+        n_sites = sum(1 for _ in read_sites(args.sites))
+        debug_cube = HourlyCubeWriter(args.debug_cube, n_sites, NASA_PARAMETER)
+
+    with ResultWriter(args.output, args.tariffs) as writer:
+        summary, client_stats = asyncio.run(
+            run_batch(
+                read_sites(args.sites),
+                writer,
+                cache=cache,
+                tiles=build_tiles(args),
+                offline=args.offline,
+                default_year=args.year,
+                client_config=ClientConfig(
+                    base_url=args.nasa_url,
+                    concurrency=args.concurrency,
+                    rate_per_second=args.rate_limit,
+                    max_retries=args.max_retries,
+                ),
+                analysis_workers=args.workers,
+                max_in_flight=args.max_in_flight,
+                tariffs=args.tariffs,
+                debug_cube=debug_cube,
+            )
+        )
+    if debug_cube is not None:
+        debug_cube.close()
+        print(f"Hourly cube written to {args.debug_cube}")
+
+    elapsed = time.perf_counter() - started
+    print(
+        f"Done: {summary.processed} sites in {elapsed:.1f}s "
+        f"({summary.processed - summary.failed} ok, {summary.failed} failed)"
+    )
+    for kind, count in sorted(summary.errors.items()):
+        print(f"  {kind}: {count}", file=sys.stderr)
+    print(
+        f"NASA POWER: {client_stats.requests} request(s), {client_stats.retries} retr(ies), "
+        f"{client_stats.deduplicated} deduplicated, "
+        f"{client_stats.bytes_downloaded / 1e6:.1f} MB downloaded"
+    )
+    if cache is not None:
+        print(cache.stats.summary())
+
+
+if __name__ == "__main__":
+    main()
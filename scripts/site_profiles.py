@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+"""Precomputed normalized production profiles per (site, year).
+
+Every bucket ``analyze_solar_data`` prints is linear in ``annual_kwh``; only
+the tier clamps (the 600 kWh winter tier, tariff tiers) act after scaling.
+A profile therefore stores the site-year's irradiance once, normalized by the
+scaling denominator, binned by (month, weekday/weekend, hour of day):
+
+    fractions   float64 (12, 2, 24), sums to 1 less any undecodable hours
+
+Tariff periods select hours by month, hour and day type only, so those 576
+cells are enough to value the default buckets *and* any tariff schedule.  A
+quote for any ``annual_kwh`` (or thousands of them at once) is a scale, a
+gather into month x period slots and the tier clamp, with no hourly data.
+The numbers match ``compute_monthly_buckets`` / ``value_series`` on the
+series the profile was built from.
+
+Profiles are stored per (parameter, year) as two ``.npy`` files memory-mapped
+on read, indexed by rounded coordinates like the irradiance cache:
+
+    <parameter>_<year>.profiles.npy   float64 (sites, 12, 2, 24)
+    <parameter>_<year>.sites.npy      float64 (sites, 4): latitude, longitude,
+                                      valid hours, valid irradiance (Wh/m^2)
+
+    python scripts/site_profiles.py build                   # every cached series
+    python scripts/site_profiles.py quote variants.csv quotes.csv --tariff tou.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Sequence
+
+import numpy as np
+
+from irradiance_cache import DEFAULT_CACHE_DIR, CacheKey, HourlySeries, IrradianceCache
+from solar_engine import (
+    FILL_VALUE,
+    MonthlyBuckets,
+    SolarDataError,
+    day_of_year,
+    decode_timestamps,
+    is_leap_year,
+    scale_to_annual,
+    split_season_buckets,
+    value_buckets,
+)
+from tariffs import Tariff, TariffError, TariffValuation, compile_tariff, value_slot_kwh, year_hours
+
+DEFAULT_PROFILE_DIR = DEFAULT_CACHE_DIR.parent / "profiles"
+PROFILE_SHAPE = (12, 2, 24)  # month, weekend, hour of day
+N_CELLS = 12 * 2 * 24
+
+# (profiles memmap, sites, (latitude, longitude) -> row)
+ProfileTable = tuple[np.ndarray, np.ndarray, dict[tuple[float, float], int]]
+
+
+def cell_index(month: np.ndarray, hour: np.ndarray, weekday: np.ndarray) -> np.ndarray:
+    return ((month - 1) * 2 + (weekday >= 5)) * 24 + hour
+
+
+@dataclass
+class SiteProfile:
+    year: int
+    fractions: np.ndarray  # (12, 2, 24) share of the scaling denominator
+    valid_hours: int
+    valid_irradiance: float  # Wh/m^2 over the valid hours
+
+    @property
+    def monthly_fractions(self) -> np.ndarray:
+        return self.fractions.sum(axis=(1, 2))
+
+    def sunlight(self) -> dict[str, Any]:
+        """Same figures as ``solar_quote.sunlight_summary`` on the source series."""
+        if self.valid_hours == 0:
+            return {"average_sunlight": None, "valid_hours": 0, "coverage": 0.0}
+        hours_in_year = (366 if is_leap_year(self.year) else 365) * 24
+        return {
+            "average_sunlight": self.valid_irradiance / 1000.0 / (self.valid_hours / 24),
+            "valid_hours": self.valid_hours,
+            "coverage": self.valid_hours / hours_in_year,
+        }
+
+
+def build_profile(series: HourlySeries) -> SiteProfile:
+    decoded = decode_timestamps(series.timestamps)
+    masked, ratio = scale_to_annual(series.values, 1.0)
+    years = np.unique(decoded.year[decoded.valid])
+    if years.size != 1:
+        raise SolarDataError(f"Expected a single calendar year, got {years.tolist()}.")
+
+    jan_first = int(np.datetime64(f"{int(years[0])}-01-01", "D").astype(np.int64))
+    weekday = (jan_first + day_of_year(decoded) - 4) % 7  # 1970-01-01 was a Thursday
+    cells = cell_index(decoded.month, decoded.hour, weekday)[decoded.valid]
+    fractions = np.bincount(cells, weights=masked[decoded.valid], minlength=N_CELLS) * float(ratio)
+
+    valid = (series.values != FILL_VALUE) & decoded.valid
+    return SiteProfile(
+        int(years[0]),
+        fractions.reshape(PROFILE_SHAPE),
+        int(valid.sum()),
+        float(series.values[valid].sum()),
+    )
+
+
+@lru_cache(maxsize=64)
+def cell_slots(tariff: Tariff, year: int) -> np.ndarray:
+    """(N_CELLS,) month x period slot of every profile cell under ``tariff``."""
+    compiled = compile_tariff(tariff, year)
+    slots = np.full(N_CELLS, -1, dtype=np.int64)
+    slots[cell_index(*year_hours(year))] = compiled.slot_index
+    slots.setflags(write=False)
+    return slots
+
+
+@dataclass
+class ProfileQuote:
+    annual_kwh: np.ndarray  # (variants,)
+    buckets: MonthlyBuckets  # (variants, 12)
+    costs: dict[str, np.ndarray]  # value_buckets output, (variants,) each
+    valuations: list[TariffValuation]  # (variants,) totals per tariff
+
+
+def quote_profile(
+    profile: SiteProfile, annual_kwh: float | np.ndarray, tariffs: Sequence[Tariff] = ()
+) -> ProfileQuote:
+    """Bucket and value any number of ``annual_kwh`` variants in one pass."""
+    annual_kwh = np.asarray(annual_kwh, dtype=np.float64)
+    scale = annual_kwh[..., np.newaxis]
+    buckets = split_season_buckets(scale * profile.monthly_fractions)
+    if (buckets.grand_total_kwh <= 0).any():
+        raise SolarDataError("Calculated annual production is 0.")
+
+    valuations = []
+    cells = profile.fractions.reshape(-1)
+    for tariff in tariffs:
+        compiled = compile_tariff(tariff, profile.year)
+        slots = np.bincount(
+            cell_slots(tariff, profile.year), weights=cells, minlength=compiled.n_slots
+        )
+        valuations.append(value_slot_kwh(compiled, scale * slots, annual_kwh * cells.sum()))
+    return ProfileQuote(annual_kwh, buckets, value_buckets(buckets), valuations)
+
+
+class SiteProfileStore:
+    """Per-(parameter, year) profile tables with a coordinate index."""
+
+    def __init__(self, root: Path = DEFAULT_PROFILE_DIR) -> None:
+        self.root = Path(root)
+        self._tables: dict[tuple[str, int], ProfileTable] = {}
+        self._lock = threading.Lock()
+
+    def _stem(self, parameter: str, year: int) -> Path:
+        return self.root / f"{parameter}_{year}"
+
+    def _table(self, parameter: str, year: int) -> ProfileTable:
+        with self._lock:
+            table = self._tables.get((parameter, year))
+            if table is None:
+                stem = self._stem(parameter, year)
+                try:
+                    profiles = np.load(f"{stem}.profiles.npy", mmap_mode="r")
+                    sites = np.load(f"{stem}.sites.npy")
+                except FileNotFoundError:
+                    profiles = np.empty((0, *PROFILE_SHAPE))
+                    sites = np.empty((0, 4))
+                coordinates = sites[:, :2].tolist()
+                index = {(lat, lon): row for row, (lat, lon) in enumerate(coordinates)}
+                table = self._tables[(parameter, year)] = (profiles, sites, index)
+            return table
+
+    def get(self, key: CacheKey) -> SiteProfile | None:
+        profiles, sites, index = self._table(key.parameter, key.year)
+        row = index.get((key.latitude, key.longitude))
+        if row is None:
+            return None
+        return SiteProfile(
+            key.year, np.asarray(profiles[row]), int(sites[row, 2]), float(sites[row, 3])
+        )
+
+    def put_many(self, profiles: Sequence[tuple[CacheKey, SiteProfile]]) -> int:
+        """Insert or replace ``(key, profile)`` pairs, rewriting each touched table atomically."""
+        groups: dict[tuple[str, int], list[tuple[CacheKey, SiteProfile]]] = {}
+        for key, profile in profiles:
+            groups.setdefault((key.parameter, key.year), []).append((key, profile))
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        for (parameter, year), group in groups.items():
+            old_profiles, old_sites, index = self._table(parameter, year)
+            rows = dict(index)
+            new_profiles = list(np.asarray(old_profiles))
+            new_sites = list(old_sites)
+            for key, profile in group:
+                record = np.array(
+                    [key.latitude, key.longitude, profile.valid_hours, profile.valid_irradiance]
+                )
+                row = rows.get((key.latitude, key.longitude))
+                if row is None:
+                    rows[(key.latitude, key.longitude)] = len(new_profiles)
+                    new_profiles.append(profile.fractions)
+                    new_sites.append(record)
+                else:
+                    new_profiles[row] = profile.fractions
+                    new_sites[row] = record
+
+            stem = self._stem(parameter, year)
+            suffix = f".{os.getpid()}.{threading.get_ident()}.partial"
+            tables = (("profiles", np.stack(new_profiles)), ("sites", np.stack(new_sites)))
+            for name, array in tables:
+                tmp_path = Path(f"{stem}.{name}.npy{suffix}")
+                with tmp_path.open("wb") as handle:
+                    np.save(handle, array)
+                os.replace(tmp_path, f"{stem}.{name}.npy")
+            with self._lock:
+                self._tables.pop((parameter, year), None)
+        return len(profiles)
+
+
+def build_from_cache(cache: IrradianceCache, store: SiteProfileStore) -> tuple[int, list[str]]:
+    """Profile every cached series; returns (profiles written, failures)."""
+    profiles = []
+    failures = []
+    for path, _ in sorted(cache.entries()):
+        key = CacheKey.from_filename(path.name)
+        if key is None:
+            continue
+        series = cache.get(key)
+        if series is None:
+            continue
+        try:
+            profiles.append((key, build_profile(series)))
+        except SolarDataError as exc:
+            failures.append(f"{path.name}: {exc}")
+    return store.put_many(profiles), failures
+
+
+QUOTE_FIELDS = [
+    "site_id",
+    "latitude",
+    "longitude",
+    "year",
+    "annual_kwh",
+    "status",
+    "error",
+    "grand_total_kwh",
+    "summer_on_kwh",
+    "summer_off_kwh",
+    "winter_base_kwh",
+    "winter_excess_kwh",
+    "total_value",
+    "price_per_kwh",
+]
+
+
+def quote_file(
+    sites_path: Path,
+    output: Path,
+    store: SiteProfileStore,
+    default_year: int,
+    tariffs: Sequence[Tariff] = (),
+) -> tuple[int, int]:
+    """Quote every row of a power_batch-style sites file; returns (rows, failed)."""
+    from power import NASA_PARAMETER
+    from power_batch import parse_site, read_sites, tariff_columns
+
+    rows: list[dict[str, Any]] = []
+    groups: dict[CacheKey, list[int]] = {}
+    for site_id, raw in read_sites(sites_path):
+        result: dict[str, Any] = {"site_id": site_id}
+        if isinstance(raw, dict):  # read_sites yields a ValueError for an undecodable line
+            result.update((name, raw.get(name)) for name in QUOTE_FIELDS[1:5])
+        try:
+            site = parse_site(site_id, raw, default_year)
+        except ValueError as exc:
+            result.update(status="error", error=f"ValueError: {exc}")
+        else:
+            result.update(
+                latitude=site.latitude,
+                longitude=site.longitude,
+                year=site.year,
+                annual_kwh=site.annual_kwh,
+            )
+            key = CacheKey.build(site.latitude, site.longitude, site.year, NASA_PARAMETER)
+            groups.setdefault(key, []).append(len(rows))
+        rows.append(result)
+
+    columns = tariff_columns(tariffs)
+    for key, members in groups.items():
+        profile = store.get(key)
+        try:
+            if profile is None:
+                raise LookupError(f"no profile for {key.latitude}, {key.longitude} in {key.year}")
+            quote = quote_profile(profile, [rows[row]["annual_kwh"] for row in members], tariffs)
+        except (LookupError, SolarDataError, TariffError) as exc:
+            for row in members:
+                rows[row].update(status="error", error=f"{type(exc).__name__}: {exc}")
+            continue
+
+        totals = quote.buckets.totals()
+        for position, row in enumerate(members):
+            rows[row].update(
+                status="ok",
+                error="",
+                grand_total_kwh=float(quote.buckets.grand_total_kwh[position]),
+                summer_on_kwh=float(totals["summer_on"][position]),
+                summer_off_kwh=float(totals["summer_off"][position]),
+                winter_base_kwh=float(totals["winter_base"][position]),
+                winter_excess_kwh=float(totals["winter_excess"][position]),
+                total_value=float(quote.costs["total"][position]),
+                price_per_kwh=float(quote.costs["price_per_kwh"][position]),
+            )
+            names = iter(columns)
+            for valuation in quote.valuations:
+                rows[row][next(names)] = float(valuation.total_value[position])
+                rows[row][next(names)] = float(valuation.price_per_kwh[position])
+
+    with output.open("w", encoding="utf-8", newline="") as handle:
+        writer = csv.DictWriter(handle, fieldnames=QUOTE_FIELDS + columns, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(rows)
+    return len(rows), sum(row.get("status") != "ok" for row in rows)
+
+
+def main() -> None:
+    from power import add_cache_arguments
+    from tariffs import load_tariff
+
+    parser = argparse.ArgumentParser(
+        description="Build and query normalized per-site production profiles."
+    )
+    parser.add_argument(
+        "--profiles-dir",
+        type=Path,
+        default=DEFAULT_PROFILE_DIR,
+        help=f"Profile store (default: {DEFAULT_PROFILE_DIR})",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="Profile every series in the irradiance cache")
+    add_cache_arguments(build)
+
+    quote = commands.add_parser(
+        "quote", help="Quote a CSV/JSONL file of site variants from profiles"
+    )
+    quote.add_argument(
+        "sites",
+        type=Path,
+        help="CSV or JSONL with latitude, longitude, annual_kwh[, year, site_id]",
+    )
+    quote.add_argument("output", type=Path, help="Results CSV")
+    quote.add_argument(
+        "--year",
+        type=int,
+        default=2023,
+        help="Calendar year for rows without a 'year' column (default: 2023)",
+    )
+    quote.add_argument(
+        "--tariff",
+        dest="tariffs",
+        action="append",
+        default=[],
+        metavar="FILE",
+        help="Also value every row against a JSON tariff schedule (repeatable)",
+    )
+
+    args = parser.parse_args()
+    store = SiteProfileStore(args.profiles_dir)
+    started = time.perf_counter()
+
+    if args.command == "build":
+        if args.no_cache:
+            parser.error("build reads the irradiance cache; drop --no-cache.")
+        cache = IrradianceCache(Path(args.cache_dir), int(args.cache_max_mb * 1024 * 1024))
+        written, failures = build_from_cache(cache, store)
+        for failure in failures:
+            print(f"  skipped {failure}", file=sys.stderr)
+        print(
+            f"Built {written} profile(s) from {cache.root} -> {store.root} "
+            f"in {time.perf_counter() - started:.1f}s"
+        )
+        return
+
+    if not args.sites.is_file():
+        parser.error(f"{args.sites} not found.")
+    try:
+        tariffs = [load_tariff(path) for path in args.tariffs]
+    except TariffError as exc:
+        parser.error(str(exc))
+    total, failed = quote_file(args.sites, args.output, store, args.year, tariffs)
+    print(
+        f"Quoted {total} row(s) in {time.perf_counter() - started:.2f}s "
+        f"({total - failed} ok, {failed} failed) -> {args.output}"
+    )
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Importable per-site solar quote: sunlight, monthly buckets and value as JSON.
+
+The same numbers ``power.py`` prints, returned as plain dicts so callers
+(``solar_service.py``, notebooks, other scripts) can serialise them without
+spawning the CLI::
+
+    from solar_quote import quote_site
+    quote = quote_site(40.5, -111.9, 10_000, year=2023)
+    quote["sunlight"]["average_sunlight"], quote["value"]["price_per_kwh"]
+
+``average_sunlight`` is peak sun hours per day (kWh/m^2/day), the figure
+``getSunlightHoursAndCertificates`` reads from the geo-stats endpoint.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Sequence
+
+import numpy as np
+
+from irradiance_cache import HourlySeries, IrradianceCache
+from irradiance_tiles import TileStore
+from power import load_hourly_series
+from site_profiles import SiteProfile, build_profile, quote_profile
+from solar_engine import FILL_VALUE, MONTH_NAMES, decode_timestamps, is_leap_year
+from tariffs import Tariff
+
+BUCKETS = ("total_kwh", "summer_on", "summer_off", "winter_base", "winter_excess")
+
+
+def sunlight_summary(series: HourlySeries) -> dict[str, Any]:
+    decoded = decode_timestamps(series.timestamps)
+    valid = (series.values != FILL_VALUE) & decoded.valid
+    valid_hours = int(valid.sum())
+    if valid_hours == 0:
+        return {"average_sunlight": None, "valid_hours": 0, "coverage": 0.0}
+
+    year = int(decoded.year[decoded.valid][0])
+    hours_in_year = (366 if is_leap_year(year) else 365) * 24
+    daily_kwh_m2 = float(series.values[valid].sum()) / 1000.0 / (valid_hours / 24)
+    return {
+        "average_sunlight": daily_kwh_m2,
+        "valid_hours": valid_hours,
+        "coverage": valid_hours / hours_in_year,
+    }
+
+
+def quote_series(
+    series: HourlySeries, annual_kwh: float, tariffs: Sequence[Tariff] = ()
+) -> dict[str, Any]:
+    """Bucket and value one site's series; raises SolarDataError like the CLI."""
+    return quote_from_profile(build_profile(series), annual_kwh, tariffs)
+
+
+def quote_from_profile(
+    profile: SiteProfile, annual_kwh: float, tariffs: Sequence[Tariff] = ()
+) -> dict[str, Any]:
+    """``quote_series`` from a precomputed profile (see site_profiles.py)."""
+    quoted = quote_profile(profile, annual_kwh, tariffs)
+    buckets = quoted.buckets
+    totals = buckets.totals()
+
+    quote: dict[str, Any] = {
+        "sunlight": profile.sunlight(),
+        "annual_kwh": float(buckets.grand_total_kwh),
+        "buckets": {name: float(kwh) for name, kwh in totals.items()},
+        "value": {name: float(amount) for name, amount in quoted.costs.items()},
+        "monthly": {
+            "month": [MONTH_NAMES[month] for month in range(1, 13)],
+            **{bucket: np.round(getattr(buckets, bucket), 3).tolist() for bucket in BUCKETS},
+        },
+    }
+    if tariffs:
+        quote["tariffs"] = {
+            valuation.tariff.name: {
+                "total_value": float(valuation.total_value),
+                "price_per_kwh": float(valuation.price_per_kwh),
+                "buckets": {
+                    name: float(amount) for name, amount in valuation.bucket_value.items()
+                },
+            }
+            for valuation in quoted.valuations
+        }
+    return quote
+
+
+def quote_site(
+    latitude: float,
+    longitude: float,
+    annual_kwh: float,
+    year: int = 2023,
+    tariffs: Sequence[Tariff] = (),
+    cache: IrradianceCache | None = None,
+    tiles: TileStore | None = None,
+    offline: bool = False,
+) -> dict[str, Any]:
+    """Load (tiles, cache, then NASA POWER) and quote one site."""
+    series = load_hourly_series(
+        latitude, longitude, year, cache, offline, verbose=False, tiles=tiles
+    )
+    quote = quote_series(series, annual_kwh, tariffs)
+    quote["site"] = {"latitude": latitude, "longitude": longitude, "year": year}
+    return quote
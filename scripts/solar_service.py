@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""Local HTTP service answering solar quotes from a warm in-memory cache.
+
+Quote routes can call this instead of spawning ``power.py``: hourly series
+stay in memory (LRU) after the first request, backed by the regional tiles,
+the on-disk irradiance cache and finally NASA POWER with the pooled async
+client.  Every response is JSON::
+
+    GET /sunlight?latitude=40.5&longitude=-111.9[&year=2023]
+    GET /quote?latitude=40.5&longitude=-111.9&annual_kwh=10000[&year=2023][&tariff=NAME...]
+    GET /health
+
+Errors come back as ``{"error": ...}`` with 400 (bad query), 404 (offline
+miss), 422 (unusable NASA data) or 502 (NASA POWER unreachable).
+
+    python scripts/solar_service.py --port 8787 --tiles ~/.cache/glow-power/tiles
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from datetime import date
+from typing import Any
+
+from aiohttp import web
+
+from irradiance_cache import CacheKey, CacheMissError, HourlySeries, IrradianceCache
+from irradiance_tiles import TileStore
+from nasa_client import AsyncNasaPowerClient, ClientConfig, load_hourly_series_async
+from power import (
+    NASA_PARAMETER,
+    NASA_POWER_HOURLY_URL,
+    NasaFetchError,
+    add_cache_arguments,
+    build_cache,
+    build_tiles,
+    validate_cache_arguments,
+)
+from solar_engine import SolarDataError
+from solar_quote import quote_series, sunlight_summary
+from tariffs import Tariff, TariffError, compile_tariff, load_tariff
+
+DEFAULT_MEMORY_ENTRIES = 2048
+
+
+@dataclass
+class MemoryStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+
+@dataclass
+class SeriesMemoryCache:
+    """Bounded LRU of parsed hourly series keyed like the on-disk cache."""
+
+    max_entries: int = DEFAULT_MEMORY_ENTRIES
+    stats: MemoryStats = field(default_factory=MemoryStats)
+
+    def __post_init__(self) -> None:
+        self._entries: OrderedDict[CacheKey, HourlySeries] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: CacheKey) -> HourlySeries | None:
+        series = self._entries.get(key)
+        if series is None:
+            self.stats.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return series
+
+    def put(self, key: CacheKey, series: HourlySeries) -> None:
+        self._entries[key] = series
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+
+@dataclass
+class QuoteService:
+    client: AsyncNasaPowerClient
+    cache: IrradianceCache | None
+    tiles: TileStore | None
+    tariffs: dict[str, Tariff]
+    default_year: int
+    offline: bool = False
+    memory: SeriesMemoryCache = field(default_factory=SeriesMemoryCache)
+
+    async def series(self, latitude: float, longitude: float, year: int) -> HourlySeries:
+        key = CacheKey.build(latitude, longitude, year, NASA_PARAMETER)
+        series = self.memory.get(key)
+        if series is None:
+            series = await load_hourly_series_async(
+                self.client, latitude, longitude, year, self.cache, self.offline, tiles=self.tiles
+            )
+            self.memory.put(key, series)
+        return series
+
+    async def sunlight(self, latitude: float, longitude: float, year: int) -> dict[str, Any]:
+        summary = sunlight_summary(await self.series(latitude, longitude, year))
+        summary["site"] = {"latitude": latitude, "longitude": longitude, "year": year}
+        return summary
+
+    async def quote(
+        self,
+        latitude: float,
+        longitude: float,
+        annual_kwh: float,
+        year: int,
+        tariff_names: list[str],
+    ) -> dict[str, Any]:
+        series = await self.series(latitude, longitude, year)
+        tariffs = [self.tariffs[name] for name in tariff_names]
+        quote = quote_series(series, annual_kwh, tariffs)
+        quote["site"] = {"latitude": latitude, "longitude": longitude, "year": year}
+        return quote
+
+
+class QueryError(ValueError):
+    """Raised for missing or malformed query parameters (HTTP 400)."""
+
+
+def _float_param(request: web.Request, name: str, low: float, high: float) -> float:
+    raw = request.query.get(name)
+    if raw is None:
+        raise QueryError(f"missing query parameter {name!r}")
+    try:
+        value = float(raw)
+    except ValueError:
+        raise QueryError(f"{name} must be a number") from None
+    if not math.isfinite(value) or not low <= value <= high:
+        raise QueryError(f"{name} must be between {low:g} and {high:g}")
+    return value
+
+
+def _site_params(request: web.Request, service: QuoteService) -> tuple[float, float, int]:
+    latitude = _float_param(request, "latitude", -90, 90)
+    longitude = _float_param(request, "longitude", -180, 180)
+    year = service.default_year
+    if "year" in request.query:
+        year = int(_float_param(request, "year", 1981, date.today().year))
+    return latitude, longitude, year
+
+
+async def _respond(coro: Any) -> web.Response:
+    try:
+        return web.json_response(await coro)
+    except QueryError as exc:
+        status, message = 400, str(exc)
+    except CacheMissError as exc:
+        status, message = 404, f"Offline mode: {exc}"
+    except SolarDataError as exc:
+        status, message = 422, str(exc)
+    except NasaFetchError as exc:
+        status, message = 502, str(exc)
+    return web.json_response({"error": message}, status=status)
+
+
+async def handle_sunlight(request: web.Request) -> web.Response:
+    service: QuoteService = request.app["service"]
+
+    async def run() -> dict[str, Any]:
+        return await service.sunlight(*_site_params(request, service))
+
+    return await _respond(run())
+
+
+async def handle_quote(request: web.Request) -> web.Response:
+    service: QuoteService = request.app["service"]
+
+    async def run() -> dict[str, Any]:
+        latitude, longitude, year = _site_params(request, service)
+        annual_kwh = _float_param(request, "annual_kwh", 0, math.inf)
+        if annual_kwh <= 0:
+            raise QueryError("annual_kwh must be greater than 0")
+        tariff_names = request.query.getall("tariff", [])
+        unknown = [name for name in tariff_names if name not in service.tariffs]
+        if unknown:
+            raise QueryError(f"unknown tariff(s): {', '.join(unknown)}")
+        try:
+            for name in tariff_names:
+                compile_tariff(service.tariffs[name], year)
+        except TariffError as exc:
+            raise QueryError(str(exc)) from None
+        return await service.quote(latitude, longitude, annual_kwh, year, tariff_names)
+
+    return await _respond(run())
+
+
+async def handle_health(request: web.Request) -> web.Response:
+    service: QuoteService = request.app["service"]
+    return web.json_response(
+        {
+            "status": "ok",
+            "uptime_s": round(time.monotonic() - request.app["started"], 1),
+            "memory_entries": len(service.memory),
+            "memory": asdict(service.memory.stats),
+            "nasa": asdict(service.client.stats),
+            "tariffs": sorted(service.tariffs),
+        }
+    )
+
+
+def build_app(
+    client_config: ClientConfig,
+    cache: IrradianceCache | None,
+    tiles: TileStore | None,
+    tariffs: list[Tariff],
+    default_year: int,
+    offline: bool = False,
+    memory_entries: int = DEFAULT_MEMORY_ENTRIES,
+) -> web.Application:
+    app = web.Application()
+
+    async def lifecycle(app: web.Application):
+        async with AsyncNasaPowerClient(client_config) as client:
+            app["service"] = QuoteService(
+                client,
+                cache,
+                tiles,
+                {tariff.name: tariff for tariff in tariffs},
+                default_year,
+                offline,
+                SeriesMemoryCache(memory_entries),
+            )
+            app["started"] = time.monotonic()
+            yield
+
+    app.cleanup_ctx.append(lifecycle)
+    app.router.add_get("/sunlight", handle_sunlight)
+    app.router.add_get("/quote", handle_quote)
+    app.router.add_get("/health", handle_health)
+    return app
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Serve per-site sunlight, monthly buckets and tariff value as JSON."
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Bind address (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8787, help="Port (default: 8787)")
+    parser.add_argument(
+        "--year",
+        type=int,
+        default=2023,
+        help="Calendar year when a request does not pass one (default: 2023)",
+    )
+    parser.add_argument(
+        "--tariff",
+        dest="tariffs",
+        action="append",
+        default=[],
+        metavar="FILE",
+        help="JSON tariff schedule selectable with ?tariff=NAME (repeatable)",
+    )
+    parser.add_argument(
+        "--memory-entries",
+        type=int,
+        default=DEFAULT_MEMORY_ENTRIES,
+        help=f"Hourly series kept in memory (default: {DEFAULT_MEMORY_ENTRIES})",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=8,
+        help="Concurrent NASA POWER requests (default: 8)",
+    )
+    parser.add_argument(
+        "--nasa-url",
+        default=NASA_POWER_HOURLY_URL,
+        help="Hourly point endpoint (override to target a local stub server)",
+    )
+    add_cache_arguments(parser)
+
+    args = parser.parse_args()
+    validate_cache_arguments(parser, args)
+    if args.memory_entries < 1 or args.concurrency < 1:
+        parser.error("--memory-entries and --concurrency must be at least 1.")
+
+    try:
+        args.tariffs = [load_tariff(path) for path in args.tariffs]
+        for tariff in args.tariffs:
+            compile_tariff(tariff, args.year)
+    except TariffError as exc:
+        parser.error(str(exc))
+    return args
+
+
+def main() -> None:
+    args = parse_args()
+    app = build_app(
+        ClientConfig(base_url=args.nasa_url, concurrency=args.concurrency),
+        build_cache(args),
+        build_tiles(args),
+        args.tariffs,
+        args.year,
+        args.offline,
+        args.memory_entries,
+    )
+    web.run_app(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,460 @@
+"""Declarative tariff schedules compiled to per-hour slot vectors.
+
+A tariff is a list of periods.  Each period selects hours by month, hour of
+day and day type, and prices the energy it receives either flat or through
+monthly tiers.  The first period that matches an hour owns it; every hour of
+the year must be owned by some period.  Example schedule::
+
+    {
+      "name": "Example TOU",
+      "fuel_adjustment_cents": 3.85,
+      "periods": [
+        {"name": "summer_on", "months": [6, 7, 8, 9], "hours": [[14, 20]],
+         "days": "weekdays", "rate_cents": 27.5},
+        {"name": "summer_off", "months": [6, 7, 8, 9, 10], "rate_cents": 3.6},
+        {"name": "winter", "months": [1, 2, 3, 4, 5, 11, 12], "tiers": [
+          {"name": "winter_base", "up_to_kwh": 600, "rate_cents": 6.9},
+          {"name": "winter_excess", "rate_cents": 4.45}
+        ]}
+      ]
+    }
+
+``hours`` are half-open ``[start, end)`` ranges in local solar hours (the
+NASA POWER time base) and default to the whole day; ``days`` is ``all``
+(default), ``weekdays`` or ``weekends``.  The fuel adjustment is added to
+every rate.
+
+Compiling a tariff for a calendar year yields a slot index per hour of the
+year (slot = month x period), cached per (tariff, year).  Valuing hourly
+production is then one matrix product into monthly slot energy followed by a
+vectorised tier clamp, and several tariffs are valued with a single product
+against their concatenated slot matrices.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Sequence
+
+import numpy as np
+
+from solar_engine import (
+    BASE_SUMMER_OFF_CENTS,
+    BASE_SUMMER_ON_CENTS,
+    BASE_WINTER_BASE_CENTS,
+    BASE_WINTER_EXCESS_CENTS,
+    FUEL_ADJ_CENTS,
+    SUMMER_MONTHS,
+    SUMMER_OFF_PEAK_MONTH,
+    WINTER_TIER_KWH,
+    DecodedTimestamps,
+    day_of_year,
+    decode_timestamps,
+    is_leap_year,
+    scale_to_annual,
+)
+
+DAY_TYPES = {"all", "weekdays", "weekends"}
+
+
+class TariffError(ValueError):
+    """Raised for malformed tariff schedules."""
+
+
+@dataclass(frozen=True)
+class Tier:
+    name: str
+    rate_cents: float
+    up_to_kwh: float | None = None  # cumulative monthly kWh; None = unbounded
+
+
+@dataclass(frozen=True)
+class Period:
+    name: str
+    months: tuple[int, ...]
+    hours: tuple[tuple[int, int], ...]
+    days: str
+    tiers: tuple[Tier, ...]
+
+    def matches(self, month: np.ndarray, hour: np.ndarray, weekday: np.ndarray) -> np.ndarray:
+        selected = np.isin(month, self.months)
+        in_hours = np.zeros_like(selected)
+        for start, end in self.hours:
+            in_hours |= (hour >= start) & (hour < end)
+        selected &= in_hours
+        if self.days == "weekdays":
+            selected &= weekday < 5
+        elif self.days == "weekends":
+            selected &= weekday >= 5
+        return selected
+
+
+@dataclass(frozen=True)
+class Tariff:
+    name: str
+    periods: tuple[Period, ...]
+    fuel_adjustment_cents: float = 0.0
+
+    @property
+    def bucket_names(self) -> tuple[str, ...]:
+        return tuple(tier.name for period in self.periods for tier in period.tiers)
+
+    @classmethod
+    def from_dict(cls, spec: dict[str, Any]) -> "Tariff":
+        if not isinstance(spec, dict):
+            raise TariffError(f"tariff must be an object, got {type(spec).__name__}")
+        try:
+            name = str(spec["name"])
+            raw_periods = spec["periods"]
+        except KeyError as exc:
+            raise TariffError(f"tariff is missing {exc.args[0]!r}") from exc
+        if not isinstance(raw_periods, list):
+            raise TariffError(f"tariff {name!r}: periods must be a list")
+        if not raw_periods:
+            raise TariffError(f"tariff {name!r} has no periods")
+
+        periods = tuple(_parse_period(name, raw) for raw in raw_periods)
+        buckets = [tier.name for period in periods for tier in period.tiers]
+        if len(set(buckets)) != len(buckets):
+            raise TariffError(f"tariff {name!r} reuses a period/tier name")
+
+        try:
+            fuel_adjustment = float(spec.get("fuel_adjustment_cents", 0.0))
+        except (TypeError, ValueError) as exc:
+            raise TariffError(f"tariff {name!r}: non-numeric fuel_adjustment_cents") from exc
+        return cls(name, periods, fuel_adjustment)
+
+
+def _parse_period(tariff_name: str, raw: dict[str, Any]) -> Period:
+    if not isinstance(raw, dict):
+        raise TariffError(
+            f"tariff {tariff_name!r}: each period must be an object, got {type(raw).__name__}"
+        )
+    where = f"tariff {tariff_name!r} period {raw.get('name', '?')!r}"
+    try:
+        name = str(raw["name"])
+    except KeyError as exc:
+        raise TariffError(f"{where}: missing 'name'") from exc
+
+    try:
+        months = tuple(int(month) for month in raw.get("months", range(1, 13)))
+    except (TypeError, ValueError) as exc:
+        raise TariffError(f"{where}: months must be a list of integers") from exc
+    if not months or any(month < 1 or month > 12 for month in months):
+        raise TariffError(f"{where}: months must be within 1-12")
+
+    try:
+        hours = tuple((int(start), int(end)) for start, end in raw.get("hours", [(0, 24)]))
+    except (TypeError, ValueError) as exc:
+        raise TariffError(f"{where}: hours must be a list of [start, end] integer pairs") from exc
+    if any(not 0 <= start < end <= 24 for start, end in hours):
+        raise TariffError(f"{where}: hour ranges must satisfy 0 <= start < end <= 24")
+
+    days = raw.get("days", "all")
+    if not isinstance(days, str) or days not in DAY_TYPES:
+        raise TariffError(f"{where}: days must be one of {sorted(DAY_TYPES)}")
+
+    if "tiers" in raw:
+        if not isinstance(raw["tiers"], list) or not raw["tiers"]:
+            raise TariffError(f"{where}: tiers must be a non-empty list")
+        tiers = tuple(
+            _parse_tier(where, name, index, tier) for index, tier in enumerate(raw["tiers"])
+        )
+    elif "rate_cents" in raw:
+        try:
+            tiers = (Tier(name, float(raw["rate_cents"])),)
+        except (TypeError, ValueError) as exc:
+            raise TariffError(f"{where}: non-numeric rate_cents") from exc
+    else:
+        raise TariffError(f"{where}: needs 'rate_cents' or 'tiers'")
+
+    limits = [tier.up_to_kwh for tier in tiers]
+    if limits[-1] is not None or any(limit is None for limit in limits[:-1]):
+        raise TariffError(f"{where}: only the last tier may (and must) be unbounded")
+    bounded = [limit for limit in limits if limit is not None]
+    if any(b <= a for a, b in zip([0.0] + bounded, bounded)):
+        raise TariffError(f"{where}: tier limits must be positive and increasing")
+
+    return Period(name, months, hours, days, tiers)
+
+
+def _parse_tier(where: str, period_name: str, index: int, raw: dict[str, Any]) -> Tier:
+    label = f"{where} tier {index + 1}"
+    if not isinstance(raw, dict):
+        raise TariffError(f"{label}: must be an object, got {type(raw).__name__}")
+    try:
+        rate_cents = float(raw["rate_cents"])
+        up_to_kwh = None if raw.get("up_to_kwh") is None else float(raw["up_to_kwh"])
+    except KeyError as exc:
+        raise TariffError(f"{label}: missing {exc.args[0]!r}") from exc
+    except (TypeError, ValueError) as exc:
+        raise TariffError(f"{label}: non-numeric rate_cents or up_to_kwh") from exc
+    return Tier(str(raw.get("name", f"{period_name}_tier{index + 1}")), rate_cents, up_to_kwh)
+
+
+def load_tariff(path: str | Path) -> Tariff:
+    try:
+        spec = json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError) as exc:
+        raise TariffError(f"cannot read tariff {path}: {exc}") from exc
+    return Tariff.from_dict(spec)
+
+
+# The schedule power.py has always used: the whole summer is valued on-peak
+# (battery shifted), October off-peak, winter split at 600 kWh per month.
+DEFAULT_TARIFF = Tariff.from_dict(
+    {
+        "name": "Default (battery shifted)",
+        "fuel_adjustment_cents": FUEL_ADJ_CENTS,
+        "periods": [
+            {
+                "name": "summer_on",
+                "months": sorted(SUMMER_MONTHS - {SUMMER_OFF_PEAK_MONTH}),
+                "rate_cents": BASE_SUMMER_ON_CENTS,
+            },
+            {
+                "name": "summer_off",
+                "months": [SUMMER_OFF_PEAK_MONTH],
+                "rate_cents": BASE_SUMMER_OFF_CENTS,
+            },
+            {
+                "name": "winter",
+                "months": sorted(set(range(1, 13)) - SUMMER_MONTHS),
+                "tiers": [
+                    {
+                        "name": "winter_base",
+                        "up_to_kwh": WINTER_TIER_KWH,
+                        "rate_cents": BASE_WINTER_BASE_CENTS,
+                    },
+                    {
+                        "name": "winter_excess",
+                        "rate_cents": BASE_WINTER_EXCESS_CENTS,
+                    },
+                ],
+            },
+        ],
+    }
+)
+
+
+# The same rates without the battery assumption: summer on-peak only applies in
+# the weekday 14:00-20:00 window.  battery.py dispatches into that window.
+DEFAULT_TOU_TARIFF = Tariff.from_dict(
+    {
+        "name": "Default TOU",
+        "fuel_adjustment_cents": FUEL_ADJ_CENTS,
+        "periods": [
+            {
+                "name": "summer_on",
+                "months": sorted(SUMMER_MONTHS - {SUMMER_OFF_PEAK_MONTH}),
+                "hours": [[14, 20]],
+                "days": "weekdays",
+                "rate_cents": BASE_SUMMER_ON_CENTS,
+            },
+            {
+                "name": "summer_off",
+                "months": sorted(SUMMER_MONTHS),
+                "rate_cents": BASE_SUMMER_OFF_CENTS,
+            },
+            {
+                "name": "winter",
+                "months": sorted(set(range(1, 13)) - SUMMER_MONTHS),
+                "tiers": [
+                    {
+                        "name": "winter_base",
+                        "up_to_kwh": WINTER_TIER_KWH,
+                        "rate_cents": BASE_WINTER_BASE_CENTS,
+                    },
+                    {
+                        "name": "winter_excess",
+                        "rate_cents": BASE_WINTER_EXCESS_CENTS,
+                    },
+                ],
+            },
+        ],
+    }
+)
+
+
+def year_hours(year: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Month (1-12), hour (0-23) and weekday (Mon=0) for every hour of ``year``."""
+    days = np.arange(
+        np.datetime64(f"{year}-01-01"), np.datetime64(f"{year + 1}-01-01"), dtype="datetime64[D]"
+    )
+    months = (days.astype("datetime64[M]").astype(np.int64) % 12) + 1
+    weekdays = (days.astype(np.int64) - 4) % 7  # 1970-01-01 was a Thursday
+    return (
+        np.repeat(months, 24),
+        np.tile(np.arange(24), days.size),
+        np.repeat(weekdays, 24),
+    )
+
+
+@dataclass(frozen=True, eq=False)
+class CompiledTariff:
+    tariff: Tariff
+    year: int
+    slot_index: np.ndarray  # (hours,) month * n_periods + period
+    tier_lower: np.ndarray  # (n_periods, max_tiers) cumulative kWh where each tier starts
+    tier_upper: np.ndarray  # (n_periods, max_tiers), inf for the open tier / padding
+    tier_rates: np.ndarray  # (n_periods, max_tiers) cents incl. fuel adjustment, 0 padding
+    tier_valid: np.ndarray  # (n_periods, max_tiers) bool
+
+    @property
+    def n_slots(self) -> int:
+        return 12 * len(self.tariff.periods)
+
+    @property
+    def rate_vector(self) -> np.ndarray:
+        """First-tier rate (cents/kWh) for every hour of the year."""
+        return self.tier_rates[self.slot_index % len(self.tariff.periods), 0]
+
+    def slot_matrix(self) -> np.ndarray:
+        matrix = np.zeros((self.slot_index.size, self.n_slots))
+        matrix[np.arange(self.slot_index.size), self.slot_index] = 1.0
+        return matrix
+
+
+@lru_cache(maxsize=64)
+def compile_tariff(tariff: Tariff, year: int) -> CompiledTariff:
+    month, hour, weekday = year_hours(year)
+    period_index = np.full(month.size, -1, dtype=np.int64)
+    for index, period in enumerate(tariff.periods):
+        period_index[(period_index < 0) & period.matches(month, hour, weekday)] = index
+
+    if (period_index < 0).any():
+        first = int(np.flatnonzero(period_index < 0)[0])
+        raise TariffError(
+            f"tariff {tariff.name!r} does not cover month {month[first]} hour {hour[first]}"
+        )
+
+    n_periods = len(tariff.periods)
+    max_tiers = max(len(period.tiers) for period in tariff.periods)
+    lower = np.zeros((n_periods, max_tiers))
+    upper = np.full((n_periods, max_tiers), np.inf)
+    rates = np.zeros((n_periods, max_tiers))
+    valid = np.zeros((n_periods, max_tiers), dtype=bool)
+    for p, period in enumerate(tariff.periods):
+        start = 0.0
+        for t, tier in enumerate(period.tiers):
+            lower[p, t] = start
+            if tier.up_to_kwh is not None:
+                upper[p, t] = start = tier.up_to_kwh
+            rates[p, t] = tier.rate_cents + tariff.fuel_adjustment_cents
+            valid[p, t] = True
+
+    slot_index = (month - 1) * n_periods + period_index
+    for array in (slot_index, lower, upper, rates, valid):
+        array.setflags(write=False)
+    return CompiledTariff(tariff, year, slot_index, lower, upper, rates, valid)
+
+
+@lru_cache(maxsize=16)
+def _stacked_slot_matrix(compiled: tuple[CompiledTariff, ...]) -> np.ndarray:
+    matrix = np.concatenate([item.slot_matrix() for item in compiled], axis=1)
+    matrix.setflags(write=False)
+    return matrix
+
+
+@dataclass
+class TariffValuation:
+    tariff: Tariff
+    bucket_kwh: dict[str, np.ndarray]  # tier/period name -> (..., 12) monthly kWh
+    bucket_value: dict[str, np.ndarray]  # tier/period name -> (...,) dollars
+    total_kwh: np.ndarray
+    total_value: np.ndarray
+
+    @property
+    def price_per_kwh(self) -> np.ndarray:
+        return self.total_value / self.total_kwh
+
+
+def value_hourly_kwh(
+    hourly_kwh: np.ndarray, year: int, tariffs: Sequence[Tariff]
+) -> list[TariffValuation]:
+    """Value ``(..., hours_in_year)`` production against every tariff at once."""
+    hourly_kwh = np.asarray(hourly_kwh, dtype=np.float64)
+    compiled = tuple(compile_tariff(tariff, year) for tariff in tariffs)
+    if hourly_kwh.shape[-1] != compiled[0].slot_index.size:
+        raise ValueError(
+            f"expected {compiled[0].slot_index.size} hourly values for {year}, "
+            f"got {hourly_kwh.shape[-1]}"
+        )
+
+    slot_kwh = hourly_kwh @ _stacked_slot_matrix(compiled)
+    total_kwh = hourly_kwh.sum(axis=-1)
+
+    valuations = []
+    offset = 0
+    for item in compiled:
+        valuations.append(
+            value_slot_kwh(item, slot_kwh[..., offset : offset + item.n_slots], total_kwh)
+        )
+        offset += item.n_slots
+    return valuations
+
+
+def value_slot_kwh(
+    item: CompiledTariff, slot_kwh: np.ndarray, total_kwh: np.ndarray
+) -> TariffValuation:
+    """Value ``(..., n_slots)`` energy per month x period with the tier clamp."""
+    n_periods = len(item.tariff.periods)
+    monthly = slot_kwh.reshape(slot_kwh.shape[:-1] + (12, n_periods))
+
+    # (..., 12, periods, tiers): energy falling inside each tier per month
+    energy = monthly[..., np.newaxis]
+    in_tier = np.clip(energy - item.tier_lower, 0.0, item.tier_upper - item.tier_lower)
+    in_tier = np.where(item.tier_valid, in_tier, 0.0)
+    dollars = (in_tier * item.tier_rates).sum(axis=-3) / 100.0  # summed over months
+
+    bucket_kwh: dict[str, np.ndarray] = {}
+    bucket_value: dict[str, np.ndarray] = {}
+    for p, period in enumerate(item.tariff.periods):
+        for t, tier in enumerate(period.tiers):
+            bucket_kwh[tier.name] = in_tier[..., p, t]
+            bucket_value[tier.name] = dollars[..., p, t]
+
+    return TariffValuation(
+        item.tariff,
+        bucket_kwh,
+        bucket_value,
+        total_kwh,
+        dollars.sum(axis=(-2, -1)),
+    )
+
+
+def hourly_kwh_grid(
+    decoded: DecodedTimestamps, values: np.ndarray, annual_kwh: float | np.ndarray
+) -> tuple[int, np.ndarray]:
+    """Scale a series to ``annual_kwh`` and scatter it onto a dense hour-of-year grid.
+
+    ``values`` may carry leading site/sample axes; all points must fall in one
+    calendar year.  Hours without a valid reading are 0.
+    """
+    years = np.unique(decoded.year[decoded.valid])
+    if years.size != 1:
+        raise ValueError(f"expected a single calendar year, got {years.tolist()}")
+    calendar_year = int(years[0])
+
+    masked, ratio = scale_to_annual(values, annual_kwh)
+    hour_of_year = (day_of_year(decoded) * 24 + decoded.hour)[decoded.valid]
+    n_hours = 24 * (366 if is_leap_year(calendar_year) else 365)
+    grid = np.zeros(masked.shape[:-1] + (n_hours,))
+    grid[..., hour_of_year] = masked[..., decoded.valid] * ratio[..., np.newaxis]
+    return calendar_year, grid
+
+
+def value_series(
+    timestamps: np.ndarray,
+    values: np.ndarray,
+    annual_kwh: float | np.ndarray,
+    tariffs: Sequence[Tariff],
+    decoded: DecodedTimestamps | None = None,
+) -> list[TariffValuation]:
+    if decoded is None:
+        decoded = decode_timestamps(timestamps)
+    year, grid = hourly_kwh_grid(decoded, values, annual_kwh)
+    return value_hourly_kwh(grid, year, tariffs)
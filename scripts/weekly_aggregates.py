@@ -0,0 +1,175 @@
+"""Persistent weekly aggregates of the points history, with a high-water mark.
+
+``visualize_points`` needs, per protocol week, the wallet's total points per
+region (the stacked bars), its share of each region (the trend lines) and the
+sum of each points source.  Weeks never change once finalized, so those rows
+are reduced once and kept on disk; later runs only reduce the weeks above the
+stored high-water mark and append them.
+
+Each entry is a ``.npz`` holding ``week x region`` matrices:
+
+    weeks          int32, ascending; the last one is the high-water mark
+    regions        int32, ascending
+    total_points   float64, 0 where the wallet had no row
+    share_percent  float64, NaN where the wallet had no row
+    network_power  float64, the region's network total that week (NaN if unknown)
+    sources        float64 ``week x 4`` in SOURCE_COLUMNS order
+
+Entries are keyed by wallet address.  Weeks at or below an entry's mark are
+never revisited, so re-finalized history needs ``rebuild``.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from irradiance_cache import DEFAULT_CACHE_DIR
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+DEFAULT_AGGREGATE_DIR = DEFAULT_CACHE_DIR.parent / "weekly"
+FORMAT_VERSION = 1
+SOURCE_COLUMNS = ("inflationPoints", "steeringPoints", "vaultBonusPoints", "glowWorthPoints")
+
+
+@dataclass
+class WeeklyAggregates:
+    weeks: np.ndarray
+    regions: np.ndarray
+    total_points: np.ndarray
+    share_percent: np.ndarray
+    network_power: np.ndarray
+    sources: np.ndarray
+
+    @classmethod
+    def empty(cls) -> "WeeklyAggregates":
+        return cls(
+            np.empty(0, dtype=np.int32),
+            np.empty(0, dtype=np.int32),
+            np.empty((0, 0)),
+            np.empty((0, 0)),
+            np.empty((0, 0)),
+            np.empty((0, len(SOURCE_COLUMNS))),
+        )
+
+    @classmethod
+    def from_weeks(cls, frame: pd.DataFrame) -> "WeeklyAggregates":
+        """Reduce ``weeks`` rows (the footprint_data WEEK_SCHEMA) in one vectorized pass."""
+        week_numbers = frame["weekNumber"].to_numpy()
+        region_ids = frame["regionId"].to_numpy()
+        weeks, week_index = np.unique(week_numbers, return_inverse=True)
+        regions, region_index = np.unique(region_ids, return_inverse=True)
+        shape = (len(weeks), len(regions))
+
+        total_points = np.zeros(shape)
+        np.add.at(total_points, (week_index, region_index), frame["totalPoints"].to_numpy(np.float64))
+        share_percent = np.full(shape, np.nan)
+        share_percent[week_index, region_index] = frame["sharePercent"].to_numpy(np.float64)
+        network_power = np.full(shape, np.nan)
+        if "networkTotalPower" in frame:
+            network_power[week_index, region_index] = frame["networkTotalPower"].to_numpy(np.float64)
+        sources = np.zeros((len(weeks), len(SOURCE_COLUMNS)))
+        np.add.at(sources, week_index, frame[list(SOURCE_COLUMNS)].to_numpy(np.float64))
+
+        return cls(
+            weeks.astype(np.int32),
+            regions.astype(np.int32),
+            total_points,
+            share_percent,
+            network_power,
+            sources,
+        )
+
+    @property
+    def high_water(self) -> int:
+        return int(self.weeks[-1]) if len(self.weeks) else -1
+
+    def merge(self, newer: "WeeklyAggregates") -> "WeeklyAggregates":
+        """Append ``newer`` (all of whose weeks lie above the mark), widening the regions."""
+        if len(newer.weeks) and newer.weeks[0] <= self.high_water:
+            raise ValueError(f"week {int(newer.weeks[0])} is not above the high-water mark {self.high_water}")
+        regions = np.union1d(self.regions, newer.regions).astype(np.int32)
+
+        def widen(part: WeeklyAggregates, matrix: np.ndarray, fill: float) -> np.ndarray:
+            out = np.full((len(part.weeks), len(regions)), fill)
+            out[:, np.searchsorted(regions, part.regions)] = matrix
+            return out
+
+        return WeeklyAggregates(
+            np.concatenate([self.weeks, newer.weeks]).astype(np.int32),
+            regions,
+            np.vstack([widen(self, self.total_points, 0.0), widen(newer, newer.total_points, 0.0)]),
+            np.vstack([widen(self, self.share_percent, np.nan), widen(newer, newer.share_percent, np.nan)]),
+            np.vstack([widen(self, self.network_power, np.nan), widen(newer, newer.network_power, np.nan)]),
+            np.vstack([self.sources, newer.sources]),
+        )
+
+
+@dataclass
+class WeeklyAggregateStore:
+    root: Path = DEFAULT_AGGREGATE_DIR
+
+    def __post_init__(self) -> None:
+        self.root = Path(self.root)
+
+    def path_for(self, key: str) -> Path:
+        return self.root / f"wallet_{key.lower()}.npz"
+
+    def load(self, key: str) -> WeeklyAggregates:
+        path = self.path_for(key)
+        try:
+            with np.load(path) as archive:
+                if int(archive["version"]) != FORMAT_VERSION:
+                    return WeeklyAggregates.empty()
+                return WeeklyAggregates(
+                    archive["weeks"],
+                    archive["regions"],
+                    archive["total_points"],
+                    archive["share_percent"],
+                    archive["network_power"],
+                    archive["sources"],
+                )
+        except FileNotFoundError:
+            return WeeklyAggregates.empty()
+        except (OSError, KeyError, ValueError):
+            # Truncated or foreign file: drop it and start over from the export.
+            path.unlink(missing_ok=True)
+            return WeeklyAggregates.empty()
+
+    def save(self, key: str, aggregates: WeeklyAggregates) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self.path_for(key)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.partial")
+        with tmp_path.open("wb") as handle:
+            np.savez(
+                handle,
+                version=FORMAT_VERSION,
+                weeks=aggregates.weeks,
+                regions=aggregates.regions,
+                total_points=aggregates.total_points,
+                share_percent=aggregates.share_percent,
+                network_power=aggregates.network_power,
+                sources=aggregates.sources,
+            )
+        os.replace(tmp_path, path)
+
+    def rebuild(self, key: str) -> None:
+        self.path_for(key).unlink(missing_ok=True)
+
+    def update(self, key: str, weeks: pd.DataFrame) -> tuple[WeeklyAggregates, int]:
+        """Merge the rows of ``weeks`` above the entry's mark; returns (aggregates, new weeks)."""
+        current = self.load(key)
+        fresh = weeks[weeks["weekNumber"].to_numpy() > current.high_water]
+        if fresh.empty:
+            return current, 0
+        newer = WeeklyAggregates.from_weeks(fresh)
+        merged = current.merge(newer)
+        self.save(key, merged)
+        return merged, len(newer.weeks)
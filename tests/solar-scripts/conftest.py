@@ -0,0 +1,36 @@
+"""Tests for the Python solar calculator and impact chart scripts.
+
+    python -m pytest tests/solar-scripts
+
+The scripts import each other as flat modules from scripts/ (the visualizers
+live in the repository root), so both go on sys.path here.
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+from typing import Any, Callable
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path[:0] = [str(REPO_ROOT / "scripts"), str(REPO_ROOT)]
+
+from benchmark import synthetic_payload  # noqa: E402
+from irradiance_cache import HourlySeries  # noqa: E402
+from power import parse_hourly_series  # noqa: E402
+
+
+@pytest.fixture
+def payload() -> Callable[..., dict[str, Any]]:
+    """NASA POWER hourly JSON for one synthetic site-year (see benchmark.synthetic_payload)."""
+    return synthetic_payload
+
+
+@pytest.fixture
+def series() -> Callable[..., HourlySeries]:
+    def build(year: int = 2023, seed: int = 0, fill_rate: float = 0.01) -> HourlySeries:
+        return parse_hourly_series(synthetic_payload(year, seed, fill_rate))
+
+    return build
@@ -0,0 +1,85 @@
+"""battery: the vectorized sweep must match a one-battery, one-hour-at-a-time dispatch."""
+
+from __future__ import annotations
+
+import math
+
+import numpy as np
+import pytest
+
+from battery import dispatch_windows, simulate_dispatch, sweep_dispatch
+from solar_engine import decode_timestamps
+from tariffs import DEFAULT_TOU_TARIFF, compile_tariff, hourly_kwh_grid, value_slot_kwh
+
+CAPACITIES = np.array([0.0, 5.0, 13.5, 40.0])
+POWERS = np.array([2.0, 5.0, 11.0])
+
+
+@pytest.fixture
+def production(series) -> tuple[int, np.ndarray]:
+    hourly = series(2023, 0)
+    return hourly_kwh_grid(decode_timestamps(hourly.timestamps), hourly.values, 12_000.0)
+
+
+def reference_dispatch(
+    hourly_kwh: np.ndarray, year: int, capacity: float, power: float, efficiency: float
+) -> tuple[float, float, float]:
+    """(charged, discharged, total value) for one battery, stepping through every hour."""
+    compiled = compile_tariff(DEFAULT_TOU_TARIFF, year)
+    windows = dispatch_windows(compiled, efficiency)
+    eta = math.sqrt(efficiency)
+    soc = charged = discharged = 0.0
+    slots = np.zeros(compiled.n_slots)
+    for hour, produced in enumerate(hourly_kwh.tolist()):
+        delivered = produced
+        if windows.charge[hour] and produced > 0:
+            taken = min((capacity - soc) / eta, power, produced)
+            charged += taken
+            soc += taken * eta
+            delivered -= taken
+        elif windows.discharge[hour]:
+            released = min(soc * eta, power)
+            discharged += released
+            soc = max(soc - released / eta, 0.0)
+            delivered += released
+        slots[compiled.slot_index[hour]] += delivered
+    total = float(hourly_kwh.sum()) - charged + discharged
+    value = value_slot_kwh(compiled, slots, np.asarray(total)).total_value
+    return charged, discharged, float(value)
+
+
+def test_sweep_matches_single_battery_reference(production) -> None:
+    year, hourly = production
+    sweep = sweep_dispatch(hourly, year, DEFAULT_TOU_TARIFF, CAPACITIES, POWERS)
+    assert sweep.capacity_kwh.tolist() == np.repeat(CAPACITIES, POWERS.size).tolist()
+
+    for index, (capacity, power) in enumerate(zip(sweep.capacity_kwh, sweep.power_kw)):
+        single = simulate_dispatch(hourly, year, DEFAULT_TOU_TARIFF, capacity, power)
+        assert single.charged_kwh[0] == pytest.approx(sweep.charged_kwh[index])
+        assert single.uplift[0] == pytest.approx(sweep.uplift[index])
+
+        charged, discharged, value = reference_dispatch(hourly, year, capacity, power, 0.90)
+        assert sweep.charged_kwh[index] == pytest.approx(charged, rel=1e-9, abs=1e-9)
+        assert sweep.discharged_kwh[index] == pytest.approx(discharged, rel=1e-9, abs=1e-9)
+        assert sweep.valuation.total_value[index] == pytest.approx(value, rel=1e-9)
+
+
+def test_energy_balance_and_zero_capacity(production) -> None:
+    year, hourly = production
+    result = sweep_dispatch(hourly, year, DEFAULT_TOU_TARIFF, CAPACITIES, POWERS, 0.81)
+    assert (result.discharged_kwh <= result.charged_kwh * 0.81 + 1e-9).all()
+    empty = result.capacity_kwh == 0
+    np.testing.assert_allclose(result.uplift[empty], 0.0, atol=1e-6)
+    assert np.isnan(result.cycles[empty]).all()
+    assert (result.uplift[~empty] > 0).all()
+
+
+def test_invalid_configurations(production) -> None:
+    year, hourly = production
+    for efficiency in (0.0, 1.2):
+        with pytest.raises(ValueError, match="efficiency"):
+            simulate_dispatch(hourly, year, DEFAULT_TOU_TARIFF, 10.0, 5.0, efficiency)
+    with pytest.raises(ValueError, match="must not be negative"):
+        simulate_dispatch(hourly, year, DEFAULT_TOU_TARIFF, -1.0, 5.0)
+    with pytest.raises(ValueError, match="hourly values"):
+        simulate_dispatch(hourly[:-24], year, DEFAULT_TOU_TARIFF, 10.0, 5.0)
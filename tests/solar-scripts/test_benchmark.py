@@ -0,0 +1,30 @@
+"""benchmark.compare: relative tolerances with an absolute floor."""
+
+from __future__ import annotations
+
+from benchmark import CaseResult, compare
+
+BASELINE = {
+    "cases": {
+        "tiny": {"wall_s": 0.001, "peak_mb": 2.0},
+        "large": {"wall_s": 1.0, "peak_mb": 100.0},
+    }
+}
+
+
+def test_small_deltas_are_not_regressions() -> None:
+    results = [CaseResult("tiny", 0.004, 2.8, {}), CaseResult("large", 1.04, 100.5, {})]
+    assert compare(results, BASELINE, 0.25, 0.10, min_time_delta=0.05, min_memory_delta=1.0) == []
+
+
+def test_growth_over_tolerance_and_floor_is_reported() -> None:
+    results = [
+        CaseResult("tiny", 0.08, 2.0, {}),
+        CaseResult("large", 1.3, 115.0, {}),
+        CaseResult("new-case", 9.0, 900.0, {}),  # not in the baseline: not gated
+    ]
+    assert compare(results, BASELINE, 0.25, 0.10, min_time_delta=0.05, min_memory_delta=1.0) == [
+        "tiny: wall 0.080s vs baseline 0.001s",
+        "large: wall 1.300s vs baseline 1.000s",
+        "large: peak 115.0 MB vs baseline 100.0 MB",
+    ]
@@ -0,0 +1,122 @@
+"""irradiance_ingest: which downloaded POWER files are stored, rejected or reported unreadable."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pytest
+
+from irradiance_ingest import ingest_file, longest_run
+from power import NASA_PARAMETER
+
+
+def power_json(payload, year: int = 2023, **overrides: Any) -> dict[str, Any]:
+    data = payload(year, fill_rate=0.0)
+    data.update(geometry={"type": "Point", "coordinates": [-111.9, 40.5, 1400.0]})
+    data.update({"header": {"fill_value": -999.0}, **overrides})
+    return data
+
+
+def hours_of(data: dict[str, Any]) -> dict[str, Any]:
+    return data["properties"]["parameter"][NASA_PARAMETER]
+
+
+def ingest(tmp_path: Path, data: Any, name: str = "site.json", text: str | None = None):
+    path = tmp_path / name
+    path.write_text(text if text is not None else json.dumps(data), encoding="utf-8")
+    return ingest_file(path, min_coverage=0.9, max_gap_hours=72)
+
+
+def test_json_response_is_stored(tmp_path: Path, payload) -> None:
+    report, key, series = ingest(tmp_path, power_json(payload))
+    assert report.status == "ok"
+    assert (key.latitude, key.longitude, key.year) == (40.5, -111.9, 2023)
+    assert series.values.size == 8760
+    assert report.coverage == 1.0
+
+
+def test_file_fill_value_maps_to_minus_999(tmp_path: Path, payload) -> None:
+    data = power_json(payload, header={"fill_value": -99.0})
+    hours_of(data)["2023060112"] = -99.0
+    report, _, series = ingest(tmp_path, data)
+    assert report.status == "ok"
+    assert series.values[series.timestamps == 2023060112][0] == -999.0
+    assert report.valid_hours == 8759
+
+
+def test_csv_download_matches_json(tmp_path: Path, payload) -> None:
+    data = power_json(payload)
+    rows = [
+        f"{key[:4]},{int(key[4:6])},{int(key[6:8])},{int(key[8:])},{value}"
+        for key, value in hours_of(data).items()
+    ]
+    text = "\n".join(
+        [
+            "-BEGIN HEADER-",
+            "NASA/POWER Source Native Resolution Hourly Data",
+            "Location: Latitude  40.5   Longitude -111.9",
+            "The value for missing source data that cannot be computed or is outside of the "
+            "sources availability range: -999",
+            "-END HEADER-",
+            f"YEAR,MO,DY,HR,{NASA_PARAMETER}",
+            *rows,
+        ]
+    )
+    csv_report, csv_key, csv_series = ingest(tmp_path, None, "site.csv", text)
+    _, json_key, json_series = ingest(tmp_path, data)
+    assert csv_report.status == "ok"
+    assert csv_key == json_key
+    np.testing.assert_array_equal(csv_series.timestamps, json_series.timestamps)
+    np.testing.assert_array_equal(csv_series.values, json_series.values)
+
+
+@pytest.mark.parametrize(
+    ("edit", "message"),
+    [
+        (lambda hours: hours.update(dict.fromkeys(list(hours)[:1000], -999.0)), "valid reading"),
+        (lambda hours: hours.update(dict.fromkeys(list(hours)[4000:4100], -999.0)), "100 consec"),
+        (lambda hours: [hours.pop(key) for key in list(hours)[100:200]], "100 consecutive"),
+        (lambda hours: hours.update({"2024010100": 1.0}), "expected one calendar year"),
+    ],
+)
+def test_validation_rejects(tmp_path: Path, payload, edit, message: str) -> None:
+    data = power_json(payload)
+    edit(hours_of(data))
+    report, key, series = ingest(tmp_path, data)
+    assert report.status == "rejected"
+    assert message in report.message
+    assert key is None and series is None
+
+
+@pytest.mark.parametrize(
+    ("overrides", "message"),
+    [
+        ({"geometry": None}, "no geometry.coordinates"),
+        ({"header": [1]}, "header is not an object"),
+        ({"header": {"fill_value": "n/a"}}, "non-numeric header.fill_value"),
+        ({"properties": {"parameter": []}}, "properties.parameter is not an object"),
+        ({"properties": {"parameter": {}}}, f"missing {NASA_PARAMETER}"),
+    ],
+)
+def test_unreadable_files_are_errors(tmp_path: Path, payload, overrides, message: str) -> None:
+    report, key, _ = ingest(tmp_path, power_json(payload, **overrides))
+    assert report.status == "error"
+    assert message in report.message
+    assert key is None
+
+
+def test_invalid_json_and_csv_without_location(tmp_path: Path) -> None:
+    assert "invalid JSON" in ingest(tmp_path, None, text="{")[0].message
+    assert "not a POWER response" in ingest(tmp_path, [1, 2])[0].message
+    report, _, _ = ingest(tmp_path, None, "site.csv", f"YEAR,MO,DY,HR,{NASA_PARAMETER}\n")
+    assert report.status == "error"
+    assert "Location" in report.message
+
+
+def test_longest_run() -> None:
+    assert longest_run(np.array([], dtype=bool)) == 0
+    assert longest_run(np.array([0, 1, 1, 0, 1, 1, 1, 0], dtype=bool)) == 3
+    assert longest_run(np.ones(5, dtype=bool)) == 5
@@ -0,0 +1,144 @@
+"""AsyncNasaPowerClient against a local aiohttp stub of the POWER hourly endpoint."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from typing import Any, Awaitable, Callable, Sequence
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from nasa_client import AsyncNasaPowerClient, ClientConfig
+from power import NasaFetchError
+
+
+class Stub:
+    """Records every request; ``replies`` are served in order, then 200s."""
+
+    def __init__(
+        self, replies: Sequence[tuple[int, dict[str, str]]] = (), delay: float = 0.0
+    ) -> None:
+        self.replies = list(replies)
+        self.delay = delay
+        self.started: list[float] = []
+        self.active = 0
+        self.max_active = 0
+
+    async def handle(self, request: web.Request) -> web.StreamResponse:
+        self.started.append(time.monotonic())
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.replies:
+                status, headers = self.replies.pop(0)
+                return web.Response(status=status, headers=headers)
+            return web.json_response({"start": request.query["start"]})
+        finally:
+            self.active -= 1
+
+
+async def run_client(
+    stub: Stub, calls: Callable[[AsyncNasaPowerClient], Awaitable[Any]], **config: Any
+) -> tuple[Any, AsyncNasaPowerClient]:
+    app = web.Application()
+    app.router.add_get("/hourly", stub.handle)
+    server = TestServer(app)
+    await server.start_server()
+    try:
+        settings = {"backoff_base": 0.001, "backoff_max": 1.0, "timeout": 10.0, **config}
+        url = str(server.make_url("/hourly"))
+        client = AsyncNasaPowerClient(ClientConfig(base_url=url, **settings))
+        async with client:
+            return await calls(client), client
+    finally:
+        await server.close()
+
+
+def test_fetch_returns_payload() -> None:
+    stub = Stub()
+    payload, client = asyncio.run(run_client(stub, lambda c: c.fetch_hourly(40.0, -111.0, 2023)))
+    assert payload == {"start": "20230101"}
+    assert client.stats.requests == 1
+    assert client.stats.bytes_downloaded > 0
+
+
+def test_identical_inflight_requests_share_one_download() -> None:
+    stub = Stub(delay=0.05)
+
+    async def calls(client: AsyncNasaPowerClient) -> list[Any]:
+        same = [client.fetch_hourly(40.0, -111.0, 2023) for _ in range(5)]
+        return await asyncio.gather(*same, client.fetch_hourly(40.0, -111.0, 2022))
+
+    payloads, client = asyncio.run(run_client(stub, calls))
+    assert len(stub.started) == 2
+    assert client.stats.deduplicated == 4
+    assert payloads[:5] == [{"start": "20230101"}] * 5
+    assert payloads[5] == {"start": "20220101"}
+
+
+def test_retryable_status_honours_retry_after() -> None:
+    stub = Stub(replies=[(503, {"Retry-After": "0.3"}), (429, {})])
+    started = time.monotonic()
+    payload, client = asyncio.run(run_client(stub, lambda c: c.fetch_hourly(40.0, -111.0, 2023)))
+    assert payload == {"start": "20230101"}
+    assert client.stats.requests == 3
+    assert client.stats.retries == 2
+    assert stub.started[1] - stub.started[0] >= 0.3
+    assert time.monotonic() - started < 5
+
+
+def test_client_errors_are_not_retried() -> None:
+    stub = Stub(replies=[(404, {})])
+    with pytest.raises(NasaFetchError, match="HTTP 404"):
+        asyncio.run(run_client(stub, lambda c: c.fetch_hourly(40.0, -111.0, 2023)))
+    assert len(stub.started) == 1
+
+
+def test_gives_up_after_max_retries() -> None:
+    stub = Stub(replies=[(500, {})] * 10)
+    with pytest.raises(NasaFetchError, match="HTTP 500"):
+        asyncio.run(
+            run_client(stub, lambda c: c.fetch_hourly(40.0, -111.0, 2023), max_retries=2)
+        )
+    assert len(stub.started) == 3
+
+
+def test_backoff_is_jittered_and_capped() -> None:
+    client = AsyncNasaPowerClient(ClientConfig(backoff_base=0.5, backoff_max=4.0))
+    random.seed(7)
+    for attempt in range(8):
+        ceiling = min(4.0, 0.5 * 2**attempt)
+        delays = [client._backoff(attempt, None) for _ in range(200)]
+        assert all(0.0 <= delay <= ceiling for delay in delays)
+        assert max(delays) - min(delays) > ceiling / 2  # spread out, not a fixed step
+    assert client._backoff(0, 3.0) >= 3.0
+    assert client._backoff(0, 60.0) == 4.0  # Retry-After is capped at backoff_max
+
+
+def test_concurrency_limit() -> None:
+    stub = Stub(delay=0.05)
+
+    async def calls(client: AsyncNasaPowerClient) -> list[Any]:
+        years = range(2010, 2018)
+        return await asyncio.gather(*(client.fetch_hourly(40.0, -111.0, year) for year in years))
+
+    asyncio.run(run_client(stub, calls, concurrency=2))
+    assert len(stub.started) == 8
+    assert stub.max_active == 2
+
+
+def test_rate_limit_spaces_request_starts() -> None:
+    stub = Stub()
+
+    async def calls(client: AsyncNasaPowerClient) -> list[Any]:
+        years = range(2015, 2020)
+        return await asyncio.gather(*(client.fetch_hourly(40.0, -111.0, year) for year in years))
+
+    asyncio.run(run_client(stub, calls, rate_per_second=20.0))
+    gaps = [later - earlier for earlier, later in zip(stub.started, stub.started[1:])]
+    assert len(gaps) == 4
+    assert min(gaps) >= 0.04  # 1 / 20 s, less timer slack
@@ -0,0 +1,61 @@
+"""network_impact: farms, weeks and wallets summed over many exports."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from benchmark import synthetic_footprint
+from network_impact import analyze_exports
+
+
+def write_export(path: Path, data: dict[str, Any]) -> Path:
+    path.write_text(json.dumps(data), encoding="utf-8")
+    return path
+
+
+def test_totals_are_summed_over_wallets(tmp_path: Path) -> None:
+    data = synthetic_footprint(40, 30, seed=1)
+    paths = [write_export(tmp_path / f"{index}.json", data) for index in range(3)]
+    impact = analyze_exports(paths, batch_rows=7)
+    assert impact.wallets == 3
+    assert len(impact.farms) == 40
+    assert impact.total_watts == pytest.approx(3 * data["summary"]["totalWatts"])
+    assert impact.weeks["wallets"].tolist() == [3] * 30
+
+
+def test_unnamed_farms_are_kept(tmp_path: Path) -> None:
+    data = synthetic_footprint(6, 4, seed=2)
+    for farm, region in zip(data["farms"][:3], (3, 3, 4)):
+        farm.update(farmName=None, regionId=region)
+    paths = [write_export(tmp_path / f"{index}.json", data) for index in range(2)]
+    impact = analyze_exports(paths, batch_rows=2)
+
+    assert impact.total_watts == pytest.approx(2 * data["summary"]["totalWatts"])
+    names = impact.farms.set_index("farmName")["wattsCaptured"]
+    unnamed = data["farms"][:3]
+    assert names["Unnamed farm (region 3)"] == pytest.approx(
+        2 * (unnamed[0]["wattsCaptured"] + unnamed[1]["wattsCaptured"])
+    )
+    assert names["Unnamed farm (region 4)"] == pytest.approx(2 * unnamed[2]["wattsCaptured"])
+    assert len(impact.farms) == 5
+
+
+def test_failed_export_contributes_nothing(tmp_path: Path) -> None:
+    good = synthetic_footprint(20, 10, seed=3)
+    text = json.dumps(synthetic_footprint(50, 10, seed=4))
+    truncated = tmp_path / "truncated.json"
+    truncated.write_text(text[: text.index('"weeks"') + 200], encoding="utf-8")
+
+    impact = analyze_exports([write_export(tmp_path / "good.json", good), truncated], batch_rows=5)
+    assert impact.wallets == 1
+    assert [path for path, _ in impact.failed] == [str(truncated)]
+    assert impact.total_watts == pytest.approx(good["summary"]["totalWatts"])
+    assert len(impact.farms) == 20
+    assert impact.weeks["wallets"].tolist() == [1] * 10
+    regions = {week["regionId"] for week in good["weeks"]}
+    wallets_per_region = {region: counts.sum() for region, counts in impact.share_counts.items()}
+    assert wallets_per_region == dict.fromkeys(regions, 1)
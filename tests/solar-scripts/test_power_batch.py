@@ -0,0 +1,83 @@
+"""power_batch: bad rows become error rows and never stop the batch."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+
+import pytest
+
+from irradiance_cache import CacheKey, IrradianceCache
+from nasa_client import ClientConfig
+from power import NASA_PARAMETER
+from power_batch import ResultWriter, parse_site, read_sites, run_batch
+from tariffs import DEFAULT_TOU_TARIFF
+
+SITES = "\n".join(
+    [
+        '{"site_id": "ok", "latitude": 40, "longitude": -111, "annual_kwh": 1000, "year": 2023}',
+        "{not json",
+        "",
+        "[1, 2]",
+        '{"site_id": "other-year", "latitude": 40, "longitude": -111, "annual_kwh": 1000, '
+        '"year": 2022}',
+        '{"site_id": "no-kwh", "latitude": 40, "longitude": -111}',
+        '{"latitude": 95, "longitude": -111, "annual_kwh": 5}',
+    ]
+)
+
+
+def batch(tmp_path: Path, series, sites: str, suffix: str = ".jsonl", tariffs=()) -> list[dict]:
+    cache = IrradianceCache(tmp_path / "cache")
+    cache.put(CacheKey.build(40.0, -111.0, 2023, NASA_PARAMETER), series(2023))
+    sites_path = tmp_path / f"sites{suffix}"
+    sites_path.write_text(sites, encoding="utf-8")
+    output = tmp_path / "results.jsonl"
+    with ResultWriter(output, tariffs) as writer:
+        asyncio.run(
+            run_batch(
+                read_sites(sites_path),
+                writer,
+                cache=cache,
+                offline=True,
+                default_year=2023,
+                client_config=ClientConfig(base_url="http://127.0.0.1:9/unused"),
+                analysis_workers=1,
+                max_in_flight=2,
+                tariffs=tariffs,
+                progress_every=0,
+            )
+        )
+    rows = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+    return sorted(rows, key=lambda row: row["site_id"])
+
+
+def test_jsonl_bad_lines_become_error_rows(tmp_path: Path, series) -> None:
+    rows = {row["site_id"]: row for row in batch(tmp_path, series, SITES)}
+    assert set(rows) == {"ok", "2", "3", "other-year", "no-kwh", "6"}
+    assert rows["ok"]["status"] == "ok"
+    assert rows["ok"]["grand_total_kwh"] == pytest.approx(1000.0)
+    assert rows["2"]["error"].startswith("ValueError: invalid JSON")
+    assert rows["3"]["error"] == "ValueError: expected a JSON object, got list"
+    assert rows["3"]["latitude"] is None
+    assert rows["other-year"]["error"].startswith("CacheMissError")  # offline, nothing cached
+    assert rows["no-kwh"]["error"] == "ValueError: missing column 'annual_kwh'"
+    assert rows["6"]["error"].startswith("ValueError: coordinates out of range")
+
+
+def test_csv_rows_and_tariffs(tmp_path: Path, series) -> None:
+    sites = "site_id,latitude,longitude,annual_kwh\na,40,-111,2000\nb,40,-111,abc\n"
+    rows = batch(tmp_path, series, sites, suffix=".csv", tariffs=[DEFAULT_TOU_TARIFF])
+    assert [row["status"] for row in rows] == ["ok", "error"]
+    assert rows[0]["tariffs"][DEFAULT_TOU_TARIFF.name]["total_value"] > 0
+    assert rows[1]["error"].startswith("ValueError: non-numeric field")
+
+
+def test_parse_site_defaults_and_range() -> None:
+    site = parse_site("s", {"latitude": "1.5", "longitude": "2", "annual_kwh": "10"}, 2020)
+    assert (site.latitude, site.longitude, site.annual_kwh, site.year) == (1.5, 2.0, 10.0, 2020)
+    with pytest.raises(ValueError, match="outside NASA POWER coverage"):
+        parse_site("s", {"latitude": 1, "longitude": 2, "annual_kwh": 10, "year": 1970}, 2020)
+    with pytest.raises(ValueError, match="greater than 0"):
+        parse_site("s", {"latitude": 1, "longitude": 2, "annual_kwh": 0}, 2020)
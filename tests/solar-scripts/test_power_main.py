@@ -0,0 +1,77 @@
+"""power.main: requests is only imported on a cache miss, and one connection serves every fetch."""
+
+from __future__ import annotations
+
+import json
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Iterator
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+import power
+from irradiance_cache import CacheKey, IrradianceCache
+from power import NASA_PARAMETER, LazySession
+
+
+@pytest.fixture
+def nasa_stub(payload, monkeypatch: pytest.MonkeyPatch) -> Iterator[list[tuple[int, int]]]:
+    """Serve synthetic payloads; yields (client port, year) per request."""
+    requests_seen: list[tuple[int, int]] = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self) -> None:
+            year = int(parse_qs(urlsplit(self.path).query)["start"][0][:4])
+            requests_seen.append((self.client_address[1], year))
+            body = json.dumps(payload(year)).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args: object) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(power, "NASA_POWER_HOURLY_URL", f"http://127.0.0.1:{server.server_port}/")
+    try:
+        yield requests_seen
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_cached_run_never_imports_requests(
+    tmp_path: Path, series, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    IrradianceCache(tmp_path).put(CacheKey.build(40.0, -111.0, 2023, NASA_PARAMETER), series(2023))
+    monkeypatch.setitem(sys.modules, "requests", None)  # any import now raises ImportError
+    power.main(["40", "-111", "5000", "--cache-dir", str(tmp_path)])
+    assert "Loaded hourly solar data from cache" in capsys.readouterr().out
+
+
+def test_sweep_fetches_over_one_connection(nasa_stub: list[tuple[int, int]], capsys) -> None:
+    power.main(["40", "-111", "5000", "--years", "2019-2022", "--no-cache"])
+    assert [year for _, year in nasa_stub] == [2019, 2020, 2021, 2022]
+    assert len({port for port, _ in nasa_stub}) == 1
+    assert capsys.readouterr().out.count("Fetching hourly solar data") == 4
+
+
+def test_lazy_session_opens_on_first_request(nasa_stub: list[tuple[int, int]]) -> None:
+    session = LazySession()
+    assert session._session is None
+    response = session.get(power.NASA_POWER_HOURLY_URL, params={"start": "20230101"}, timeout=10)
+    assert response.json()["properties"]["parameter"][NASA_PARAMETER]
+    opened = session._session
+    session.get(power.NASA_POWER_HOURLY_URL, params={"start": "20220101"}, timeout=10)
+    assert session._session is opened
+    session.close()
+    assert session._session is None
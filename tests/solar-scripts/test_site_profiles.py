@@ -0,0 +1,70 @@
+"""A quote from a stored profile must equal the quote from the hourly series it came from."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from irradiance_cache import CacheKey
+from power import NASA_PARAMETER
+from site_profiles import SiteProfileStore, build_profile, quote_profile
+from solar_engine import compute_monthly_buckets, value_buckets
+from solar_quote import sunlight_summary
+from tariffs import DEFAULT_TARIFF, DEFAULT_TOU_TARIFF, value_series
+
+VARIANTS = np.array([500.0, 7_200.0, 9_999.5, 120_000.0, 2_500_000.0])
+TARIFFS = (DEFAULT_TARIFF, DEFAULT_TOU_TARIFF)
+
+
+def site_key(latitude: float, longitude: float, year: int = 2023) -> CacheKey:
+    return CacheKey.build(latitude, longitude, year, NASA_PARAMETER)
+
+
+@pytest.mark.parametrize(("year", "seed"), [(2023, 0), (2024, 1)])
+def test_profile_quote_matches_hourly(series, year: int, seed: int) -> None:
+    hourly = series(year, seed, fill_rate=0.03)
+    quote = quote_profile(build_profile(hourly), VARIANTS, TARIFFS)
+
+    for row, annual_kwh in enumerate(VARIANTS):
+        buckets = compute_monthly_buckets(hourly.timestamps, hourly.values, annual_kwh)
+        for name in ("total_kwh", "summer_on", "summer_off", "winter_base", "winter_excess"):
+            np.testing.assert_allclose(
+                getattr(quote.buckets, name)[row], getattr(buckets, name), rtol=1e-9, atol=1e-9
+            )
+        for name, cost in value_buckets(buckets).items():
+            assert quote.costs[name][row] == pytest.approx(float(cost), rel=1e-9)
+
+        valuations = value_series(hourly.timestamps, hourly.values, annual_kwh, TARIFFS)
+        for profiled, expected in zip(quote.valuations, valuations):
+            assert profiled.total_value[row] == pytest.approx(float(expected.total_value), rel=1e-9)
+            for name, kwh in expected.bucket_kwh.items():
+                profiled_kwh = profiled.bucket_kwh[name][row]
+                np.testing.assert_allclose(profiled_kwh, kwh, rtol=1e-9, atol=1e-9)
+
+
+def test_sunlight_matches_series(series) -> None:
+    hourly = series(2023, 2, fill_rate=0.1)
+    profiled = build_profile(hourly).sunlight()
+    expected = sunlight_summary(hourly)
+    assert profiled["valid_hours"] == expected["valid_hours"]
+    assert profiled["coverage"] == pytest.approx(expected["coverage"])
+    assert profiled["average_sunlight"] == pytest.approx(expected["average_sunlight"])
+
+
+def test_store_round_trip(tmp_path: Path, series) -> None:
+    store = SiteProfileStore(tmp_path)
+    profiles = [
+        (site_key(40.0 + index, -111.0), build_profile(series(2023, index))) for index in range(3)
+    ]
+    assert store.put_many(profiles) == 3
+
+    reopened = SiteProfileStore(tmp_path)
+    for key, profile in profiles:
+        stored = reopened.get(key)
+        assert stored is not None
+        np.testing.assert_array_equal(stored.fractions, profile.fractions)
+        assert (stored.year, stored.valid_hours) == (profile.year, profile.valid_hours)
+    assert reopened.get(site_key(10.0, 10.0)) is None
+    assert reopened.get(site_key(40.0, -111.0, 2022)) is None
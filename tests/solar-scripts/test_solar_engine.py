@@ -0,0 +1,142 @@
+"""The vectorized engine must print exactly what the original per-hour loop printed."""
+
+from __future__ import annotations
+
+import contextlib
+import io
+from datetime import datetime
+from typing import Any
+
+import numpy as np
+import pytest
+
+from power import NASA_PARAMETER, analyze_solar_data, parse_hourly_series
+from solar_engine import (
+    MONTH_NAMES,
+    RATE_SUMMER_OFF_CENTS,
+    RATE_SUMMER_ON_CENTS,
+    RATE_WINTER_BASE_CENTS,
+    RATE_WINTER_EXCESS_CENTS,
+    SolarDataError,
+    compute_monthly_buckets,
+)
+
+
+def reference_report(data: dict[str, Any], annual_kwh: float) -> str:
+    """The original analyze_solar_data: one strptime and dict update per hour."""
+    out = io.StringIO()
+    valid_data_points = {}
+    for timestamp, value in data["properties"]["parameter"][NASA_PARAMETER].items():
+        try:
+            irradiance = float(value)
+        except (TypeError, ValueError):
+            continue
+        if irradiance != -999.0:
+            valid_data_points[timestamp] = irradiance
+
+    production_ratio = annual_kwh / sum(valid_data_points.values())
+    names = ("summer_on", "summer_off", "winter_total", "winter_base", "winter_excess", "total_kwh")
+    monthly_stats = {month: dict.fromkeys(names, 0.0) for month in range(1, 13)}
+    for timestamp, irradiance in valid_data_points.items():
+        try:
+            month = datetime.strptime(timestamp, "%Y%m%d%H").month
+        except ValueError:
+            continue
+        kwh_in_hour = irradiance * production_ratio
+        stats = monthly_stats[month]
+        stats["total_kwh"] += kwh_in_hour
+        if month in (6, 7, 8, 9, 10):
+            stats["summer_off" if month == 10 else "summer_on"] += kwh_in_hour
+        else:
+            stats["winter_total"] += kwh_in_hour
+
+    grand_total_kwh = 0.0
+    totals = dict.fromkeys(("summer_on", "summer_off", "winter_base", "winter_excess"), 0.0)
+    for stats in monthly_stats.values():
+        if stats["winter_total"] > 0:
+            stats["winter_base"] = min(stats["winter_total"], 600.0)
+            stats["winter_excess"] = max(stats["winter_total"] - 600.0, 0.0)
+        grand_total_kwh += stats["total_kwh"]
+        for name in totals:
+            totals[name] += stats[name]
+
+    header = (
+        f"{'Month':<12} | {'% Annual':>10} | {'Total kWh':>10} | "
+        f"{'Sum On-Pk':>12} | {'Sum Off-Pk':>12} | {'Win <600':>12} | {'Win >600':>12}"
+    )
+    print("-" * len(header), header, "-" * len(header), sep="\n", file=out)
+    for month, stats in monthly_stats.items():
+        cells = [f"{stats[name]:.0f}" if stats[name] > 0 else "" for name in totals]
+        print(
+            f"{MONTH_NAMES[month]:<12} | {stats['total_kwh'] / grand_total_kwh * 100:>9.2f}% | "
+            f"{stats['total_kwh']:>10.0f} | " + " | ".join(f"{cell:>12}" for cell in cells),
+            file=out,
+        )
+    print("-" * len(header), file=out)
+    print(
+        f"{'TOTAL':<12} | {'100.00%':>10} | {grand_total_kwh:>10.0f} | "
+        + " | ".join(f"{total:>12.0f}" for total in totals.values()),
+        file=out,
+    )
+    print("=" * len(header), file=out)
+    print(file=out)
+
+    rates = (
+        RATE_SUMMER_ON_CENTS,
+        RATE_SUMMER_OFF_CENTS,
+        RATE_WINTER_BASE_CENTS,
+        RATE_WINTER_EXCESS_CENTS,
+    )
+    costs = [total * rate / 100.0 for total, rate in zip(totals.values(), rates)]
+    total_cost = costs[0] + costs[1] + costs[2] + costs[3]
+    print("Costs Breakdown (With Battery System):", file=out)
+    print(f"  Summer On-peak       ({rates[0]:.2f}c): ${costs[0]:,.2f}", file=out)
+    print(f"  Summer Off-peak      ({rates[1]:.2f}c): ${costs[1]:,.2f}", file=out)
+    print(f"  Winter first 600 kWh ({rates[2]:.2f}c): ${costs[2]:,.2f}", file=out)
+    print(f"  Winter over 600 kWh  ({rates[3]:.2f}c): ${costs[3]:,.2f}", file=out)
+    print("-" * 35, file=out)
+    print(f"TOTAL VALUE:            ${total_cost:,.2f}", file=out)
+    print("-" * 35, file=out)
+    print(f"$/kWh:                  ${total_cost / grand_total_kwh:.4f}", file=out)
+    return out.getvalue()
+
+
+def engine_report(data: dict[str, Any], annual_kwh: float) -> str:
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        analyze_solar_data(parse_hourly_series(data), annual_kwh)
+    return out.getvalue()
+
+
+@pytest.mark.parametrize(
+    ("year", "seed", "annual_kwh"),
+    [(2023, 0, 120_000.0), (2024, 1, 9_500.0), (2020, 2, 1_000.0), (2001, 3, 3_333_333.0)],
+)
+def test_report_matches_per_hour_loop(payload, year: int, seed: int, annual_kwh: float) -> None:
+    data = payload(year, seed, fill_rate=0.05)
+    assert engine_report(data, annual_kwh) == reference_report(data, annual_kwh)
+
+
+def test_odd_keys_and_values_match_per_hour_loop(payload) -> None:
+    data = payload(2023, 4)
+    hours = data["properties"]["parameter"][NASA_PARAMETER]
+    hours["2023022900"] = 500.0  # not a calendar hour: scales, but lands in no month
+    hours["2023031512"] = "812.5"  # numeric string
+    hours["2023031513"] = None  # null, skipped
+    assert engine_report(data, 50_000.0) == reference_report(data, 50_000.0)
+
+
+def test_batched_buckets_match_single_site(series) -> None:
+    one = series(2023, 5)
+    annual = np.array([1_000.0, 25_000.0, 400_000.0])
+    batched = compute_monthly_buckets(one.timestamps, np.tile(one.values, (3, 1)), annual)
+    for row, kwh in enumerate(annual):
+        single = compute_monthly_buckets(one.timestamps, one.values, kwh)
+        np.testing.assert_allclose(batched.winter_excess[row], single.winter_excess, rtol=1e-12)
+        np.testing.assert_allclose(batched.total_kwh[row], single.total_kwh, rtol=1e-12)
+
+
+def test_all_fill_values_is_an_error(series) -> None:
+    empty = series(2023, 6, fill_rate=1.0)
+    with pytest.raises(SolarDataError, match="No valid solar data"):
+        compute_monthly_buckets(empty.timestamps, empty.values, 1_000.0)
@@ -0,0 +1,155 @@
+"""Render footprint and points reports for many wallets in parallel.
+
+Input is a directory of per-wallet exports (every *.json in it, plus exports
+that only exist as Arrow tables), a single export, or a manifest file listing
+one export per line, optionally as `wallet,path`.
+Each wallet gets its own folder under --out:
+
+    reports/<wallet>/solar_footprint_analysis.png
+    reports/<wallet>/points_analysis.png
+
+Workers run on the Agg backend, set the theme up once, and report failures
+per wallet instead of aborting the run (summary in reports/batch_report.json).
+With --fast each worker reuses one pre-styled figure per chart across wallets;
+--tier preview|both adds the low-DPI <name>.preview.png next to the final.
+--aggregate-dir keeps each wallet's weekly aggregates between runs so the
+points report only reduces weeks finalized since the last batch.
+
+    python visualize_batch.py exports/ --out reports --workers 8
+    python visualize_batch.py exports/ --fast --tier preview
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+from chart_theme import PREVIEW_DPI, TIERS
+from footprint_data import read_export_list
+
+CHARTS = ('footprint', 'points')
+OUTPUT_NAMES = {'footprint': 'solar_footprint_analysis.png', 'points': 'points_analysis.png'}
+
+
+def _init_worker():
+    import matplotlib
+    matplotlib.use('Agg')
+    # Import the renderers (matplotlib, seaborn, pandas) once per worker
+    import glow_tools.footprint_render  # noqa: F401
+    import glow_tools.points_render  # noqa: F401
+    from chart_theme import setup_theme
+    setup_theme()
+
+
+def render_wallet(wallet, json_file, out_dir, charts, fast=False, tier='final', preview_dpi=PREVIEW_DPI, aggregate_dir=None):
+    """Worker: load one export once and render the requested charts."""
+    from glow_tools.footprint import visualize_footprint
+    from glow_tools.points import visualize_points
+    from footprint_data import load_footprint
+    from weekly_aggregates import WeeklyAggregateStore
+
+    started = time.perf_counter()
+    result = {'wallet': wallet, 'input': str(json_file), 'outputs': {}, 'errors': {}}
+    try:
+        data = load_footprint(json_file)
+    except Exception as exc:
+        result['errors']['load'] = f'{type(exc).__name__}: {exc}'
+        result['seconds'] = time.perf_counter() - started
+        return result
+
+    result['wallet'] = wallet = wallet or data.wallet_address or Path(json_file).stem
+    wallet_dir = Path(out_dir) / wallet
+    wallet_dir.mkdir(parents=True, exist_ok=True)
+
+    renderers = {'footprint': visualize_footprint, 'points': visualize_points}
+    options = {'points': {'aggregates': WeeklyAggregateStore(aggregate_dir)} if aggregate_dir else {}}
+    for chart in charts:
+        output_file = wallet_dir / OUTPUT_NAMES[chart]
+        log = io.StringIO()
+        try:
+            with contextlib.redirect_stdout(log):
+                saved = renderers[chart](json_file, str(output_file), show=False, data=data,
+                                         fast=fast, tier=tier, preview_dpi=preview_dpi, **options.get(chart, {}))
+        except Exception:
+            result['errors'][chart] = traceback.format_exc(limit=3).strip().splitlines()[-1]
+            continue
+        if saved is None:
+            # The visualizers print their own reason and return without a figure
+            result['errors'][chart] = log.getvalue().strip() or 'nothing rendered'
+        else:
+            result['outputs'][chart] = saved
+
+    result['seconds'] = time.perf_counter() - started
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Render impact reports for many wallets in parallel.')
+    parser.add_argument('source', help='Directory of *.json / Arrow exports, one export, or a manifest file (path or wallet,path per line)')
+    parser.add_argument('--out', default='reports', help='Output directory (default: reports)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Worker processes (default: CPU count)')
+    parser.add_argument('--charts', default=','.join(CHARTS), help='Comma-separated charts to render (default: footprint,points)')
+    parser.add_argument('--fast', action='store_true', help='Use the fast render path (reused figure templates, plain matplotlib)')
+    parser.add_argument('--tier', choices=TIERS, default='final', help='final (300 dpi), preview (<name>.preview.png) or both')
+    parser.add_argument('--preview-dpi', type=int, default=PREVIEW_DPI, help=f'DPI of the preview tier (default: {PREVIEW_DPI})')
+    parser.add_argument('--aggregate-dir', default=None, help='Keep per-wallet weekly aggregates here between runs (default: off)')
+    args = parser.parse_args()
+
+    charts = [chart.strip() for chart in args.charts.split(',') if chart.strip()]
+    unknown = [chart for chart in charts if chart not in CHARTS]
+    if unknown or not charts:
+        parser.error(f"--charts must be a subset of {', '.join(CHARTS)}")
+    if args.workers < 1:
+        parser.error('--workers must be at least 1')
+    if args.preview_dpi < 1:
+        parser.error('--preview-dpi must be positive')
+    if not os.path.exists(args.source):
+        parser.error(f'{args.source} not found')
+
+    entries = read_export_list(args.source)
+    if not entries:
+        print(f"❌ Error: no exports found in {args.source}")
+        raise SystemExit(1)
+
+    out_dir = Path(args.out)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    print(f"Rendering {len(entries)} wallet(s) with {args.workers} worker(s) -> {out_dir}/")
+
+    started = time.perf_counter()
+    results = []
+    with ProcessPoolExecutor(args.workers, initializer=_init_worker) as pool:
+        futures = [pool.submit(render_wallet, wallet, path, out_dir, charts,
+                               args.fast, args.tier, args.preview_dpi, args.aggregate_dir) for wallet, path in entries]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            label = result['wallet'] or result['input']
+            if result['errors']:
+                problems = '; '.join(f'{stage}: {error}' for stage, error in result['errors'].items())
+                print(f"❌ {label}: {problems}")
+            else:
+                print(f"✅ {label} ({result['seconds']:.1f}s)")
+
+    failed = [result for result in results if result['errors']]
+    elapsed = time.perf_counter() - started
+    report = {
+        'wallets': len(results),
+        'failed': len(failed),
+        'seconds': elapsed,
+        'results': sorted(results, key=lambda result: result['input']),
+    }
+    (out_dir / 'batch_report.json').write_text(json.dumps(report, indent=2), encoding='utf-8')
+    print(f"Done: {len(results) - len(failed)}/{len(results)} wallet(s) rendered in {elapsed:.1f}s "
+          f"(report: {out_dir / 'batch_report.json'})")
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
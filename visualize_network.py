@@ -0,0 +1,144 @@
+"""Network-wide impact charts across many wallets, in bounded memory.
+
+Sources are per-wallet exports (a directory, a manifest of `wallet,path`
+lines, or single files) or one large export.  Each is streamed in batches of
+--batch-rows farms/weeks and folded into region/week aggregates (see
+scripts/network_impact.py), so the whole leaderboard fits on a laptop.  The
+aggregates are drawn with the usual layouts:
+
+    network_report/network_footprint.png           watts captured per region over time, top farms network-wide
+    network_report/network_points.png              summed points; the share line is the part of the network the inputs hold
+    network_report/network_share_distribution.png  wallets by mean weekly share, per region
+    network_report/network_summary.json
+
+    python visualize_network.py exports/ --out network_report
+    python visualize_network.py manifest.txt --batch-rows 20000 --fast
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+from chart_theme import OTHER_REGION_COLOR, PREVIEW_DPI, REGION_COLORS, REGION_LABELS, TIERS, save_figure, setup_theme, tier_outputs
+from footprint_data import DEFAULT_BATCH_ROWS, read_export_list
+from instrumentation import add_profile_arguments, count, finish_profiling, stage, start_profiling
+from network_impact import SHARE_BINS, analyze_exports
+from glow_tools.footprint import visualize_footprint
+from glow_tools.points import visualize_points
+
+TOP_FARMS = 25
+
+def visualize_share_distribution(impact, output_file='network_share_distribution.png', tier='final', preview_dpi=PREVIEW_DPI):
+    outputs = tier_outputs(output_file, tier, preview_dpi)
+    setup_theme()
+    fig, ax = plt.subplots(figsize=(14, 8))
+
+    for rid, counts in impact.share_counts.items():
+        label = REGION_LABELS.get(rid, f'Region {rid}')
+        values = counts[1:-1].copy()
+        values[-1] += counts[-1]  # exactly 100% lands past the last edge
+        ax.stairs(values, SHARE_BINS, color=REGION_COLORS.get(rid, OTHER_REGION_COLOR), linewidth=2.5,
+                  label=f'{label} ({counts.sum():,} wallets, {counts[0]:,} below {SHARE_BINS[0]:g}%)')
+
+    ax.set_xscale('log')
+    ax.set_title('Distribution of Wallets by Mean Weekly Share of Regional Network Power', fontsize=16, fontweight='bold', pad=20)
+    ax.set_xlabel('Mean Weekly Share (%)', fontsize=12)
+    ax.set_ylabel('Wallets', fontsize=12)
+    ax.legend(title="Regions", loc='upper left', bbox_to_anchor=(1, 1))
+    fig.text(0.5, 0.01, f"Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} UTC • {impact.wallets:,} wallets",
+             ha='center', fontsize=10, color='gray', style='italic')
+
+    with stage('savefig'):
+        save_figure(fig, outputs)
+    plt.close(fig)
+    print(f"✅ Share distribution saved to {', '.join(path for path, _ in outputs)}")
+    return outputs[0][0]
+
+def build_summary(impact):
+    farms = impact.farms
+    region_totals = farms.groupby('regionId')['wattsCaptured'].sum()
+    top_farms = farms.nlargest(TOP_FARMS, 'wattsCaptured')
+    return {
+        'wallets': impact.wallets,
+        'totalWatts': round(impact.total_watts),
+        'totalPanels': int(impact.total_watts // 400),
+        'farms': len(farms),
+        'weeks': [int(impact.weeks['weekNumber'].min()), int(impact.weeks['weekNumber'].max())] if len(impact.weeks) else None,
+        'regionTotals': {str(rid): round(watts) for rid, watts in region_totals.items()},
+        'topFarms': [
+            {'farmName': str(row.farmName), 'regionId': int(row.regionId), 'wattsCaptured': round(row.wattsCaptured)}
+            for row in top_farms.itertuples()
+        ],
+        'failed': [{'input': path, 'error': error} for path, error in impact.failed],
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Render network-wide impact charts from many wallet exports.')
+    parser.add_argument('sources', nargs='+', help='Export files, directories of exports or manifest files')
+    parser.add_argument('--out', default='network_report', help='Output directory (default: network_report)')
+    parser.add_argument('--batch-rows', type=int, default=DEFAULT_BATCH_ROWS,
+                        help=f'Farms/weeks read per batch; bounds memory (default: {DEFAULT_BATCH_ROWS})')
+    parser.add_argument('--fast', action='store_true', help='Use the fast render path')
+    parser.add_argument('--tier', choices=TIERS, default='final', help='final (300 dpi), preview (<name>.preview.png) or both')
+    parser.add_argument('--preview-dpi', type=int, default=PREVIEW_DPI, help=f'DPI of the preview tier (default: {PREVIEW_DPI})')
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    if args.batch_rows < 1:
+        parser.error('--batch-rows must be at least 1')
+    if args.preview_dpi < 1:
+        parser.error('--preview-dpi must be positive')
+    missing = [source for source in args.sources if not os.path.exists(source)]
+    if missing:
+        parser.error(f"{', '.join(missing)} not found")
+
+    paths = [path for source in args.sources for _, path in read_export_list(source)]
+    if not paths:
+        print(f"❌ Error: no exports found in {', '.join(args.sources)}")
+        raise SystemExit(1)
+
+    profiler = start_profiling(args, 'visualize_network.py')
+    out_dir = Path(args.out)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    print(f"Aggregating {len(paths)} export(s) in batches of {args.batch_rows:,} rows -> {out_dir}/")
+
+    def progress(path, error):
+        count('exports_read')
+        if error:
+            print(f"❌ {path}: {error}")
+
+    started = time.perf_counter()
+    with stage('aggregate'):
+        impact = analyze_exports(paths, args.batch_rows, on_export=progress)
+    print(f"Aggregated {impact.wallets:,} wallet(s), {len(impact.farms):,} farms, {len(impact.weeks):,} week rows "
+          f"in {time.perf_counter() - started:.1f}s")
+    if not impact.wallets:
+        print("❌ Error: no export could be read")
+        raise SystemExit(1)
+
+    data = impact.as_footprint()
+    options = {'show': False, 'data': data, 'fast': args.fast, 'tier': args.tier, 'preview_dpi': args.preview_dpi}
+    with stage('render'):
+        if len(data.farms):
+            visualize_footprint(output_file=str(out_dir / 'network_footprint.png'), **options)
+        if len(data.weeks):
+            visualize_points(output_file=str(out_dir / 'network_points.png'), **options)
+        if impact.share_counts:
+            visualize_share_distribution(impact, str(out_dir / 'network_share_distribution.png'), args.tier, args.preview_dpi)
+
+    (out_dir / 'network_summary.json').write_text(json.dumps(build_summary(impact), indent=2), encoding='utf-8')
+    print(f"Summary written to {out_dir / 'network_summary.json'}")
+    finish_profiling(profiler, args.profile)
+    if impact.failed:
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()